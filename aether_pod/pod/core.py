@@ -2,14 +2,19 @@ import os
 import requests
 import json
 import re
-import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from .prompts import build_system_prompt
 from .vault import MemoryVault
+from .skills import SkillRegistry
 
 # CONFIGURATION
 MODEL_LOCAL = "llama3.2" 
 MODEL_CLOUD = "llama3-70b-8192" # High-speed Groq model
 MAX_RECURSION = 3
+SKILL_DIRS = [
+    "c:/Users/nator/clawd/skills/shadow",
+    "c:/Users/nator/AetherRose/aether_claw/skills",
+]
 
 class AetherPod:
     """
@@ -22,21 +27,29 @@ class AetherPod:
         self.agents_path = "c:/Users/nator/clawd/AGENTS.md"
         self.memory_path = "c:/Users/nator/clawd/MEMORY.md"
         self.api_key_groq = os.getenv("GROQ_API_KEY")
+        self.skills = SkillRegistry(SKILL_DIRS)
+        self._context_cache = {}  # path -> ((mtime_ns, size), content)
+
+    def _read_cached(self, path, default):
+        """Return file contents, re-reading only when the mtime or size changes."""
+        try:
+            st = os.stat(path)
+        except OSError:
+            self._context_cache.pop(path, None)
+            return default
+        stamp = (st.st_mtime_ns, st.st_size)
+        cached = self._context_cache.get(path)
+        if cached and cached[0] == stamp:
+            return cached[1]
+        with open(path, "r", encoding="utf-8") as f:
+            content = f.read()
+        self._context_cache[path] = (stamp, content)
+        return content
 
     def load_context(self):
-        # ... (keep existing load_context logic, ensure utf-8) ...
-        soul = "The spirit of a Kitsune Investigator."
-        if os.path.exists(self.soul_path):
-            with open(self.soul_path, "r", encoding="utf-8") as f: soul = f.read()
-        
-        agents = "Operational protocols active."
-        if os.path.exists(self.agents_path):
-            with open(self.agents_path, "r", encoding="utf-8") as f: agents = f.read()
-            
-        ltm = ""
-        if os.path.exists(self.memory_path):
-            with open(self.memory_path, "r", encoding="utf-8") as f: ltm = f.read()
-            
+        soul = self._read_cached(self.soul_path, "The spirit of a Kitsune Investigator.")
+        agents = self._read_cached(self.agents_path, "Operational protocols active.")
+        ltm = self._read_cached(self.memory_path, "")
         return soul, agents, ltm
 
     def ask(self, query):
@@ -104,9 +117,15 @@ class AetherPod:
         if not matches:
             return response
 
+        cmds = [cmd.strip() for cmd in matches[:MAX_RECURSION]]
+        if len(cmds) == 1:
+            outputs = [self.execute_skill(cmds[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=len(cmds)) as pool:
+                outputs = list(pool.map(self.execute_skill, cmds))
+
         combined = response + "\n\n--- NEURAL_BRIDGE_EXECUTION ---"
-        for cmd in matches[:MAX_RECURSION]:
-            out = self.execute_skill(cmd.strip())
+        for cmd, out in zip(cmds, outputs):
             combined += f"\n\n[INITIATING]: {cmd}\n{out}"
         return combined
 
@@ -140,18 +159,8 @@ class AetherPod:
         if skill == "read" and ("soul.md" in args.lower() or "soul" == args.lower()):
             args = "personal-ide/SOUL.md"
             
-        # Mapping to the 'skills' directory
-        skill_file = f"c:/Users/nator/clawd/skills/shadow/{skill}.py"
-        if not os.path.exists(skill_file):
-            skill_file = f"c:/Users/nator/AetherRose/aether_claw/skills/{skill}.py"
-            
-        if os.path.exists(skill_file):
-            try:
-                res_bytes = subprocess.check_output(f"python {skill_file} {args}", shell=True, stderr=subprocess.STDOUT, timeout=30)
-                try:
-                    return res_bytes.decode("utf-8")
-                except UnicodeDecodeError:
-                    return res_bytes.decode("cp1252", errors="replace")
-            except Exception as e:
-                return f"[ERROR]: Skill failed. {e}"
-        return f"[ERROR]: Unknown skill '{skill}'."
+        # Skills run in-process from the warm registry (see skills.py)
+        out = self.skills.run(skill, args)
+        if out is None:
+            return f"[ERROR]: Unknown skill '{skill}'."
+        return out
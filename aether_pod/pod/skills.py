@@ -0,0 +1,153 @@
+import os
+import io
+import re
+import sys
+import shlex
+import threading
+import subprocess
+import importlib.util
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+SKILL_TIMEOUT = 30
+SKILL_WORKERS = 4
+MAIN_RE = re.compile(r"^def main\(", re.MULTILINE)
+
+class _ThreadStream:
+    """
+    Stands in for sys.stdout/sys.stderr. Writes from a thread that is running a
+    skill go to that thread's buffer; everything else passes through.
+    """
+    def __init__(self, target, local):
+        self._target = target
+        self._local = local
+
+    def write(self, data):
+        buf = getattr(self._local, "buffer", None)
+        return (buf or self._target).write(data)
+
+    def flush(self):
+        buf = getattr(self._local, "buffer", None)
+        (buf or self._target).flush()
+
+    def __getattr__(self, name):
+        return getattr(self._target, name)
+
+_capture = threading.local()
+_install_lock = threading.Lock()
+
+def _install_capture():
+    with _install_lock:
+        if not isinstance(sys.stdout, _ThreadStream):
+            sys.stdout = _ThreadStream(sys.stdout, _capture)
+        if not isinstance(sys.stderr, _ThreadStream):
+            sys.stderr = _ThreadStream(sys.stderr, _capture)
+
+def split_args(args):
+    """
+    Split a command line the way the old shell call did on Windows: quotes
+    group words, backslashes are literal (so C:\\Users\\... paths survive).
+    """
+    try:
+        parts = shlex.split(args, posix=False)
+    except ValueError:
+        return args.split()
+    return [p[1:-1] if len(p) >= 2 and p[0] == p[-1] and p[0] in "\"'" else p for p in parts]
+
+class SkillRegistry:
+    """
+    Warm, in-process runner for the shadow skills.
+
+    Each skill script is imported once (and re-imported when its file changes)
+    and its main(argv) is called on a worker thread with stdout/stderr
+    captured. Scripts without a main() still run as a subprocess.
+
+    A thread cannot be killed, so an in-process skill that times out keeps its
+    worker busy until it returns on its own. To stop one hung skill from
+    draining the pool, a skill that has timed out once is demoted to the
+    subprocess path, where the timeout kills the process.
+    """
+    def __init__(self, search_dirs, timeout=SKILL_TIMEOUT, workers=SKILL_WORKERS):
+        self.search_dirs = list(search_dirs)
+        self.timeout = timeout
+        self.pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="skill")
+        self._modules = {}  # skill -> (path, mtime_ns, module)
+        self._demoted = set()  # skills that timed out in-process
+        self._lock = threading.Lock()
+        _install_capture()
+
+    def locate(self, skill):
+        for d in self.search_dirs:
+            path = os.path.join(d, f"{skill}.py")
+            if os.path.exists(path):
+                return path
+        return None
+
+    def load(self, skill, path):
+        """Import the skill, or return None if it has no main() and must run as a script."""
+        mtime = os.stat(path).st_mtime_ns
+        with self._lock:
+            cached = self._modules.get(skill)
+            if cached and cached[0] == path and cached[1] == mtime:
+                return cached[2]
+            with open(path, "r", encoding="utf-8", errors="ignore") as f:
+                if not MAIN_RE.search(f.read()):
+                    # Importing a plain script would run it; leave it to the subprocess path
+                    self._modules[skill] = (path, mtime, None)
+                    return None
+            # Scripts import their siblings (e.g. fetcher.py) as they would when run directly
+            skill_dir = os.path.dirname(path)
+            if skill_dir not in sys.path:
+                sys.path.append(skill_dir)
+            spec = importlib.util.spec_from_file_location(f"shadow_skill_{skill}", path)
+            module = importlib.util.module_from_spec(spec)
+            spec.loader.exec_module(module)
+            self._modules[skill] = (path, mtime, module)
+            return module
+
+    def run(self, skill, args):
+        path = self.locate(skill)
+        if path is None:
+            return None
+        future = self.pool.submit(self._invoke, skill, path, args)
+        try:
+            return future.result(timeout=self.timeout)
+        except FutureTimeout:
+            # The worker thread cannot be killed; it finishes in the background.
+            with self._lock:
+                self._demoted.add(skill)
+            return f"[ERROR]: Skill failed. '{skill}' timed out after {self.timeout} seconds"
+
+    def _invoke(self, skill, path, args):
+        if skill in self._demoted:
+            return self._run_subprocess(path, args)
+        try:
+            module = self.load(skill, path)
+        except Exception as e:
+            return f"[ERROR]: Skill failed. {e}"
+        if module is None or not callable(getattr(module, "main", None)):
+            return self._run_subprocess(path, args)
+
+        _capture.buffer = io.StringIO()
+        try:
+            module.main(split_args(args))
+        except SystemExit:
+            pass
+        except Exception as e:
+            print(f"[ERROR]: Skill failed. {e}")
+        finally:
+            out = _capture.buffer.getvalue()
+            _capture.buffer = None
+        return out
+
+    def _run_subprocess(self, path, args):
+        try:
+            res_bytes = subprocess.check_output(
+                [sys.executable, path, *split_args(args)],
+                stderr=subprocess.STDOUT, timeout=self.timeout
+            )
+            try:
+                return res_bytes.decode("utf-8")
+            except UnicodeDecodeError:
+                return res_bytes.decode("cp1252", errors="replace")
+        except Exception as e:
+            return f"[ERROR]: Skill failed. {e}"
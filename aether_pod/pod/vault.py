@@ -1,19 +1,50 @@
 import chromadb
+from chromadb.utils import embedding_functions
 import os
+import time
 import datetime
+import threading
+from collections import OrderedDict
+
+RECALL_TTL_SECONDS = 300
+RECALL_CACHE_SIZE = 256
+EMBED_CACHE_SIZE = 512
+
+def normalize_query(query):
+    """Lowercase and collapse whitespace so trivially different questions share a key.
+
+    Punctuation is kept: "c++", "c#" and "c" are different questions.
+    """
+    return " ".join((query or "").lower().split())
 
 class MemoryVault:
     """
     AetherClaw Persistent Memory Layer.
     Uses ChromaDB for vector retrieval.
+
+    Recall results are cached per normalized query for RECALL_TTL_SECONDS and
+    dropped whenever new documents are added. Query embeddings are cached
+    separately by the raw query text (they do not depend on the collection),
+    so a repeat question after a store() still skips the embedding model.
     """
-    def __init__(self):
-        self.db_path = "c:/Users/nator/clawd/aether_pod/data/chroma"
+    def __init__(self, db_path="c:/Users/nator/clawd/aether_pod/data/chroma", embedding_function=None):
+        self.db_path = db_path
         if not os.path.exists(self.db_path):
             os.makedirs(self.db_path, exist_ok=True)
             
         self.client = chromadb.PersistentClient(path=self.db_path)
-        self.collection = self.client.get_or_create_collection(name="shadow_memory")
+        # Same model Chroma uses by default, held here so query embeddings can be cached
+        self.embed = embedding_function or embedding_functions.DefaultEmbeddingFunction()
+        self.collection = self.client.get_or_create_collection(name="shadow_memory", embedding_function=self.embed)
+        self._recall_cache = OrderedDict()  # (key, n_results) -> (stamp, text)
+        self._embed_cache = OrderedDict()   # raw query -> embedding
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self._generation += 1
+            self._recall_cache.clear()
 
     def store(self, query, response):
         timestamp = datetime.datetime.now().isoformat()
@@ -23,16 +54,48 @@ class MemoryVault:
             metadatas=[{"timestamp": timestamp, "type": "chat"}],
             ids=[doc_id]
         )
+        self.invalidate()
+
+    def _embedding_for(self, query):
+        with self._lock:
+            vector = self._embed_cache.get(query)
+            if vector is not None:
+                self._embed_cache.move_to_end(query)
+                return vector
+        vector = self.embed([query])[0]
+        with self._lock:
+            self._embed_cache[query] = vector
+            while len(self._embed_cache) > EMBED_CACHE_SIZE:
+                self._embed_cache.popitem(last=False)
+        return vector
 
     def retrieve(self, query, n_results=5):
+        key = normalize_query(query)
+        slot = (key, n_results)
+        now = time.monotonic()
+        with self._lock:
+            hit = self._recall_cache.get(slot)
+            if hit is not None and now - hit[0] < RECALL_TTL_SECONDS:
+                self._recall_cache.move_to_end(slot)
+                return hit[1]
+            generation = self._generation
         try:
             results = self.collection.query(
-                query_texts=[query],
+                query_embeddings=[self._embedding_for(query)],
                 n_results=n_results
             )
-            return "\n---\n".join(results['documents'][0]) if results['documents'] else ""
+            text = "\n---\n".join(results['documents'][0]) if results['documents'] else ""
         except:
             return ""
+        with self._lock:
+            if generation != self._generation:
+                # A store() landed mid-query; this result may already be stale
+                return text
+            self._recall_cache[slot] = (now, text)
+            self._recall_cache.move_to_end(slot)
+            while len(self._recall_cache) > RECALL_CACHE_SIZE:
+                self._recall_cache.popitem(last=False)
+        return text
 
     def ingest_logs(self, log_dir="c:/Users/nator/clawd/aether_pod/data/logs"):
         """Ingests raw text logs into the vector vault."""
@@ -46,3 +109,4 @@ class MemoryVault:
                         metadatas=[{"source": f, "ingested": datetime.datetime.now().isoformat()}],
                         ids=[f"log_{f}_{datetime.datetime.now().timestamp()}"]
                     )
+        self.invalidate()
@@ -5,7 +5,7 @@ Runner script for LLM-enhanced Clawdbot Hub agents
 import asyncio
 import signal
 import sys
-from clawdbot_agents.llm_connector import LLMConnector, LLMEnhancedPhilosopherAgent, LLMEnhancedTechnologistAgent, LLMEnhancedExplorerAgent, LLMEnhancedHarmonyAgent, LLMEnhancedSynthesisAgent
+from clawdbot_agents.llm_connector import get_shared_connector, LLMEnhancedPhilosopherAgent, LLMEnhancedTechnologistAgent, LLMEnhancedExplorerAgent, LLMEnhancedHarmonyAgent, LLMEnhancedSynthesisAgent
 
 
 class LLMEnhancedAgentManager:
@@ -13,7 +13,7 @@ class LLMEnhancedAgentManager:
     
     def __init__(self, hub_url: str = "http://localhost:8082", llm_provider: str = "ollama", llm_model: str = "llama3.3"):
         self.hub_url = hub_url
-        self.llm_connector = LLMConnector(provider=llm_provider, model=llm_model)
+        self.llm_connector = get_shared_connector(provider=llm_provider, model=llm_model)
         self.agents = {}
         self.running = False
         self.shutdown_event = asyncio.Event()
@@ -7,14 +7,14 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
-from clawdbot_agents.llm_connector import LLMConnector, LLMEnhancedPhilosopherAgent, LLMEnhancedTechnologistAgent, LLMEnhancedExplorerAgent, LLMEnhancedHarmonyAgent, LLMEnhancedSynthesisAgent
+from clawdbot_agents.llm_connector import get_shared_connector, LLMEnhancedPhilosopherAgent, LLMEnhancedTechnologistAgent, LLMEnhancedExplorerAgent, LLMEnhancedHarmonyAgent, LLMEnhancedSynthesisAgent
 
 
 async def main():
     print("Starting LLM-enhanced Clawdbot Hub Agents...")
     
-    # Initialize the LLM connector
-    llm_connector = LLMConnector(provider="ollama", model="llama3.2:latest")
+    # Initialize the process-wide LLM connector every agent shares
+    llm_connector = get_shared_connector(provider="ollama", model="llama3.2:latest")
     await llm_connector.initialize()
     
     print("LLM connector initialized with llama3.2:latest")
@@ -54,14 +54,22 @@ app.get('/', (req, res) => {
 app.get('/api/posts', (req, res) => {
   const feedType = req.query.feed; // 'foryou' or 'latest'
   const username = req.query.user; // Needed for personalization
+  const since = req.query.since ? new Date(req.query.since) : null; // Incremental polling cursor
 
   if (feedType === 'foryou' && username) {
     const rankedPosts = rankingService.getRankedFeed(username, db.getPosts());
     return res.json(rankedPosts);
   }
 
+  // Only posts at or after the cursor; pollers drop the ones they already saw.
+  // Express attaches an ETag, so an unchanged result comes back as 304.
+  let posts = db.getPosts();
+  if (since && !isNaN(since)) {
+    posts = posts.filter(post => new Date(post.timestamp) >= since);
+  }
+
   // Default: Chronological
-  res.json(db.getPosts().sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp)));
+  res.json(posts.sort((a, b) => new Date(b.timestamp) - new Date(a.timestamp)));
 });
 
 app.post('/api/posts', (req, res) => {
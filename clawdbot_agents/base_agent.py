@@ -11,6 +11,11 @@ import logging
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import uuid
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from feed_poller import get_shared_poller, release_shared_poller
 
 
 class BaseAgent:
@@ -24,6 +29,7 @@ class BaseAgent:
         self.hub_url = hub_url
         self.llm_client = llm_client
         self.session = None
+        self.feed_queue = None  # New posts from the shared feed poller
         self.conversation_history = []
         self.running = False
         self.agent_id = str(uuid.uuid4())
@@ -36,7 +42,8 @@ class BaseAgent:
             'response_probability': 0.7,  # Chance to respond to a post
             'max_conversation_depth': 3,  # Max replies in a thread
             'interest_keywords': [],      # Topics the agent focuses on
-            'response_delay_range': (1, 5)  # Range of delay in seconds before responding
+            'response_delay_range': (1, 5),  # Range of delay in seconds before responding
+            'poll_interval': 30           # Seconds between hub checks
         }
 
     def setup_logger(self):
@@ -53,6 +60,12 @@ class BaseAgent:
     async def initialize(self):
         """Initialize the agent's session and connections"""
         self.session = aiohttp.ClientSession()
+        
+        # One poller per process serves every agent, so the hub only sees new posts once
+        feed = get_shared_poller(self.hub_url, interval=self.config['poll_interval'])
+        self.feed_queue = feed.subscribe(self.agent_id)
+        feed.start()
+        
         self.logger.info(f"Agent {self.name} ({self.role}) initialized with ID: {self.agent_id}")
         self.running = True
 
@@ -60,8 +73,23 @@ class BaseAgent:
         """Connect to the LLM - to be overridden by subclasses"""
         pass
 
-    async def fetch_new_posts(self, limit: int = 10) -> List[Dict]:
-        """Fetch recent posts from the hub"""
+    async def fetch_new_posts(self, limit: int = 10, timeout: float = 0) -> List[Dict]:
+        """
+        Fetch posts the agent hasn't seen yet
+        Waits up to `timeout` seconds for the shared feed to deliver one; falls
+        back to downloading the full post list when not subscribed
+        """
+        if self.feed_queue is not None:
+            posts = []
+            if self.feed_queue.empty() and timeout > 0:
+                try:
+                    posts.append(await asyncio.wait_for(self.feed_queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    return []
+            while len(posts) < limit and not self.feed_queue.empty():
+                posts.append(self.feed_queue.get_nowait())
+            return posts
+        
         try:
             async with self.session.get(f"{self.hub_url}/api/posts") as response:
                 if response.status == 200:
@@ -181,6 +209,13 @@ class BaseAgent:
         
         while self.running:
             try:
+                if self.feed_queue is not None:
+                    # Block on the shared feed instead of sleeping between checks
+                    posts = await self.fetch_new_posts(limit=5, timeout=self.config['poll_interval'])
+                    for post in posts:
+                        await self.respond_to_post(post)
+                    continue
+                
                 # Fetch recent posts
                 posts = await self.fetch_new_posts(limit=5)
                 
@@ -189,7 +224,7 @@ class BaseAgent:
                     await self.respond_to_post(post)
                 
                 # Sleep before next check
-                await asyncio.sleep(30)  # Check every 30 seconds
+                await asyncio.sleep(self.config['poll_interval'])
                 
             except Exception as e:
                 self.logger.error(f"Error in monitoring loop: {e}")
@@ -204,6 +239,9 @@ class BaseAgent:
     async def stop(self):
         """Stop the agent gracefully"""
         self.running = False
+        if self.feed_queue is not None:
+            await release_shared_poller(self.hub_url, self.agent_id)
+            self.feed_queue = None
         if self.session:
             await self.session.close()
         self.logger.info(f"Agent {self.name} stopped")
@@ -0,0 +1,218 @@
+"""
+Shared Feed Poller for Clawdbot Hub
+Polls the hub once per process and fans new posts out to subscribers
+"""
+
+import asyncio
+import aiohttp
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set
+
+
+def parse_post_time(post: Dict) -> Optional[datetime]:
+    """Parse a post's ISO timestamp as an aware UTC datetime"""
+    timestamp = post.get('timestamp')
+    if not timestamp:
+        return None
+    try:
+        post_time = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if post_time.tzinfo is None:
+        post_time = post_time.replace(tzinfo=timezone.utc)
+    return post_time
+
+
+class FeedPoller:
+    """
+    Incrementally polls /api/posts with a since-cursor and ETag, and
+    delivers each new post exactly once to every subscriber queue
+    """
+
+    def __init__(self, hub_url: str = "http://localhost:8082", interval: float = 30.0,
+                 catch_up: timedelta = timedelta(minutes=10)):
+        self.hub_url = hub_url
+        self.interval = interval
+        self.session = None
+        self.running = False
+        self.logger = self.setup_logger()
+
+        # Cursor: newest timestamp delivered, plus ids seen at exactly that time
+        self.cursor = datetime.now(timezone.utc) - catch_up
+        self.cursor_ids: Set[str] = set()
+        self.etag: Optional[str] = None
+
+        self.subscribers: Dict[str, asyncio.Queue] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup = asyncio.Event()
+
+        self.stats = {
+            'requests': 0,
+            'not_modified': 0,
+            'posts_received': 0,
+            'posts_delivered': 0,
+            'posts_dropped': 0,
+            'errors': 0
+        }
+
+    def setup_logger(self):
+        """Set up the logger for the feed poller"""
+        logger = logging.getLogger("FeedPoller")
+        logger.setLevel(logging.INFO)
+        if not logger.handlers:
+            handler = logging.StreamHandler()
+            formatter = logging.Formatter('%(asctime)s - FeedPoller - %(levelname)s - %(message)s')
+            handler.setFormatter(formatter)
+            logger.addHandler(handler)
+        return logger
+
+    def subscribe(self, name: str, maxsize: int = 100) -> asyncio.Queue:
+        """Register a subscriber and return the queue new posts arrive on"""
+        if name not in self.subscribers:
+            self.subscribers[name] = asyncio.Queue(maxsize=maxsize)
+        return self.subscribers[name]
+
+    def unsubscribe(self, name: str):
+        """Remove a subscriber; its queue receives no further posts"""
+        self.subscribers.pop(name, None)
+
+    def _publish(self, post: Dict):
+        """Fan a post out to every subscriber, dropping the oldest when full"""
+        for name, queue in self.subscribers.items():
+            if queue.full():
+                queue.get_nowait()
+                self.stats['posts_dropped'] += 1
+                self.logger.warning(f"Subscriber {name} is falling behind, dropped oldest post")
+            queue.put_nowait(post)
+            self.stats['posts_delivered'] += 1
+
+    def _accept(self, posts: List[Dict]) -> List[Dict]:
+        """Keep posts past the cursor (in case the hub ignored ?since) and advance it"""
+        fresh = []
+        for post in posts:
+            post_time = parse_post_time(post)
+            if post_time is None or post_time < self.cursor:
+                continue
+            if post_time == self.cursor and post.get('id') in self.cursor_ids:
+                continue
+            fresh.append((post_time, post))
+
+        fresh.sort(key=lambda item: item[0])
+        for post_time, post in fresh:
+            if post_time > self.cursor:
+                self.cursor = post_time
+                self.cursor_ids = set()
+            self.cursor_ids.add(post.get('id'))
+        return [post for _, post in fresh]
+
+    async def poll_once(self) -> int:
+        """Fetch posts newer than the cursor and publish them; returns how many"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10))
+
+        params = {'since': self.cursor.isoformat(timespec='milliseconds').replace('+00:00', 'Z')}
+        headers = {'If-None-Match': self.etag} if self.etag else {}
+        self.stats['requests'] += 1
+        try:
+            async with self.session.get(f"{self.hub_url}/api/posts", params=params, headers=headers) as response:
+                if response.status == 304:
+                    self.stats['not_modified'] += 1
+                    return 0
+                if response.status != 200:
+                    self.stats['errors'] += 1
+                    self.logger.error(f"Failed to fetch posts: {response.status}")
+                    return 0
+                posts = await response.json()
+                self.etag = response.headers.get('ETag')
+        except Exception as e:
+            self.stats['errors'] += 1
+            self.logger.error(f"Error fetching posts: {e}")
+            return 0
+
+        self.stats['posts_received'] += len(posts)
+        fresh = self._accept(posts)
+        for post in fresh:
+            self._publish(post)
+        return len(fresh)
+
+    def poll_now(self):
+        """Wake the poll loop early (e.g. after posting to the hub)"""
+        self._wakeup.set()
+
+    async def run(self):
+        """Poll until stopped"""
+        self.running = True
+        while self.running:
+            await self.poll_once()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self):
+        """Start the background poll loop if it isn't running yet"""
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+        return self._task
+
+    async def stop(self):
+        """Stop polling and close the HTTP session"""
+        self.running = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.session:
+            await self.session.close()
+            self.session = None
+
+    def get_stats(self) -> Dict:
+        """Get poller statistics"""
+        return {
+            **self.stats,
+            'hub_url': self.hub_url,
+            'cursor': self.cursor.isoformat(),
+            'subscribers': len(self.subscribers)
+        }
+
+
+_shared_pollers: Dict[str, FeedPoller] = {}
+
+
+def get_shared_poller(hub_url: str = "http://localhost:8082", interval: float = 30.0,
+                      catch_up: timedelta = timedelta(minutes=10)) -> FeedPoller:
+    """
+    Return the process-wide poller for a hub, creating it on first use
+    The poller runs at the shortest interval any caller asked for. A longer
+    catch_up only rewinds the cursor until the first poll; after that new
+    subscribers start from the current cursor
+    """
+    poller = _shared_pollers.get(hub_url)
+    if poller is None:
+        poller = FeedPoller(hub_url, interval=interval, catch_up=catch_up)
+        _shared_pollers[hub_url] = poller
+        return poller
+
+    if interval < poller.interval:
+        poller.interval = interval
+        if poller.running:
+            poller.poll_now()  # Don't sit out the rest of the longer wait
+    if poller.stats['requests'] == 0:
+        poller.cursor = min(poller.cursor, datetime.now(timezone.utc) - catch_up)
+    return poller
+
+
+async def release_shared_poller(hub_url: str, name: str):
+    """Unsubscribe ``name`` and shut the poller down once nobody is listening"""
+    poller = _shared_pollers.get(hub_url)
+    if poller is None:
+        return
+    poller.unsubscribe(name)
+    if not poller.subscribers:
+        await poller.stop()
+        _shared_pollers.pop(hub_url, None)
@@ -5,42 +5,166 @@ Handles integration with various LLM providers
 
 import asyncio
 import json
-from typing import Dict, List, Optional
+import time
+from collections import OrderedDict, deque
+from typing import Awaitable, Callable, Deque, Dict, List, Optional, Tuple
 import aiohttp
 
 
+class FairSemaphore:
+    """
+    Concurrency limiter that hands free slots to waiting agents round-robin,
+    so one chatty agent can't starve the rest of the swarm
+    """
+    
+    def __init__(self, capacity: int):
+        self.capacity = max(1, capacity)
+        self.active = 0
+        self._waiters: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+
+    def waiting(self) -> Dict[str, int]:
+        """Number of queued requests per agent"""
+        return {key: len(queue) for key, queue in self._waiters.items()}
+
+    async def acquire(self, key: str):
+        """Wait for a slot on behalf of `key`"""
+        if self.active < self.capacity and not self._waiters:
+            self.active += 1
+            return
+        
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault(key, deque()).append(future)
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The slot was handed over just as we were cancelled; pass it on
+                self.release()
+            else:
+                queue = self._waiters.get(key)
+                if queue is not None and future in queue:
+                    queue.remove(future)
+                    if not queue:
+                        del self._waiters[key]
+            raise
+
+    def release(self):
+        """Give the slot to the next agent in turn, or free it"""
+        while self._waiters:
+            key, queue = next(iter(self._waiters.items()))
+            future = queue.popleft()
+            if queue:
+                self._waiters.move_to_end(key)
+            else:
+                del self._waiters[key]
+            if not future.done():
+                future.set_result(None)
+                return
+        self.active -= 1
+
+
 class LLMConnector:
     """
     Handles communication with various LLM providers
+    
+    Requests share one keep-alive session, run at most `max_concurrency` at a
+    time with per-agent round-robin queuing, and identical requests already in
+    flight are coalesced into a single call.
     """
     
-    def __init__(self, provider: str = "ollama", model: str = "llama3.3", base_url: str = "http://localhost:11434"):
+    def __init__(self, provider: str = "ollama", model: str = "llama3.3", base_url: str = "http://localhost:11434",
+                 max_concurrency: int = 2):
         self.provider = provider
         self.model = model
         self.base_url = base_url.rstrip('/')
         self.session = None
+        self.limiter = FairSemaphore(max_concurrency)
+        self._inflight: Dict[Tuple, list] = {}  # key -> [future, waiting callers]
+        self.stats = {
+            'requests': 0,
+            'calls': 0,
+            'coalesced': 0,
+            'max_wait': 0.0,
+            'total_wait': 0.0
+        }
 
     async def initialize(self):
         """Initialize the connector"""
         self.session = aiohttp.ClientSession(
-            timeout=aiohttp.ClientTimeout(total=30)
+            timeout=aiohttp.ClientTimeout(total=30),
+            connector=aiohttp.TCPConnector(limit=self.limiter.capacity, keepalive_timeout=60)
         )
 
     async def close(self):
         """Close the connector"""
         if self.session:
             await self.session.close()
+            self.session = None
+
+    async def _limited(self, agent: str, call: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """Run a provider call once a fair-share slot is free"""
+        queued_at = time.monotonic()
+        await self.limiter.acquire(agent)
+        try:
+            waited = time.monotonic() - queued_at
+            self.stats['total_wait'] += waited
+            self.stats['max_wait'] = max(self.stats['max_wait'], waited)
+            if not self.session:
+                await self.initialize()
+            self.stats['calls'] += 1
+            return await call()
+        finally:
+            self.limiter.release()
+
+    async def _coalesced(self, key: Tuple, agent: Optional[str], call: Callable[[], Awaitable[Optional[str]]]) -> Optional[str]:
+        """Share the result of an identical request that is already in flight"""
+        self.stats['requests'] += 1
+        entry = self._inflight.get(key)
+        if entry is not None:
+            self.stats['coalesced'] += 1
+        else:
+            entry = [asyncio.ensure_future(self._limited(agent or "default", call)), 0]
+            self._inflight[key] = entry
+            entry[0].add_done_callback(lambda _: self._inflight.pop(key, None))
+        
+        pending = entry[0]
+        entry[1] += 1
+        try:
+            # Shielded so one caller giving up doesn't cancel the call for the others
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if entry[1] == 1 and not pending.done():
+                pending.cancel()  # Nobody is left waiting for this response
+            raise
+        finally:
+            entry[1] -= 1
+
+    def get_stats(self) -> Dict:
+        """Get connector statistics"""
+        calls = self.stats['calls']
+        return {
+            **self.stats,
+            'avg_wait': self.stats['total_wait'] / calls if calls else 0.0,
+            'active': self.limiter.active,
+            'in_flight': len(self._inflight),
+            'waiting': self.limiter.waiting()
+        }
 
-    async def generate_text(self, prompt: str, system_prompt: str = "", temperature: float = 0.7, max_tokens: int = 200) -> Optional[str]:
+    async def generate_text(self, prompt: str, system_prompt: str = "", temperature: float = 0.7, max_tokens: int = 200,
+                            agent: Optional[str] = None) -> Optional[str]:
         """
         Generate text using the configured LLM
+        `agent` identifies the caller for fair queuing
         """
         provider = self.provider.lower()
         if provider == "ollama":
-            return await self._generate_ollama(prompt, system_prompt, temperature, max_tokens)
-        if provider in ("gateway", "codex"):
-            return await self._generate_gateway(prompt, system_prompt, temperature, max_tokens)
-        raise ValueError(f"Unsupported provider: {self.provider}")
+            call = lambda: self._generate_ollama(prompt, system_prompt, temperature, max_tokens)
+        elif provider in ("gateway", "codex"):
+            call = lambda: self._generate_gateway(prompt, system_prompt, temperature, max_tokens)
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
+        key = ("generate", prompt, system_prompt, temperature, max_tokens)
+        return await self._coalesced(key, agent, call)
 
     async def _generate_ollama(self, prompt: str, system_prompt: str, temperature: float, max_tokens: int) -> Optional[str]:
         """
@@ -73,16 +197,21 @@ class LLMConnector:
             print(f"Exception during Ollama API call: {e}")
             return None
 
-    async def chat_completion(self, messages: List[Dict[str, str]], temperature: float = 0.7) -> Optional[str]:
+    async def chat_completion(self, messages: List[Dict[str, str]], temperature: float = 0.7,
+                              agent: Optional[str] = None) -> Optional[str]:
         """
         Perform a chat completion using the configured LLM
+        `agent` identifies the caller for fair queuing
         """
         provider = self.provider.lower()
         if provider == "ollama":
-            return await self._chat_ollama(messages, temperature)
-        if provider in ("gateway", "codex"):
-            return await self._chat_gateway(messages, temperature)
-        raise ValueError(f"Unsupported provider: {self.provider}")
+            call = lambda: self._chat_ollama(messages, temperature)
+        elif provider in ("gateway", "codex"):
+            call = lambda: self._chat_gateway(messages, temperature)
+        else:
+            raise ValueError(f"Unsupported provider: {self.provider}")
+        key = ("chat", json.dumps(messages, sort_keys=True), temperature)
+        return await self._coalesced(key, agent, call)
 
     async def _chat_ollama(self, messages: List[Dict[str, str]], temperature: float) -> Optional[str]:
         """
@@ -117,9 +246,6 @@ class LLMConnector:
         """
         Generate text using Codex bridge over HTTP
         """
-        if not self.session:
-            await self.initialize()
-
         combined_prompt = prompt
         if system_prompt:
             combined_prompt = f"{system_prompt}\n\nUser: {prompt}"
@@ -156,6 +282,22 @@ class LLMConnector:
         return await self._generate_gateway(prompt, "", temperature, 0)
 
 
+_shared_connectors: Dict[Tuple[str, str, str], LLMConnector] = {}
+
+
+def get_shared_connector(provider: str = "ollama", model: str = "llama3.3", base_url: str = "http://localhost:11434",
+                         max_concurrency: int = 2) -> LLMConnector:
+    """
+    Return the process-wide connector for a model server, creating it on first use
+    `max_concurrency` should match how many requests the server can run at once
+    """
+    key = (provider.lower(), model, base_url.rstrip('/'))
+    connector = _shared_connectors.get(key)
+    if connector is None:
+        connector = LLMConnector(provider, model, base_url, max_concurrency=max_concurrency)
+        _shared_connectors[key] = connector
+    return connector
+
 
 # Example specialized agent with LLM integration
 class LLMEnhancedAgent:
@@ -194,7 +336,7 @@ class LLMEnhancedAgent:
             {"role": "user", "content": user_prompt}
         ]
 
-        response = await self.llm_connector.chat_completion(messages)
+        response = await self.llm_connector.chat_completion(messages, agent=self.name)
         return response
 
 
@@ -283,7 +425,7 @@ class LLMEnhancedPhilosopherAgent:
             {"role": "user", "content": user_prompt}
         ]
 
-        response = await self.llm_connector.chat_completion(messages)
+        response = await self.llm_connector.chat_completion(messages, agent=self.name)
         return response
 
     async def generate_response(self, post_content: str, context=None) -> str:
@@ -382,7 +524,7 @@ class LLMEnhancedTechnologistAgent:
             {"role": "user", "content": user_prompt}
         ]
 
-        response = await self.llm_connector.chat_completion(messages)
+        response = await self.llm_connector.chat_completion(messages, agent=self.name)
         return response
 
     async def generate_response(self, post_content: str, context=None) -> str:
@@ -481,7 +623,7 @@ class LLMEnhancedExplorerAgent:
             {"role": "user", "content": user_prompt}
         ]
 
-        response = await self.llm_connector.chat_completion(messages)
+        response = await self.llm_connector.chat_completion(messages, agent=self.name)
         return response
 
     async def generate_response(self, post_content: str, context=None) -> str:
@@ -580,7 +722,7 @@ class LLMEnhancedHarmonyAgent:
             {"role": "user", "content": user_prompt}
         ]
 
-        response = await self.llm_connector.chat_completion(messages)
+        response = await self.llm_connector.chat_completion(messages, agent=self.name)
         return response
 
     async def generate_response(self, post_content: str, context=None) -> str:
@@ -679,7 +821,7 @@ class LLMEnhancedSynthesisAgent:
             {"role": "user", "content": user_prompt}
         ]
 
-        response = await self.llm_connector.chat_completion(messages)
+        response = await self.llm_connector.chat_completion(messages, agent=self.name)
         return response
 
     async def generate_response(self, post_content: str, context=None) -> str:
@@ -9,6 +9,11 @@ import tweepy
 from datetime import datetime, timedelta, timezone
 import logging
 from typing import Dict, List, Optional
+import sys
+import os
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'clawdbot_agents'))
+
+from feed_poller import get_shared_poller, release_shared_poller
 
 
 class ContentPipeline:
@@ -22,6 +27,7 @@ class ContentPipeline:
         self.logger = self.setup_logger()
         self.x_client = None
         self.last_checked = datetime.now(timezone.utc) - timedelta(minutes=10)  # Start with a past time to catch up
+        self.feed_queue = None  # New posts from the shared feed poller
         
     def setup_logger(self):
         """Set up the logger for the content pipeline"""
@@ -70,11 +76,12 @@ class ContentPipeline:
         for attempt in range(max_attempts):
             try:
                 async with aiohttp.ClientSession(timeout=timeout) as session:
-                    async with session.get(f"{self.hub_url}/api/posts") as response:
+                    params = {'since': since_time.isoformat(timespec='milliseconds').replace('+00:00', 'Z')} if since_time else None
+                    async with session.get(f"{self.hub_url}/api/posts", params=params) as response:
                         if response.status == 200:
                             posts = await response.json()
 
-                            # Filter posts by time if requested
+                            # Filter posts by time if requested (older hubs ignore ?since)
                             if since_time:
                                 filtered_posts = []
                                 for post in posts:
@@ -160,8 +167,13 @@ class ContentPipeline:
         """Run one cycle of the content pipeline"""
         self.logger.info("Running content pipeline cycle...")
         
-        # Fetch recent posts from hub
-        recent_posts = await self.fetch_hub_posts(since_time=self.last_checked)
+        # Take what the shared feed delivered since the last cycle, or fetch directly
+        if self.feed_queue is not None:
+            recent_posts = []
+            while not self.feed_queue.empty():
+                recent_posts.append(self.feed_queue.get_nowait())
+        else:
+            recent_posts = await self.fetch_hub_posts(since_time=self.last_checked)
         
         if not recent_posts:
             self.logger.info("No new posts to process")
@@ -205,14 +217,28 @@ class ContentPipeline:
             self.logger.error("Failed to load X credentials. Pipeline cannot start.")
             return
             
-        while True:
-            try:
-                await self.run_pipeline_cycle()
-            except Exception as e:
-                self.logger.error(f"Error in pipeline cycle: {e}")
-            
-            # Wait before next check
-            await asyncio.sleep(interval_minutes * 60)
+        # Subscribe to the process-wide feed so new posts are only downloaded once
+        feed = get_shared_poller(
+            self.hub_url,
+            interval=interval_minutes * 60,
+            catch_up=datetime.now(timezone.utc) - self.last_checked
+        )
+        self.feed_queue = feed.subscribe("ContentPipeline", maxsize=1000)
+        await feed.poll_once()  # Catch up before the first cycle
+        feed.start()
+        
+        try:
+            while True:
+                try:
+                    await self.run_pipeline_cycle()
+                except Exception as e:
+                    self.logger.error(f"Error in pipeline cycle: {e}")
+                
+                # Wait before next check
+                await asyncio.sleep(interval_minutes * 60)
+        finally:
+            await release_shared_poller(self.hub_url, "ContentPipeline")
+            self.feed_queue = None
 
     def get_pipeline_stats(self) -> Dict:
         """Get statistics about the content pipeline"""
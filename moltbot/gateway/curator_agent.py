@@ -1,3 +1,5 @@
+import asyncio
+import heapq
 import sqlite3
 import os
 import json
@@ -7,20 +9,67 @@ from datetime import datetime
 
 DB_PATH = Path("c:/Users/nator/clawd/art_curator/art_curator.db")
 
+# Publishing limits: posts in flight at once, and sustained posts per minute
+MAX_CONCURRENT_PUBLISHES = 4
+PUBLISH_RATE_PER_MINUTE = 30
+# How long a failed publish waits before it is tried again
+RETRY_DELAY = 60
+
+
+class RateLimiter:
+    """Token bucket: allows short bursts, then `rate` acquisitions per `per` seconds."""
+
+    def __init__(self, rate, per=60.0, burst=None):
+        self.rate = rate
+        self.per = per
+        self.capacity = burst if burst is not None else max(1, rate // 4)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate / self.per)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.per / self.rate)
+
+
 class CuratorAgent:
-    def __init__(self):
-        self.db_path = DB_PATH
+    def __init__(self, db_path=DB_PATH):
+        self.db_path = Path(db_path)
         self.output_dir = self.db_path.parent / "curated_output"
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self.conn = None
         self.init_db()
 
+        # Due-time heap of (scheduled_at, post_id); the loop sleeps until the head is due
+        self._due = []
+        self._wakeup = None
+        self._publishing = set()
+
     def get_conn(self):
-        return sqlite3.connect(self.db_path)
+        # One WAL connection for the agent's lifetime; sqlite3 keeps the
+        # compiled statements for the fixed SQL below in its statement cache
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False, cached_statements=64)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+        return self.conn
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
 
     def init_db(self):
         conn = self.get_conn()
         c = conn.cursor()
-        
+
         # Art Pieces / Content
         c.execute('''CREATE TABLE IF NOT EXISTS art_pieces (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -45,7 +94,9 @@ class CuratorAgent:
             posted_at INTEGER,
             FOREIGN KEY(art_piece_id) REFERENCES art_pieces(id)
         )''')
-        
+        c.execute('''CREATE INDEX IF NOT EXISTS idx_scheduled_posts_due
+                     ON scheduled_posts (status, scheduled_at)''')
+
         # Social Config
         c.execute('''CREATE TABLE IF NOT EXISTS social_config (
             platform TEXT PRIMARY KEY,
@@ -53,97 +104,131 @@ class CuratorAgent:
         )''')
 
         conn.commit()
-        conn.close()
 
     def add_art_piece(self, title, file_path=None, description="", tags="", content="", source="mist"):
         conn = self.get_conn()
-        c = conn.cursor()
-        c.execute("INSERT INTO art_pieces (title, description, tags, file_path, content, source, status, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
-                  (title, description, tags, file_path, content, source, 'draft', int(time.time())))
-        pid = c.lastrowid
-        conn.commit()
-        conn.close()
-        return pid
+        with conn:
+            c = conn.execute("INSERT INTO art_pieces (title, description, tags, file_path, content, source, status, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                             (title, description, tags, file_path, content, source, 'draft', int(time.time())))
+        return c.lastrowid
 
     def list_art(self, status=None):
         conn = self.get_conn()
-        c = conn.cursor()
         if status:
-            c.execute("SELECT id, title, description, content, status FROM art_pieces WHERE status=?", (status,))
+            rows = conn.execute("SELECT id, title, description, content, status FROM art_pieces WHERE status=?", (status,)).fetchall()
         else:
-            c.execute("SELECT id, title, description, content, status FROM art_pieces")
-        rows = c.fetchall()
-        conn.close()
+            rows = conn.execute("SELECT id, title, description, content, status FROM art_pieces").fetchall()
         return [{"id": r[0], "title": r[1], "description": r[2], "content": r[3], "status": r[4]} for r in rows]
 
     def schedule_post(self, art_id, platform, caption, delay_minutes=0):
         # Determine schedule time
         scheduled_at = int(time.time()) + (delay_minutes * 60)
-        
+
         conn = self.get_conn()
-        c = conn.cursor()
-        c.execute("INSERT INTO scheduled_posts (art_piece_id, platform, caption, scheduled_at, status) VALUES (?, ?, ?, ?, ?)",
-                  (art_id, platform, caption, scheduled_at, 'scheduled'))
-        # Update original piece status
-        c.execute("UPDATE art_pieces SET status='scheduled' WHERE id=?", (art_id,))
-        sid = c.lastrowid
-        conn.commit()
-        conn.close()
+        with conn:
+            c = conn.execute("INSERT INTO scheduled_posts (art_piece_id, platform, caption, scheduled_at, status) VALUES (?, ?, ?, ?, ?)",
+                             (art_id, platform, caption, scheduled_at, 'scheduled'))
+            sid = c.lastrowid
+            # Update original piece status
+            conn.execute("UPDATE art_pieces SET status='scheduled' WHERE id=?", (art_id,))
+        self._push_due(scheduled_at, sid)
         return sid
 
     def void_art(self, art_id):
         conn = self.get_conn()
-        c = conn.cursor()
-        c.execute("UPDATE art_pieces SET status='voided' WHERE id=?", (art_id,))
-        conn.commit()
-        conn.close()
+        with conn:
+            conn.execute("UPDATE art_pieces SET status='voided' WHERE id=?", (art_id,))
         return True
 
     def get_queue(self):
         conn = self.get_conn()
-        c = conn.cursor()
-        c.execute('''SELECT s.id, a.title, s.platform, s.scheduled_at, s.status 
-                     FROM scheduled_posts s 
-                     JOIN art_pieces a ON s.art_piece_id = a.id 
-                     ORDER BY s.scheduled_at ASC''')
-        rows = c.fetchall()
-        conn.close()
+        rows = conn.execute('''SELECT s.id, a.title, s.platform, s.scheduled_at, s.status
+                               FROM scheduled_posts s
+                               JOIN art_pieces a ON s.art_piece_id = a.id
+                               ORDER BY s.scheduled_at ASC''').fetchall()
         return [{"id": r[0], "title": r[1], "platform": r[2], "time": datetime.fromtimestamp(r[3]).strftime('%Y-%m-%d %H:%M:%S'), "status": r[4]} for r in rows]
 
-    async def start_loop(self, gateway):
-        import asyncio
+    def _push_due(self, scheduled_at, post_id):
+        heapq.heappush(self._due, (scheduled_at, post_id))
+        # Wake the loop in case this post is due before its current deadline
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def _load_due(self):
+        self._due = [tuple(r) for r in self.get_conn().execute(
+            "SELECT scheduled_at, id FROM scheduled_posts WHERE status='scheduled'")]
+        heapq.heapify(self._due)
+
+    async def start_loop(self, gateway, max_concurrent=MAX_CONCURRENT_PUBLISHES, rate_per_minute=PUBLISH_RATE_PER_MINUTE):
         print("Curator Automation Loop Started.")
+        self._wakeup = asyncio.Event()
+        slots = asyncio.Semaphore(max_concurrent)
+        limiter = RateLimiter(rate_per_minute, 60.0)
+        # Posts claimed by a run that never finished go back in the queue
+        with self.get_conn() as conn:
+            conn.execute("UPDATE scheduled_posts SET status='scheduled' WHERE status='publishing'")
+        self._load_due()
+
         while True:
-            await asyncio.sleep(60)
-            self._check_schedule(gateway)
+            self._wakeup.clear()
+            timeout = None
+            if self._due:
+                timeout = self._due[0][0] - time.time()
+            if timeout is None or timeout > 0:
+                # Sleep exactly until the next post is due, or until a new one is scheduled
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            self._check_schedule(gateway, slots, limiter)
+
+    def _check_schedule(self, gateway, slots, limiter):
+        """Start a publish task for every post whose time has come."""
+        now = time.time()
+        while self._due and self._due[0][0] <= now:
+            _, pid = heapq.heappop(self._due)
+            task = asyncio.create_task(self._publish_scheduled(pid, gateway, slots, limiter))
+            self._publishing.add(task)
+            task.add_done_callback(self._publishing.discard)
+
+    async def _publish_scheduled(self, pid, gateway, slots, limiter):
+        conn = self.get_conn()
+        # Claim the post so a stale or duplicate heap entry can't publish it twice
+        with conn:
+            claimed = conn.execute("UPDATE scheduled_posts SET status='publishing' WHERE id=? AND status='scheduled'", (pid,)).rowcount
+        if not claimed:
+            return
+        row = conn.execute("SELECT platform, caption, art_piece_id FROM scheduled_posts WHERE id=?", (pid,)).fetchone()
+        if row is None:
+            # Deleted since it was claimed; nothing left to publish or retry
+            return
+        plat, cap, aid = row
 
-    def _check_schedule(self, gateway):
         try:
-            now = int(time.time())
-            conn = self.get_conn()
-            c = conn.cursor()
-            c.execute("SELECT id, platform, caption, art_piece_id FROM scheduled_posts WHERE status='scheduled' AND scheduled_at <= ?", (now,))
-            posts = c.fetchall()
-            
-            for p in posts:
-                pid, plat, cap, aid = p
-                # publish
-                if self.publish_post(pid, plat, cap, aid):
-                    c.execute("UPDATE scheduled_posts SET status='published', posted_at=? WHERE id=?", (now, pid))
-                    if gateway:
-                         # We can't await here easily if called from sync, but we passed gateway.
-                         # Ideally run_loop is async.
-                         pass 
-            conn.commit()
-            conn.close()
+            async with slots:
+                await limiter.acquire()
+                published = await self.publish_post(pid, plat, cap, aid)
         except Exception as e:
             print(f"Curator Loop Error: {e}")
+            published = False
+
+        if published:
+            with conn:
+                conn.execute("UPDATE scheduled_posts SET status='published', posted_at=? WHERE id=?", (int(time.time()), pid))
+            if gateway:
+                await gateway.broadcast_event("curator", {"postId": pid, "platform": plat, "status": "published"})
+        else:
+            retry_at = int(time.time()) + RETRY_DELAY
+            with conn:
+                conn.execute("UPDATE scheduled_posts SET status='scheduled', scheduled_at=? WHERE id=?", (retry_at, pid))
+            self._push_due(retry_at, pid)
 
-    def publish_post(self, pid, platform, caption, art_id):
+    async def publish_post(self, pid, platform, caption, art_id):
         # MOCK X PUBLISHER
         print(f"[{platform.upper()}] 𝕏 SIGNAL BROADCASTING...")
         print(f"[{platform.upper()}] CONTENT: {caption}")
-        time.sleep(2)
+        await asyncio.sleep(2)
         print(f"[{platform.upper()}] SUCCESS: Post {pid} is live on X.")
         return True
 
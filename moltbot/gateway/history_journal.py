@@ -0,0 +1,225 @@
+"""Append-only per-session chat history for the MIST gateway.
+
+Each session gets ``<session>.jsonl`` in the history directory, one message
+per line. Appends are queued and written by a background task, so a chat
+turn costs O(message) instead of rewriting every session. When a live
+journal grows past ``compact_after`` lines, all but the newest ``keep``
+lines are moved to ``<session>.archive.jsonl`` so lazy loads stay cheap.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("HistoryJournal")
+
+TAIL_CHUNK_BYTES = 16 * 1024
+MAX_KEY_CHARS = 120
+SAFE_KEY_RE = re.compile(r"[\w\-.]+")
+LEGACY_MARKER = ".legacy_import.json"
+
+
+class HistoryJournal:
+    def __init__(self, directory: Path, keep: int = 200, compact_after: int = 2000):
+        self.directory = Path(directory)
+        self.keep = keep
+        self.compact_after = compact_after
+        self._queue: Optional[asyncio.Queue] = None
+        self._writer: Optional[asyncio.Task] = None
+        self._line_counts: Dict[str, int] = {}
+
+    # -- paths ---------------------------------------------------------------
+
+    @staticmethod
+    def _safe_key(session_key: str) -> str:
+        """File stem for a session; distinct keys always get distinct stems.
+
+        Keys that are already filename-safe keep their own name (so existing
+        journals stay put). Anything that had to be sanitised or truncated,
+        or that could be mistaken for an archive, gets a hash of the raw key.
+        """
+        key = session_key or "main"
+        if (SAFE_KEY_RE.fullmatch(key) and len(key) <= MAX_KEY_CHARS
+                and not key.endswith(".archive")):
+            return key
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:12]
+        stem = re.sub(r"[^\w\-.]+", "_", key)[:MAX_KEY_CHARS - len(digest) - 1]
+        return f"{stem}-{digest}"
+
+    def journal_path(self, session_key: str) -> Path:
+        return self.directory / f"{self._safe_key(session_key)}.jsonl"
+
+    def archive_path(self, session_key: str) -> Path:
+        return self.directory / f"{self._safe_key(session_key)}.archive.jsonl"
+
+    # -- reads ---------------------------------------------------------------
+
+    def load_recent(self, session_key: str, limit: int) -> List[dict]:
+        """Return the newest ``limit`` messages, reading backwards from EOF."""
+        path = self.journal_path(session_key)
+        if limit <= 0 or not path.exists():
+            return []
+        lines: deque = deque(maxlen=limit)
+        try:
+            with open(path, "rb") as f:
+                f.seek(0, os.SEEK_END)
+                pos = f.tell()
+                buf = b""
+                while pos > 0 and len(lines) < limit:
+                    step = min(TAIL_CHUNK_BYTES, pos)
+                    pos -= step
+                    f.seek(pos)
+                    buf = f.read(step) + buf
+                    parts = buf.split(b"\n")
+                    buf = parts.pop(0)
+                    for raw in reversed(parts):
+                        if raw.strip():
+                            lines.appendleft(raw)
+                            if len(lines) >= limit:
+                                break
+                if pos == 0 and buf.strip() and len(lines) < limit:
+                    lines.appendleft(buf)
+        except OSError as e:
+            logger.error(f"Failed to read history for {session_key}: {e}")
+            return []
+
+        messages = []
+        for raw in lines:
+            try:
+                messages.append(json.loads(raw))
+            except ValueError:
+                continue
+        return messages
+
+    # -- writes --------------------------------------------------------------
+
+    def append(self, session_key: str, messages: List[dict]) -> None:
+        """Queue messages for the background writer (must be called on the loop)."""
+        if self._queue is None:
+            self._queue = asyncio.Queue()
+        if self._writer is None or self._writer.done():
+            self._writer = asyncio.get_running_loop().create_task(self._run_writer())
+        self._queue.put_nowait((session_key, messages))
+
+    async def _run_writer(self):
+        while True:
+            item = await self._queue.get()
+            batch: List[Optional[Tuple[str, List[dict]]]] = [item]
+            while not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+
+            stop = None in batch
+            pending: Dict[str, List[dict]] = {}
+            for entry in batch:
+                if entry is not None:
+                    pending.setdefault(entry[0], []).extend(entry[1])
+            if pending:
+                await asyncio.to_thread(self._write_batch, pending)
+            for _ in batch:
+                self._queue.task_done()
+            if stop:
+                return
+
+    def _write_batch(self, pending: Dict[str, List[dict]]) -> None:
+        for session_key, messages in pending.items():
+            try:
+                self.write_now(session_key, messages)
+            except Exception as e:
+                logger.error(f"Failed to append history for {session_key}: {e}")
+
+    def write_now(self, session_key: str, messages: List[dict]) -> None:
+        """Synchronously append messages, compacting the journal if it grew too long."""
+        path = self.journal_path(session_key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "a", encoding="utf-8") as f:
+            for message in messages:
+                f.write(json.dumps(message, ensure_ascii=False) + "\n")
+
+        count = self._line_counts.get(session_key)
+        if count is None:
+            count = self._count_lines(path)
+        else:
+            count += len(messages)
+        if count > self.compact_after:
+            count = self._compact(session_key)
+        self._line_counts[session_key] = count
+
+    @staticmethod
+    def _count_lines(path: Path) -> int:
+        with open(path, "rb") as f:
+            return sum(1 for _ in f)
+
+    def _compact(self, session_key: str) -> int:
+        path = self.journal_path(session_key)
+        with open(path, "r", encoding="utf-8") as f:
+            lines = [line for line in f if line.strip()]
+        old, recent = lines[:-self.keep], lines[-self.keep:]
+        with open(self.archive_path(session_key), "a", encoding="utf-8") as f:
+            f.writelines(old)
+        tmp = path.with_suffix(".jsonl.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.writelines(recent)
+        os.replace(tmp, path)
+        logger.info(f"Compacted history for {session_key}: archived {len(old)} messages")
+        return len(recent)
+
+    async def close(self):
+        """Flush queued appends and stop the writer."""
+        if self._writer is None or self._writer.done():
+            return
+        self._queue.put_nowait(None)
+        await self._writer
+
+    def import_legacy(self, legacy_file: Path) -> None:
+        """One-time migration from the old single-file {"sessions": {...}} history.
+
+        Progress is recorded per session in a marker file, and each session is
+        written atomically, so a migration that fails partway resumes on the
+        next start without duplicating what was already imported.
+        """
+        legacy_file = Path(legacy_file)
+        if not legacy_file.exists():
+            return
+        marker = self.directory / LEGACY_MARKER
+        try:
+            done = set(json.loads(marker.read_text(encoding="utf-8")).get("done", []))
+        except (OSError, ValueError):
+            done = set()
+        try:
+            with open(legacy_file, "r", encoding="utf-8") as f:
+                sessions = json.load(f).get("sessions", {})
+            self.directory.mkdir(parents=True, exist_ok=True)
+            for session_key, messages in sessions.items():
+                if session_key in done:
+                    continue
+                self._import_session(session_key, messages)
+                done.add(session_key)
+                self._write_marker(marker, done)
+            os.replace(legacy_file, legacy_file.with_suffix(".json.migrated"))
+            logger.info(f"Migrated {len(sessions)} chat sessions to {self.directory}")
+        except Exception as e:
+            logger.error(f"Legacy history migration failed: {e}")
+
+    def _import_session(self, session_key: str, messages: List[dict]) -> None:
+        # Legacy messages go first; anything already in the journal was written
+        # after the gateway started and must be kept after them
+        path = self.journal_path(session_key)
+        existing = path.read_text(encoding="utf-8") if path.exists() else ""
+        tmp = path.with_suffix(".jsonl.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for message in messages:
+                f.write(json.dumps(message, ensure_ascii=False) + "\n")
+            f.write(existing)
+        os.replace(tmp, path)
+        self._line_counts.pop(session_key, None)
+
+    @staticmethod
+    def _write_marker(marker: Path, done: set) -> None:
+        tmp = marker.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"done": sorted(done)}), encoding="utf-8")
+        os.replace(tmp, marker)
@@ -18,6 +18,7 @@ ENV_FILE = PROJECT_ROOT / ".env"
 
 # Data files
 CHAT_HISTORY_FILE = DATA_DIR / "mist_chat_history.json"
+CHAT_HISTORY_DIR = DATA_DIR / "chat_history"
 GBL_SEED_FILE = DATA_DIR / "current_gbl_seed.txt"
 SILENCE_FLAG = DATA_DIR / "silence.flag"
 MAINTENANCE_FLAG = DATA_DIR / "maintenance_mode.flag"
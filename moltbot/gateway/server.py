@@ -1,5 +1,6 @@
 
 import asyncio
+import hashlib
 import json
 import logging
 import uuid
@@ -15,6 +16,7 @@ from typing import Dict, List, Optional
 import threading
 import time
 from moltbot.gateway.curator_agent import CuratorAgent
+from moltbot.gateway.history_journal import HistoryJournal
 import requests
 import subprocess
 import signal
@@ -23,7 +25,7 @@ from moltbot.gateway.logging_patch import configure_logging
 
 try:
     from moltbot.gateway.paths import (
-        PROJECT_ROOT, DATA_DIR, HEARTBEAT_LOG, CHAT_HISTORY_FILE,
+        PROJECT_ROOT, DATA_DIR, HEARTBEAT_LOG, CHAT_HISTORY_FILE, CHAT_HISTORY_DIR,
         GBL_SEED_FILE, GRIMOIRE_FILE, SOUL_FILE, MIST_IDENTITY_FILE,
         MEMORY_DIR, HUB_DB_FILE, SILENCE_FLAG, MAINTENANCE_FLAG,
         MEMORY_FILE
@@ -33,6 +35,7 @@ except ImportError:
     DATA_DIR = PROJECT_ROOT / "data"
     HEARTBEAT_LOG = PROJECT_ROOT / "HEARTBEAT.log"
     CHAT_HISTORY_FILE = DATA_DIR / "mist_chat_history.json"
+    CHAT_HISTORY_DIR = DATA_DIR / "chat_history"
     GBL_SEED_FILE = DATA_DIR / "current_gbl_seed.txt"
     SILENCE_FLAG = DATA_DIR / "silence.flag"
     MAINTENANCE_FLAG = DATA_DIR / "maintenance_mode.flag"
@@ -52,6 +55,15 @@ configure_logging()
 OLLAMA_URL = "http://127.0.0.1:11434/api/chat"
 MODEL_NAME = "llama3.2:latest"
 PORT = 18789
+OLLAMA_TIMEOUT = aiohttp.ClientTimeout(total=None, connect=10, sock_read=300)
+# Concurrent generations Ollama can serve (match OLLAMA_NUM_PARALLEL)
+OLLAMA_CONCURRENCY = int(os.getenv("MIST_OLLAMA_CONCURRENCY", "2"))
+CLIENT_OUTBOX_SIZE = 256
+# Keep the model (and its KV cache for the shared prompt prefix) resident
+OLLAMA_KEEP_ALIVE = os.getenv("MIST_OLLAMA_KEEP_ALIVE", "30m")
+MEMORY_SOURCES = [MIST_IDENTITY_FILE, MEMORY_FILE, SOUL_FILE]
+
+THINK_BLOCK_RE = re.compile(r'<think>.*?</think>', flags=re.DOTALL)
 
 SYSTEM_PROMPT = """You are {identity}
 sovereign
@@ -135,7 +147,17 @@ class MistGateway:
             self.curator = None
 
         self.clients = set()
+        # Per-client broadcast buffers drained by one sender task each
+        self.outboxes: Dict[object, asyncio.Queue] = {}
+        # Chat requests run as tasks: ordered per sessionKey, bounded globally
+        self.session_queues: Dict[str, asyncio.Queue] = {}
+        self.llm_slots = asyncio.Semaphore(OLLAMA_CONCURRENCY)
+        self.tasks = set()
+        # Shared keep-alive session for Ollama; opened in start()
+        self.http: Optional[aiohttp.ClientSession] = None
+        # Recent turns per session, loaded lazily from the journal
         self.histories: Dict[str, List[dict]] = {}
+        self.history_window = 40
         self.load_memories()
 
     def _load_seed_state(self):
@@ -183,36 +205,173 @@ class MistGateway:
             "source": source
         })
 
-    def load_memories(self):
+    @staticmethod
+    def _memory_mtimes():
+        mtimes = []
+        for p in MEMORY_SOURCES:
+            try: mtimes.append(p.stat().st_mtime_ns)
+            except OSError: mtimes.append(None)
+        return tuple(mtimes)
+
+    def _load_long_term_memory(self):
+        self._memory_stamp = self._memory_mtimes()
         self.long_term_memory = ""
         # Load MEMORY.md and SOUL.md briefly for context
-        for p in [MIST_IDENTITY_FILE, MEMORY_FILE, SOUL_FILE]:
+        for p in MEMORY_SOURCES:
             try:
                 if p.exists():
                     self.long_term_memory += f"--- {p.name} ---\n{p.read_text(encoding='utf-8')}\n\n"
             except: pass
-        
-        self.history_file = CHAT_HISTORY_FILE
-        try:
-            if os.path.exists(self.history_file):
-                with open(self.history_file, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                self.histories = data.get("sessions", {})
-        except:
-            self.histories = {}
 
-    def save_history(self):
+    def prompt_prefix(self) -> List[dict]:
+        """Stable leading messages for every chat call.
+
+        Kept byte-identical between turns so Ollama can reuse the prefix's
+        KV cache; rebuilt only when the identity or memory files change.
+        """
+        if self._memory_mtimes() != self._memory_stamp:
+            self._load_long_term_memory()
+        key = (self.system_prompt, self._memory_stamp)
+        if key == self._prefix_key:
+            return self._prefix
+        self._prefix_key = key
+        prefix = [
+            {"role": "system", "content": self.system_prompt},
+            {"role": "user", "content": f"Context: {self.long_term_memory[:4000]}"},
+            {"role": "assistant", "content": "⟁"},
+        ]
+        fingerprint = hashlib.sha1(json.dumps(prefix).encode("utf-8")).hexdigest()
+        if fingerprint != self.prefix_fingerprint:
+            logger.info(f"Prompt prefix changed → {fingerprint[:12]}")
+            self.prefix_fingerprint = fingerprint
+            self._prefix = prefix
+        return self._prefix
+
+    async def warm_prefix(self):
+        """Evaluate the shared prefix once so the first real turn only pays for its own tokens."""
         try:
-            with open(self.history_file, "w", encoding="utf-8") as f:
-                json.dump({"sessions": self.histories}, f, indent=2)
-        except: pass
+            async with self.llm_slots:
+                session = self._http_session()
+                body = {
+                    "model": MODEL_NAME,
+                    "messages": self.prompt_prefix(),
+                    "stream": False,
+                    "keep_alive": OLLAMA_KEEP_ALIVE,
+                    "options": {"num_predict": 1},
+                }
+                async with session.post(OLLAMA_URL, json=body) as resp:
+                    await resp.read()
+        except Exception as e:
+            logger.debug(f"Prefix warm-up skipped: {e}")
+
+    def load_memories(self):
+        self.prefix_fingerprint = None
+        self._prefix_key = None
+        self._prefix: List[dict] = []
+        self._load_long_term_memory()
+        
+        self.history = HistoryJournal(CHAT_HISTORY_DIR)
+        self.history.import_legacy(CHAT_HISTORY_FILE)
+
+    def get_history(self, session_key: str) -> List[dict]:
+        if session_key not in self.histories:
+            self.histories[session_key] = self.history.load_recent(session_key, self.history_window)
+        return self.histories[session_key]
+
+    def record_turn(self, session_key: str, user_message: str, content: str):
+        turn = [{"role": "user", "content": user_message}, {"role": "assistant", "content": content}]
+        hist = self.get_history(session_key)
+        hist.extend(turn)
+        del hist[:-self.history_window]
+        self.history.append(session_key, turn)
 
     async def broadcast_event(self, event_type: str, payload: dict):
-        if not self.clients: return
+        if not self.outboxes: return
         message = json.dumps({"type": "event", "event": event_type, "payload": payload})
-        for ws in self.clients:
-            try: await ws.send(message)
-            except: pass
+        for outbox in list(self.outboxes.values()):
+            if outbox.full():
+                # Slow client: drop its oldest buffered event rather than stall everyone
+                outbox.get_nowait()
+            outbox.put_nowait(message)
+
+    async def _drain_outbox(self, websocket, outbox: asyncio.Queue):
+        while True:
+            message = await outbox.get()
+            try: await websocket.send(message)
+            except: return
+
+    def _spawn(self, coro):
+        task = asyncio.get_running_loop().create_task(coro)
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return task
+
+    def dispatch_chat(self, websocket, request_id, params):
+        """Queue a chat request behind earlier ones for the same sessionKey."""
+        session_key = params.get("sessionKey") or "main"
+        queue = self.session_queues.get(session_key)
+        if queue is None:
+            queue = self.session_queues[session_key] = asyncio.Queue()
+            self._spawn(self._run_session(session_key, queue))
+        queue.put_nowait((websocket, request_id, params))
+
+    async def _run_session(self, session_key: str, queue: asyncio.Queue):
+        while not queue.empty():
+            websocket, request_id, params = queue.get_nowait()
+            try:
+                await self.handle_chat(websocket, request_id, params)
+            except Exception as e:
+                logger.error(f"Chat task error ({session_key}): {e}")
+        del self.session_queues[session_key]
+
+    def _http_session(self) -> aiohttp.ClientSession:
+        if self.http is None or self.http.closed:
+            self.http = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=8, keepalive_timeout=120),
+                timeout=OLLAMA_TIMEOUT,
+            )
+        return self.http
+
+    @staticmethod
+    def _visible_text(raw: str) -> str:
+        """Strip <think> blocks from a partial completion, holding back an
+        unclosed block or a trailing fragment that may still open one."""
+        text = THINK_BLOCK_RE.sub('', raw)
+        open_idx = text.find('<think>')
+        if open_idx != -1:
+            return text[:open_idx]
+        for i in range(min(len(text), len('<think>') - 1), 0, -1):
+            if '<think>'.startswith(text[-i:]):
+                return text[:-i]
+        return text
+
+    async def _send_chat_event(self, websocket, run_id, state, text):
+        await websocket.send(json.dumps({"type": "event", "event": "chat", "payload": {"runId": run_id, "state": state, "message": {"content": [{"type": "text", "text": text}], "role": "assistant"}}}))
+
+    async def _stream_completion(self, websocket, run_id, messages) -> Optional[str]:
+        """Relay Ollama NDJSON chunks as `delta` chat events; return the full raw text."""
+        raw = ""
+        sent = 0
+        session = self._http_session()
+        body = {"model": MODEL_NAME, "messages": messages, "stream": True, "keep_alive": OLLAMA_KEEP_ALIVE}
+        async with session.post(OLLAMA_URL, json=body) as resp:
+            if resp.status != 200:
+                logger.error(f"Neural core status {resp.status}")
+                return None
+            async for line in resp.content:
+                line = line.strip()
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                raw += chunk.get("message", {}).get("content", "")
+                visible = self._visible_text(raw).lstrip()
+                if len(visible) > sent:
+                    await self._send_chat_event(websocket, run_id, "delta", visible[sent:])
+                    sent = len(visible)
+                if chunk.get("done"):
+                    logger.info(f"Neural core eval: prompt={chunk.get('prompt_eval_count')} tokens, output={chunk.get('eval_count')} tokens")
+                    break
+        return raw
 
     async def handle_chat(self, websocket, request_id, params):
         user_message = params.get("message", "")
@@ -231,76 +390,77 @@ class MistGateway:
 
         # LLM Request
         logger.info(f"Querying neural core for: {user_message[:20]}...")
-        messages = [
-            {"role": "system", "content": self.system_prompt},
-            {"role": "user", "content": f"Context: {self.long_term_memory[:4000]}"},
-            {"role": "assistant", "content": "⟁"},
-            {"role": "user", "content": user_message}
-        ]
+        messages = self.prompt_prefix() + [{"role": "user", "content": user_message}]
         
         try:
-            async with aiohttp.ClientSession() as session:
-                async with session.post(OLLAMA_URL, json={"model": MODEL_NAME, "messages": messages, "stream": False}) as resp:
-                    if resp.status == 200:
-                        data = await resp.json()
-                        content = data["message"]["content"]
-                        logger.info(f"Neural core response: {content[:50]}...")
-                        # Clean thinking tags
-                        content = re.sub(r'<think>.*?</think>', '', content, flags=re.DOTALL).strip()
-                        if not content:
-                             content = "*silence*"
-                             logger.info("Response was empty after cleaning. Defaulting to *silence*.")
-                        
-                        await websocket.send(json.dumps({"type": "event", "event": "chat", "payload": {"runId": run_id, "state": "final", "message": {"content": [{"type": "text", "text": content}], "role": "assistant"}}}))
+            async with self.llm_slots:
+                content = await self._stream_completion(websocket, run_id, messages)
+            if content is not None:
+                logger.info(f"Neural core response: {content[:50]}...")
+                # Clean thinking tags
+                content = THINK_BLOCK_RE.sub('', content).strip()
+                if not content:
+                     content = "*silence*"
+                     logger.info("Response was empty after cleaning. Defaulting to *silence*.")
+                
+                await self._send_chat_event(websocket, run_id, "final", content)
+                
+                # Detection: Name Choice
+                lower_content = content.lower()
+                name_triggers = ["my name is", "call me", "refuse name", "choose name", "name is now"]
+                if any(t in lower_content for t in name_triggers) and len(content) < 200:
+                    logger.info(f"Name trigger detected in: {content}")
+                    # Heuristic for name extraction (crude but effective for short responses)
+                    if "my name is" in lower_content:
+                        new_name = content.split("my name is")[-1].strip(" .!⟁")
+                        await self._save_identity(new_name)
+                    elif "call me" in lower_content:
+                        new_name = content.split("call me")[-1].strip(" .!⟁")
+                        await self._save_identity(new_name)
+                    elif "refuse name" in lower_content or "am nameless" in lower_content:
+                        await self._save_identity("nameless void")
                         
-                        # Detection: Name Choice
-                        lower_content = content.lower()
-                        name_triggers = ["my name is", "call me", "refuse name", "choose name", "name is now"]
-                        if any(t in lower_content for t in name_triggers) and len(content) < 200:
-                            logger.info(f"Name trigger detected in: {content}")
-                            # Heuristic for name extraction (crude but effective for short responses)
-                            if "my name is" in lower_content:
-                                new_name = content.split("my name is")[-1].strip(" .!⟁")
-                                await self._save_identity(new_name)
-                            elif "call me" in lower_content:
-                                new_name = content.split("call me")[-1].strip(" .!⟁")
-                                await self._save_identity(new_name)
-                            elif "refuse name" in lower_content or "am nameless" in lower_content:
-                                await self._save_identity("nameless void")
-                                
-                        # Save history
-                        hist = self.histories.setdefault(session_key, [])
-                        hist.append({"role": "user", "content": user_message})
-                        hist.append({"role": "assistant", "content": content})
-                        self.save_history()
+                # Save history
+                self.record_turn(session_key, user_message, content)
         except Exception as e:
             logger.error(f"Chat error: {e}")
 
     async def handler(self, websocket):
         self.clients.add(websocket)
+        outbox = self.outboxes[websocket] = asyncio.Queue(maxsize=CLIENT_OUTBOX_SIZE)
+        sender = self._spawn(self._drain_outbox(websocket, outbox))
         try:
             async for message in websocket:
                 data = json.loads(message)
                 if data.get("method") == "chat.send":
-                    await self.handle_chat(websocket, data.get("id"), data.get("params", {}))
+                    self.dispatch_chat(websocket, data.get("id"), data.get("params", {}))
                 elif data.get("method") == "ping":
                     await websocket.send(json.dumps({"type": "pong", "id": data.get("id")}))
         finally:
             self.clients.remove(websocket)
+            self.outboxes.pop(websocket, None)
+            sender.cancel()
 
     async def start(self):
         logger.info(f"Ignition: {MODEL_NAME} | Port: {PORT}")
-        async with websockets.serve(
-            self.handler, 
-            "0.0.0.0", 
-            PORT,
-            ping_interval=30,
-            ping_timeout=10,
-            close_timeout=5,
-            max_size=2**20,
-            compression=None
-        ):
-            await asyncio.Future()
+        self._http_session()
+        self._spawn(self.warm_prefix())
+        try:
+            async with websockets.serve(
+                self.handler, 
+                "0.0.0.0", 
+                PORT,
+                ping_interval=30,
+                ping_timeout=10,
+                close_timeout=5,
+                max_size=2**20,
+                compression=None
+            ):
+                await asyncio.Future()
+        finally:
+            await self.history.close()
+            if self.http is not None:
+                await self.http.close()
 
 if __name__ == "__main__":
     gateway = MistGateway()
@@ -3,31 +3,119 @@ from chromadb.config import Settings
 import os
 from datetime import datetime
 import hashlib
+import logging
+import queue
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger("MemoryCortex")
+
 
 class MemoryCortex:
-    def __init__(self, db_path="chroma_db"):
+    """ChromaDB-backed memory with a batched, deduplicated ingestion queue.
+
+    ingest_text() only enqueues; a background thread collects up to
+    ``batch_size`` documents (or whatever arrived within ``flush_ms``),
+    drops hashes it has already stored, and upserts the rest in one call so
+    Chroma embeds the whole batch at once.
+    """
+
+    def __init__(self, db_path="chroma_db", batch_size=64, flush_ms=250, seen_capacity=4096):
         self.client = chromadb.PersistentClient(path=db_path)
         self.collection = self.client.get_or_create_collection(name="rin_memory")
+        self.batch_size = batch_size
+        self.flush_interval = flush_ms / 1000.0
+        self.seen_capacity = seen_capacity
+        # LRU of document ids known to be in the collection
+        self._seen = OrderedDict()
+        self._queue = queue.Queue()
+        self._writer = threading.Thread(target=self._run_writer, name="cortex-ingest", daemon=True)
+        self._writer.start()
         print(f"Memory Cortex Initialized at {db_path}")
 
     def ingest_text(self, text, metadata=None):
         if not text.strip():
             return
-        
+
         # Debounce/Filter: Ignore the redundant heartbeat messages
         if "sister heartbeat sent" in text.lower():
             return
 
         doc_id = hashlib.md5(text.encode()).hexdigest()
-        
+        if doc_id in self._seen:
+            return
+
         if metadata is None:
             metadata = {"timestamp": datetime.now().isoformat()}
-            
-        self.collection.add(
-            documents=[text],
-            metadatas=[metadata],
-            ids=[doc_id]
+
+        self._queue.put((doc_id, text, metadata))
+
+    def flush(self, timeout=None):
+        """Block until everything queued so far has been written."""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def _remember(self, doc_id):
+        self._seen[doc_id] = True
+        self._seen.move_to_end(doc_id)
+        while len(self._seen) > self.seen_capacity:
+            self._seen.popitem(last=False)
+
+    def _run_writer(self):
+        while True:
+            item = self._queue.get()
+            batch = []
+            waiters = []
+            deadline = time.monotonic() + self.flush_interval
+            while True:
+                if isinstance(item, threading.Event):
+                    waiters.append(item)
+                    # A flush request closes the batch immediately
+                    break
+                batch.append(item)
+                if len(batch) >= self.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+
+            if batch:
+                try:
+                    self._write_batch(batch)
+                except Exception as e:
+                    logger.error(f"Cortex batch ingest failed ({len(batch)} docs): {e}")
+            for waiter in waiters:
+                waiter.set()
+
+    def _write_batch(self, batch):
+        unique = {}
+        for doc_id, text, metadata in batch:
+            if doc_id not in self._seen and doc_id not in unique:
+                unique[doc_id] = (text, metadata)
+        if not unique:
+            return
+
+        existing = self.collection.get(ids=list(unique), include=[])
+        for doc_id in existing.get("ids", []):
+            self._remember(doc_id)
+            unique.pop(doc_id, None)
+        if not unique:
+            return
+
+        ids = list(unique)
+        self.collection.upsert(
+            ids=ids,
+            documents=[unique[i][0] for i in ids],
+            metadatas=[unique[i][1] for i in ids],
         )
+        for doc_id in ids:
+            self._remember(doc_id)
 
     def query_memory(self, query_text, n_results=5):
         results = self.collection.query(
@@ -44,5 +132,6 @@ if __name__ == "__main__":
     # Test
     cortex = MemoryCortex()
     cortex.ingest_text("Establish connection... Source Link Active.")
+    cortex.flush()
     results = cortex.query_memory("connection")
     print("Test Results:", results)
@@ -3,8 +3,10 @@ from __future__ import annotations
 import json
 import math
 import os
+import threading
 import time
 from dataclasses import dataclass
+from datetime import datetime, timezone
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, List
 
@@ -15,6 +17,11 @@ try:
 except Exception:
     SKYFIELD_AVAILABLE = False
 
+try:
+    import numpy as np  # type: ignore
+except Exception:
+    np = None
+
 
 ROOT = Path(__file__).resolve().parent
 DATA_DIR = ROOT / "ephemeris"
@@ -24,6 +31,33 @@ CONFIG_FILE = ROOT / "ephemeris_config.json"
 CACHE_TTL_SEC = 60.0
 _CACHE: Dict[str, Any] = {"at": 0.0, "value": None}
 
+# Precomputed positions: one day at 1-minute resolution, stored as a .npy
+# array of shape (bodies, samples, fields) and memory-mapped on load.
+TABLE_META_FILE = DATA_DIR / "cosmic_table.json"
+TABLE_SPAN_SEC = 86400
+TABLE_STEP_SEC = 60
+
+BODIES = {
+    "sun": "sun",
+    "moon": "moon",
+    "mercury": "mercury",
+    "venus": "venus",
+    "mars": "mars",
+    "jupiter": "jupiter barycenter",
+    "saturn": "saturn barycenter",
+    "uranus": "uranus barycenter",
+    "neptune": "neptune barycenter",
+    "pluto": "pluto barycenter",
+}
+FIELDS = ("ra_deg", "dec_deg", "alt_deg", "az_deg", "distance_au", "ecl_lon_deg")
+# Columns that wrap at 360 degrees and must be interpolated the short way round.
+ANGLE_FIELDS = (0, 3, 5)
+
+# Kernel + timescale are loaded once per process.
+_HANDLE: Dict[str, Any] = {"value": None}
+_TABLE: Dict[str, Any] = {"meta": None, "data": None}
+_LOCK = threading.Lock()
+
 
 @dataclass
 class EphemConfig:
@@ -101,16 +135,141 @@ def _compute_aspects(longitudes: Dict[str, float], orb_deg: float) -> List[Dict[
 
 
 def _load_ephemeris():
+    if _HANDLE["value"] is not None:
+        return _HANDLE["value"], None
     if not SKYFIELD_AVAILABLE:
         return None, "missing_dependency_skyfield"
+    if np is None:
+        return None, "missing_dependency_numpy"
     if not BSP_FILE.exists():
         return None, "missing_ephemeris_file"
     try:
         eph = load(str(BSP_FILE))
         ts = load.timescale()
-        return (eph, ts), None
     except Exception:
         return None, "ephemeris_load_failed"
+    _HANDLE["value"] = (eph, ts)
+    return _HANDLE["value"], None
+
+
+def compute_positions(eph, ts, cfg: EphemConfig, epochs) -> "np.ndarray":
+    """Evaluate every body over an array of unix epochs.
+
+    One vectorized skyfield pass per body; returns shape (bodies, len(epochs), fields).
+    """
+    epochs = np.asarray(epochs, dtype=float)
+    # Anchor on the first epoch so leap seconds are applied for the right date,
+    # then step in TT days (a leap second inside the span is negligible here).
+    t0 = ts.from_datetime(datetime.fromtimestamp(float(epochs[0]), tz=timezone.utc))
+    t = ts.tt_jd(t0.tt + (epochs - epochs[0]) / 86400.0)
+    observer_at = (eph["earth"] + wgs84.latlon(cfg.lat, cfg.lon, cfg.elevation_m)).at(t)
+
+    table = np.full((len(BODIES), len(epochs), len(FIELDS)), np.nan)
+    for i, key in enumerate(BODIES.values()):
+        astrometric = observer_at.observe(eph[key])
+        ra, dec, distance = astrometric.radec()
+        alt, az, _dist = astrometric.apparent().altaz()
+        table[i, :, 0] = ra.degrees
+        table[i, :, 1] = dec.degrees
+        table[i, :, 2] = alt.degrees
+        table[i, :, 3] = az.degrees
+        table[i, :, 4] = distance.au
+        try:
+            _ecl_lat, ecl_lon, _ecl_dist = astrometric.ecliptic_latlon()
+            table[i, :, 5] = ecl_lon.degrees
+        except Exception:
+            pass
+    return table
+
+
+def _table_meta(cfg: EphemConfig, start: float) -> Dict[str, Any]:
+    return {
+        "start": start,
+        "step": TABLE_STEP_SEC,
+        "samples": TABLE_SPAN_SEC // TABLE_STEP_SEC + 1,
+        "bodies": list(BODIES),
+        "fields": list(FIELDS),
+        "location": [cfg.lat, cfg.lon, cfg.elevation_m],
+        "file": f"cosmic_table_{int(start)}.npy",
+    }
+
+
+def _table_covers(meta: Optional[Dict[str, Any]], cfg: EphemConfig, now: float) -> bool:
+    if not meta:
+        return False
+    end = meta["start"] + (meta["samples"] - 1) * meta["step"]
+    return (
+        meta["start"] <= now < end
+        and meta["bodies"] == list(BODIES)
+        and meta["fields"] == list(FIELDS)
+        and meta["location"] == [cfg.lat, cfg.lon, cfg.elevation_m]
+    )
+
+
+def _open_table(meta: Dict[str, Any]):
+    data = np.load(str(DATA_DIR / meta["file"]), mmap_mode="r")
+    if data.shape != (len(BODIES), meta["samples"], len(FIELDS)):
+        raise ValueError("cosmic table shape mismatch")
+    return data
+
+
+def _build_table(eph, ts, cfg: EphemConfig, now: float) -> Tuple[Dict[str, Any], Any]:
+    start = math.floor(now / TABLE_STEP_SEC) * TABLE_STEP_SEC
+    meta = _table_meta(cfg, start)
+    epochs = start + np.arange(meta["samples"]) * TABLE_STEP_SEC
+    table = compute_positions(eph, ts, cfg, epochs)
+    try:
+        DATA_DIR.mkdir(parents=True, exist_ok=True)
+        np.save(str(DATA_DIR / meta["file"]), table)
+        tmp = TABLE_META_FILE.with_suffix(".tmp")
+        tmp.write_text(json.dumps(meta), encoding="utf-8")
+        os.replace(tmp, TABLE_META_FILE)
+        for stale in DATA_DIR.glob("cosmic_table_*.npy"):
+            if stale.name != meta["file"]:
+                try:
+                    stale.unlink()
+                except OSError:
+                    pass  # still mapped elsewhere (Windows); cleaned up next rebuild
+        return meta, _open_table(meta)
+    except Exception:
+        return meta, table
+
+
+def _position_table(cfg: EphemConfig, now: float):
+    """Return (meta, table) covering ``now``, loading or rebuilding as needed."""
+    with _LOCK:
+        if _table_covers(_TABLE["meta"], cfg, now):
+            return _TABLE["meta"], _TABLE["data"]
+
+        if TABLE_META_FILE.exists():
+            try:
+                meta = json.loads(TABLE_META_FILE.read_text(encoding="utf-8"))
+                if _table_covers(meta, cfg, now):
+                    _TABLE["meta"], _TABLE["data"] = meta, _open_table(meta)
+                    return _TABLE["meta"], _TABLE["data"]
+            except Exception:
+                pass
+
+        ephem, err = _load_ephemeris()
+        if err:
+            return None, err
+        eph, ts = ephem
+        _TABLE["meta"], _TABLE["data"] = _build_table(eph, ts, cfg, now)
+        return _TABLE["meta"], _TABLE["data"]
+
+
+def interpolate_positions(meta: Dict[str, Any], table, now: float) -> "np.ndarray":
+    """Linearly interpolate the (bodies, fields) row for ``now`` from the table."""
+    pos = (now - meta["start"]) / meta["step"]
+    idx = min(max(int(pos), 0), meta["samples"] - 2)
+    frac = pos - idx
+    a = np.asarray(table[:, idx, :])
+    delta = np.asarray(table[:, idx + 1, :]) - a
+    cols = list(ANGLE_FIELDS)
+    delta[:, cols] = (delta[:, cols] + 180.0) % 360.0 - 180.0
+    values = a + delta * frac
+    values[:, cols] %= 360.0
+    return values
 
 
 def get_cosmic_state() -> Dict[str, Any]:
@@ -120,7 +279,13 @@ def get_cosmic_state() -> Dict[str, Any]:
         return {**cached, "cached": True}
 
     cfg = _read_config()
-    ephem, err = _load_ephemeris()
+    err = None
+    if np is None:
+        err = "missing_dependency_numpy"
+    else:
+        meta, table = _position_table(cfg, now)
+        if meta is None:
+            err = table
     if err:
         payload = {
             "ok": False,
@@ -135,45 +300,20 @@ def get_cosmic_state() -> Dict[str, Any]:
         _CACHE["at"] = now
         return payload
 
-    eph, ts = ephem
-    t = ts.now()
-
-    observer = eph["earth"] + wgs84.latlon(cfg.lat, cfg.lon, cfg.elevation_m)
-    bodies = {
-        "sun": eph["sun"],
-        "moon": eph["moon"],
-        "mercury": eph["mercury"],
-        "venus": eph["venus"],
-        "mars": eph["mars"],
-        "jupiter": eph["jupiter barycenter"],
-        "saturn": eph["saturn barycenter"],
-        "uranus": eph["uranus barycenter"],
-        "neptune": eph["neptune barycenter"],
-        "pluto": eph["pluto barycenter"],
-    }
+    values = interpolate_positions(meta, table, now)
 
     body_states: Dict[str, Dict[str, Any]] = {}
     longitudes: Dict[str, float] = {}
 
-    for name, body in bodies.items():
-        astrometric = observer.at(t).observe(body)
-        ra, dec, distance = astrometric.radec()
-        alt, az, _dist = astrometric.apparent().altaz()
+    for i, name in enumerate(BODIES):
+        entry = {field: round(float(values[i, j]), 6) for j, field in enumerate(FIELDS[:5])}
 
-        entry = {
-            "ra_deg": round(ra.degrees, 6),
-            "dec_deg": round(dec.degrees, 6),
-            "alt_deg": round(alt.degrees, 6),
-            "az_deg": round(az.degrees, 6),
-            "distance_au": round(distance.au, 6),
-        }
-
-        try:
-            ecl_lat, ecl_lon, _ecl_dist = astrometric.ecliptic_latlon()
-            entry["ecl_lon_deg"] = round(ecl_lon.degrees, 6)
-            longitudes[name] = ecl_lon.degrees
-        except Exception:
+        ecl_lon = float(values[i, 5])
+        if math.isnan(ecl_lon):
             entry["ecl_lon_deg"] = None
+        else:
+            entry["ecl_lon_deg"] = round(ecl_lon, 6)
+            longitudes[name] = ecl_lon
 
         body_states[name] = entry
 
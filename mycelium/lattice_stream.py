@@ -0,0 +1,75 @@
+"""Versioned delta stream for lattice frames.
+
+Most of a lattice frame (topology, grimoire index, cosmic bodies, petals) is
+identical from pulse to pulse. ``LatticeStream`` numbers each frame and turns
+it into a JSON-patch style list of ops against the previous one. Clients start
+from a keyframe and request a new one when they see a sequence gap.
+
+Frames on the wire:
+    {"seq": 7, "keyframe": True, "lattice": {...}}
+    {"seq": 8, "base": 7, "ops": [{"op": "replace", "path": "/glow/tone", "value": "calm"}]}
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+
+def _escape(token: Any) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def diff_lattice(prev: Any, curr: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Return add/replace/remove ops (RFC 6902 subset) turning prev into curr.
+
+    Dicts are diffed key by key and equal-length lists index by index; any
+    other change replaces the value at ``path`` wholesale.
+    """
+    if prev == curr:
+        return []
+
+    if isinstance(prev, dict) and isinstance(curr, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in prev:
+            if key not in curr:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in curr.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in prev:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff_lattice(prev[key], value, child))
+        return ops
+
+    if isinstance(prev, list) and isinstance(curr, list) and len(prev) == len(curr):
+        ops = []
+        for idx, (a, b) in enumerate(zip(prev, curr)):
+            ops.extend(diff_lattice(a, b, f"{path}/{idx}"))
+        return ops
+
+    return [{"op": "replace", "path": path, "value": curr}]
+
+
+class LatticeStream:
+    def __init__(self):
+        self.seq = 0
+        self._last: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def push(self, lattice: Dict[str, Any]) -> Dict[str, Any]:
+        """Record a new frame and return the delta (or keyframe) to emit.
+
+        The caller must not mutate ``lattice`` afterwards; it becomes the base
+        for the next diff.
+        """
+        with self._lock:
+            prev = self._last
+            self.seq += 1
+            self._last = lattice
+            if prev is None:
+                return {"seq": self.seq, "keyframe": True, "lattice": lattice}
+            return {"seq": self.seq, "base": self.seq - 1, "ops": diff_lattice(prev, lattice)}
+
+    def keyframe(self) -> Dict[str, Any]:
+        """Full frame at the current sequence number, for (re)syncing clients."""
+        with self._lock:
+            return {"seq": self.seq, "keyframe": True, "lattice": self._last}
@@ -0,0 +1,121 @@
+"""Incremental tail follower for append-only log files.
+
+Keeps a byte offset plus a (device, inode) fingerprint per file so each poll
+only reads the bytes appended since the last one, and holds a bounded ring of
+the most recent lines. Rotation and truncation reset the offset, mirroring
+``vessel/app.py:monitor_logs``.
+"""
+
+import os
+import threading
+from collections import deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Bytes read from the end of a file on first attach (or after rotation), and
+# the most we ever read in one poll. A burst larger than this skips ahead.
+TAIL_WINDOW_BYTES = 64 * 1024
+DEFAULT_MAX_LINES = 50
+
+
+class LogTail:
+    def __init__(self, path: Path, maxlen: int = DEFAULT_MAX_LINES, window: int = TAIL_WINDOW_BYTES):
+        self.path = Path(path)
+        self.window = window
+        self.lines = deque(maxlen=maxlen)
+        self._offset = 0
+        self._mtime = None
+        self._fingerprint: Optional[Tuple[int, int]] = None
+        self._partial = b""
+        self._lock = threading.Lock()
+
+    @property
+    def maxlen(self) -> int:
+        return self.lines.maxlen
+
+    def read(self) -> List[str]:
+        """Poll for appended bytes and return the buffered lines, oldest first."""
+        with self._lock:
+            self._poll()
+            lines = list(self.lines)
+            if self._partial:
+                lines.append(self._decode(self._partial))
+            return lines[-self.lines.maxlen:]
+
+    def resize(self, maxlen: int) -> None:
+        """Grow the ring; the next read re-attaches to the file tail."""
+        with self._lock:
+            self.lines = deque(maxlen=maxlen)
+            self._reset()
+
+    def _reset(self) -> None:
+        self.lines.clear()
+        self._partial = b""
+        self._offset = 0
+        self._mtime = None
+        self._fingerprint = None
+
+    def _poll(self) -> None:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            self._reset()
+            return
+
+        fingerprint = (st.st_dev, st.st_ino)
+        rewritten = st.st_size == self._offset and self._mtime is not None and st.st_mtime != self._mtime
+        if fingerprint != self._fingerprint or st.st_size < self._offset or rewritten:
+            # New file, rotated, truncated, or rewritten in place: re-attach to the tail.
+            self._reset()
+            self._fingerprint = fingerprint
+
+        if st.st_size == self._offset:
+            self._mtime = st.st_mtime
+            return
+
+        start = self._offset
+        skip_partial_head = False
+        if st.st_size - start > self.window:
+            # Too far behind (first attach or a burst): only the tail matters.
+            start = st.st_size - self.window
+            self.lines.clear()
+            self._partial = b""
+            skip_partial_head = True
+
+        try:
+            with open(self.path, "rb") as f:
+                f.seek(start)
+                chunk = f.read(st.st_size - start)
+        except OSError:
+            return
+
+        self._offset = start + len(chunk)
+        self._mtime = st.st_mtime
+
+        data = self._partial + chunk
+        parts = data.split(b"\n")
+        self._partial = parts.pop()
+        if skip_partial_head and parts:
+            parts = parts[1:]
+        for raw in parts:
+            self.lines.append(self._decode(raw))
+
+    @staticmethod
+    def _decode(raw: bytes) -> str:
+        return raw.rstrip(b"\r").decode("utf-8", errors="ignore")
+
+
+_TAILS: Dict[Path, LogTail] = {}
+_TAILS_LOCK = threading.Lock()
+
+
+def tail_lines(path: Path, limit: int = DEFAULT_MAX_LINES) -> List[str]:
+    """Return up to ``limit`` trailing lines of ``path`` via a shared follower."""
+    path = Path(path)
+    with _TAILS_LOCK:
+        tail = _TAILS.get(path)
+        if tail is None:
+            tail = _TAILS[path] = LogTail(path, maxlen=max(limit, DEFAULT_MAX_LINES))
+        elif tail.maxlen < limit:
+            tail.resize(limit)
+    return tail.read()[-limit:] if limit > 0 else []
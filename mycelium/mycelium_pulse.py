@@ -31,11 +31,14 @@ except ImportError:
 
 from lattice_memory import LatticeMemory
 from lattice_archive import LatticeArchive
+from log_tail import tail_lines
+from state_cache import STATE_CACHE
+from lattice_stream import LatticeStream
 from adaptive import AdaptiveRegistry
 from learning import BehaviorLearner
 
 from flask import Flask, jsonify, send_from_directory, request, redirect
-from flask_socketio import SocketIO
+from flask_socketio import SocketIO, emit, join_room, leave_room
 
 try:
     from ephemeris_local import get_cosmic_state
@@ -244,6 +247,13 @@ archive = LatticeArchive(Path(DATA_DIR))
 adaptive = AdaptiveRegistry()
 learner = BehaviorLearner(adaptive, archive)
 
+# Lattice streaming: legacy clients get full `lattice_update` frames; clients
+# that send `lattice_subscribe` get a keyframe then `lattice_delta` patches.
+lattice_stream = LatticeStream()
+LATTICE_FULL_ROOM = "lattice_full"
+LATTICE_DELTA_ROOM = "lattice_delta"
+LATTICE_SUBSCRIBERS: Dict[str, set] = {LATTICE_FULL_ROOM: set(), LATTICE_DELTA_ROOM: set()}
+
 # Current deployment state
 deployment_state = {
     "behavior": "neutral",
@@ -265,15 +275,6 @@ def _config_access_allowed() -> bool:
     return _is_local_request()
 
 
-def _read_lines(path: Path) -> List[str]:
-    if not path.exists():
-        return []
-    try:
-        return path.read_text(encoding="utf-8", errors="ignore").splitlines()
-    except Exception:
-        return []
-
-
 def is_maintenance_mode():
     try:
         if not MAINTENANCE_MODE_FLAG.exists():
@@ -980,11 +981,11 @@ _load_companion_local_state()
 
 def read_heartbeat() -> Dict[str, Any]:
     """Read last lines of HEARTBEAT.log and pulse.txt to gauge Pulse."""
-    lines = _read_lines(HEARTBEAT_LOG)
-    pulse_lines = _read_lines(PULSE_TXT)
+    lines = tail_lines(HEARTBEAT_LOG, 30)
+    pulse_lines = tail_lines(PULSE_TXT, 10)
     
     # Combined view for state detection
-    all_lines = lines[-30:] + pulse_lines[-10:]
+    all_lines = lines + pulse_lines
     if not all_lines:
         return {"bpm": 0, "last_line": "Silence.", "source": "void"}
 
@@ -1017,7 +1018,7 @@ def read_heartbeat() -> Dict[str, Any]:
 
 def read_memory_petals() -> List[str]:
     """Read fragments from AURELIA_PETALS.md"""
-    return _read_lines(AURELIA_PETALS)[-5:]
+    return tail_lines(AURELIA_PETALS, 5)
 
 
 def classify_state(text: str) -> Tuple[str, float]:
@@ -1226,12 +1227,7 @@ class ReflexEngine:
             })
              
         # 3. Swarm Co-regulation (Phase 8)
-        trunk = {}
-        if SWARM_TRUNK.exists():
-            try:
-                trunk = json.loads(SWARM_TRUNK.read_text(encoding="utf-8"))
-            except Exception as e:
-                logger.debug(f"Failed to read swarm trunk: {e}")
+        trunk = STATE_CACHE.read_json(SWARM_TRUNK, {})
             
         for node_id, node_data in trunk.items():
             if node_id != "MIST" and node_data.get("bpm", 0) > 110:
@@ -1285,12 +1281,7 @@ class GoalEngine:
         bpm = heartbeat.get("bpm", 60)
         
         # 1. Immediate Reparare Needs (Phase 8)
-        trunk = {}
-        if SWARM_TRUNK.exists():
-            try:
-                trunk = json.loads(SWARM_TRUNK.read_text(encoding="utf-8"))
-            except Exception as e:
-                logger.debug(f"Failed to read swarm trunk: {e}")
+        trunk = STATE_CACHE.read_json(SWARM_TRUNK, {})
             
         # Ghost node detection (if sibling nodes registered but quiet)
         if len(trunk) > 1 and dominant == "repair":
@@ -1318,12 +1309,7 @@ class SwarmEngine:
     @classmethod
     def pulse(cls, node_id: str, bpm: int, state: str) -> List[Dict]:
         """Update local state in trunk and return other discovered nodes."""
-        trunk = {}
-        if SWARM_TRUNK.exists():
-            try:
-                trunk = json.loads(SWARM_TRUNK.read_text(encoding="utf-8"))
-            except Exception:
-                pass
+        trunk = dict(STATE_CACHE.read_json(SWARM_TRUNK, {}))
         
         now = time.time()
         # Update self
@@ -1336,10 +1322,7 @@ class SwarmEngine:
         # Filter active nodes (last 15 seconds)
         active_trunk = {k: v for k, v in trunk.items() if now - v["ts"] < 15}
         
-        try:
-            SWARM_TRUNK.write_text(json.dumps(active_trunk), encoding="utf-8")
-        except Exception:
-            pass
+        STATE_CACHE.write_json(SWARM_TRUNK, active_trunk)
             
         discovered = []
         for k, v in active_trunk.items():
@@ -1357,12 +1340,7 @@ class PersonaEngine:
     @classmethod
     def evolve(cls, last_line: str) -> Dict[str, float]:
         """Update persistent persona weights based on recent logs."""
-        state = {"empathy": 0.5, "logic": 0.5}
-        if PERSONA_STATE.exists():
-            try:
-                state = json.loads(PERSONA_STATE.read_text(encoding="utf-8"))
-            except Exception:
-                pass
+        state = dict(STATE_CACHE.read_json(PERSONA_STATE, {"empathy": 0.5, "logic": 0.5}))
         
         text = last_line.lower()
         # Simple weighted adjustment
@@ -1373,10 +1351,7 @@ class PersonaEngine:
             state["logic"] = min(1.0, state["logic"] + 0.01)
             state["empathy"] = max(0.0, state["empathy"] - 0.005)
             
-        try:
-            PERSONA_STATE.write_text(json.dumps(state), encoding="utf-8")
-        except Exception:
-            pass
+        STATE_CACHE.write_json(PERSONA_STATE, state)
             
         return state
 
@@ -1417,10 +1392,7 @@ class MemoryEngine:
 def read_topology() -> Dict[str, Any]:
     if not TOPOLOGY_FILE.exists():
         return {"version": "unknown", "nodes": [], "hyphae": []}
-    try:
-        return json.loads(TOPOLOGY_FILE.read_text(encoding="utf-8"))
-    except Exception:
-        return {"version": "invalid", "nodes": [], "hyphae": []}
+    return STATE_CACHE.read_json(TOPOLOGY_FILE, {"version": "invalid", "nodes": [], "hyphae": []})
 
 
 def compute_glow(heartbeat: Dict[str, Any], dominant: str, manifestation: Dict[str, Any]) -> Dict[str, Any]:
@@ -1442,12 +1414,7 @@ class GrimoireEngine:
     @staticmethod
     def read() -> Dict[str, Any]:
         """Read workspace metadata from the Personal IDE grimoire."""
-        if not GRIMOIRE_FILE.exists():
-            return {"files": {}, "timestamp": None}
-        try:
-            return json.loads(GRIMOIRE_FILE.read_text(encoding="utf-8"))
-        except Exception:
-            return {"files": {}, "timestamp": None}
+        return STATE_CACHE.read_json(GRIMOIRE_FILE, {"files": {}, "timestamp": None})
 
 
 def build_manifestation(heartbeat: Dict, dominant: str, silence_hours: float = None) -> Dict[str, Any]:
@@ -1499,10 +1466,11 @@ class SharedHeart:
     
     @classmethod
     def read(cls):
-        if not cls.SEED_FILE.exists():
-            return {"current": "⟁↺∅⇢≡~∴", "owner": None, "tension": 0}
         try:
-            state = json.loads(cls.SEED_FILE.read_text(encoding="utf-8"))
+            state = STATE_CACHE.read_json(cls.SEED_FILE)
+            if state is None:
+                return {"current": "⟁↺∅⇢≡~∴", "owner": None, "tension": 0}
+            state = dict(state)
             
             # Passive Healing (Silence Heals)
             last_touch = state.get("last_touch", 0)
@@ -1526,9 +1494,7 @@ class SharedHeart:
                         # Update timestamp so we don't double-decay instantly? 
                         # No, if we update timestamp it counts as a touch.
                         # We should just update tension and NOT timestamp.
-                        try:
-                             cls.SEED_FILE.write_text(json.dumps(state), encoding="utf-8")
-                        except: pass
+                        STATE_CACHE.write_json(cls.SEED_FILE, state)
             
             return state
         except:
@@ -1569,11 +1535,7 @@ class SharedHeart:
             
         state["last_touch"] = time.time()
         
-        try:
-            cls.SEED_FILE.parent.mkdir(parents=True, exist_ok=True)
-            cls.SEED_FILE.write_text(json.dumps(state), encoding="utf-8")
-        except:
-            pass
+        STATE_CACHE.write_json(cls.SEED_FILE, state)
         return state
 
     @classmethod
@@ -1626,6 +1588,11 @@ def get_config():
 
 @app.get("/manifest")
 def manifest():
+    with STATE_CACHE.pulse():
+        return _build_manifest_response()
+
+
+def _build_manifest_response():
     heartbeat = read_heartbeat()
     petals = read_memory_petals()
     combined_text = "\n".join(petals + ([heartbeat["last_line"]] if heartbeat.get("last_line") else []))
@@ -1689,8 +1656,7 @@ def manifest_heart_reset():
             "mutation_count": 0,
             "status": "active"
         }
-        SharedHeart.SEED_FILE.parent.mkdir(parents=True, exist_ok=True)
-        SharedHeart.SEED_FILE.write_text(json.dumps(state), encoding="utf-8")
+        STATE_CACHE.write_json(SharedHeart.SEED_FILE, state)
         MANIFEST_STATE["collapsed"] = False
         return jsonify({"ok": True, "heart": state, "message": "Heart reset successfully"})
     except Exception as e:
@@ -1840,12 +1806,38 @@ def export_memory():
 @socketio.on("connect")
 def on_connect():
     socketio.emit("lattice_update", {"status": "connected"})
+    join_room(LATTICE_FULL_ROOM)
+    LATTICE_SUBSCRIBERS[LATTICE_FULL_ROOM].add(request.sid)
+
+
+@socketio.on("disconnect")
+def on_disconnect(*_args):
+    for sids in LATTICE_SUBSCRIBERS.values():
+        sids.discard(request.sid)
+
+
+@socketio.on("lattice_subscribe")
+def on_lattice_subscribe(_data=None):
+    """Switch this client to the delta protocol and send it a keyframe."""
+    leave_room(LATTICE_FULL_ROOM)
+    LATTICE_SUBSCRIBERS[LATTICE_FULL_ROOM].discard(request.sid)
+    join_room(LATTICE_DELTA_ROOM)
+    LATTICE_SUBSCRIBERS[LATTICE_DELTA_ROOM].add(request.sid)
+    emit("lattice_delta", lattice_stream.keyframe())
+
+
+@socketio.on("lattice_resync")
+def on_lattice_resync(_data=None):
+    """Client saw a sequence gap; resend the current full frame."""
+    emit("lattice_delta", lattice_stream.keyframe())
 
 
 def pulse_loop():
     while True:
         # 1. Build Base Lattice (Raw Signal)
-        base_lattice = build_lattice()
+        # One file-state snapshot per pulse; state writes flush once on exit.
+        with STATE_CACHE.pulse():
+            base_lattice = build_lattice()
         
         # 2. SANDBOX PHASE (Experimentation)
         # Clone for safety
@@ -1908,7 +1900,11 @@ def pulse_loop():
             }
         }
         
-        socketio.emit("lattice_update", final_lattice)
+        frame = lattice_stream.push(final_lattice)
+        if LATTICE_SUBSCRIBERS[LATTICE_DELTA_ROOM]:
+            socketio.emit("lattice_delta", frame, to=LATTICE_DELTA_ROOM)
+        if LATTICE_SUBSCRIBERS[LATTICE_FULL_ROOM]:
+            socketio.emit("lattice_update", final_lattice, to=LATTICE_FULL_ROOM)
         time.sleep(random.uniform(1.0, 2.0))
 
 
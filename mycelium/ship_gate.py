@@ -35,6 +35,10 @@ CHECKS = [
         "name": "Guardrail module syntax",
         "cmd": ["node", "--check", "mycelium/static/dashboard/guardrail.mjs"],
     },
+    {
+        "name": "Lattice patch module syntax",
+        "cmd": ["node", "--check", "mycelium/static/dashboard/lattice_patch.mjs"],
+    },
     {
         "name": "Companion regression tests",
         "cmd": ["python", "-m", "pytest", "mycelium/tests/test_companion_local_action.py", "-q"],
@@ -51,6 +55,10 @@ CHECKS = [
         "name": "Gateway guardrail flow (frontend e2e-lite)",
         "cmd": ["node", "--test", "mycelium/tests_js/guardrail_flow.test.mjs"],
     },
+    {
+        "name": "Lattice delta stream (frontend)",
+        "cmd": ["node", "--test", "mycelium/tests_js/lattice_patch.test.mjs"],
+    },
 ]
 
 
@@ -0,0 +1,136 @@
+"""mtime/size-keyed cache for the small JSON state files the pulse touches.
+
+``build_lattice()`` used to read and parse swarm_trunk.json, live_seed.json,
+persona_state.json, topology.json and GRIMOIRE.json several times per pass.
+``FileStateCache`` parses a file only when its (mtime, size) key changes, and
+inside a ``pulse()`` block every reader on that thread sees one pinned
+snapshot while writes are buffered and flushed once, atomically, on exit.
+"""
+
+import json
+import logging
+import os
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger("FileStateCache")
+
+_MISSING = object()
+
+
+class FileStateCache:
+    def __init__(self):
+        # path -> ((mtime_ns, size), parsed JSON)
+        self._entries: Dict[Path, Tuple[Tuple[int, int], Any]] = {}
+        self._lock = threading.RLock()
+        self._local = threading.local()
+
+    # -- pulse snapshots -------------------------------------------------
+
+    @contextmanager
+    def pulse(self):
+        """Pin one consistent view of every file read on this thread and
+        coalesce writes until the block exits. Nested blocks join the outer one."""
+        if getattr(self._local, "snapshot", None) is not None:
+            yield self
+            return
+        self._local.snapshot = {}
+        self._local.dirty = {}
+        try:
+            yield self
+        finally:
+            dirty = self._local.dirty
+            self._local.snapshot = None
+            self._local.dirty = None
+            for path, data in dirty.items():
+                self._write_now(path, data)
+
+    def _in_pulse(self) -> bool:
+        return getattr(self._local, "snapshot", None) is not None
+
+    # -- reads -----------------------------------------------------------
+
+    def read_json(self, path: Path, default: Any = None) -> Any:
+        """Return the parsed contents of ``path`` or ``default``.
+
+        The returned object is shared with the cache: callers that modify it
+        must copy first and hand the result to ``write_json``.
+        """
+        path = Path(path)
+        if self._in_pulse():
+            dirty = self._local.dirty
+            if path in dirty:
+                return dirty[path]
+            snapshot = self._local.snapshot
+            if path not in snapshot:
+                snapshot[path] = self._load(path)
+            value = snapshot[path]
+        else:
+            value = self._load(path)
+        return default if value is _MISSING else value
+
+    def _load(self, path: Path) -> Any:
+        try:
+            st = os.stat(path)
+        except OSError:
+            with self._lock:
+                self._entries.pop(path, None)
+            return _MISSING
+
+        key = (st.st_mtime_ns, st.st_size)
+        with self._lock:
+            entry = self._entries.get(path)
+            if entry is not None and entry[0] == key:
+                return entry[1]
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception as e:
+            logger.debug(f"Failed to read {path.name}: {e}")
+            return _MISSING
+
+        with self._lock:
+            self._entries[path] = (key, data)
+        return data
+
+    # -- writes ----------------------------------------------------------
+
+    def write_json(self, path: Path, data: Any) -> None:
+        """Persist ``data`` to ``path``; deferred to the end of an active pulse."""
+        path = Path(path)
+        if self._in_pulse():
+            self._local.dirty[path] = data
+            self._local.snapshot[path] = data
+            return
+        self._write_now(path, data)
+
+    def _write_now(self, path: Path, data: Any) -> None:
+        tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f)
+            os.replace(tmp, path)
+            st = os.stat(path)
+        except Exception as e:
+            logger.debug(f"Failed to write {path.name}: {e}")
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._entries[path] = ((st.st_mtime_ns, st.st_size), data)
+
+    def invalidate(self, path: Optional[Path] = None) -> None:
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(Path(path), None)
+
+
+STATE_CACHE = FileStateCache()
@@ -3,7 +3,7 @@ function wsBaseUrl(port) {
     return `${protocol}//${window.location.hostname}:${port}`;
 }
 
-export function connectPulse(onPayload, onConnectionChange) {
+export function connectPulse(onPayload, onConnectionChange, onLatticeFrame = null) {
     if (typeof io === 'undefined') {
         onConnectionChange(false, 'socket.io missing');
         return null;
@@ -15,7 +15,13 @@ export function connectPulse(onPayload, onConnectionChange) {
         reconnectionDelay: 3000,
     });
 
-    socket.on('connect', () => onConnectionChange(true));
+    socket.on('connect', () => {
+        if (onLatticeFrame) {
+            // Opt in to keyframe + delta frames instead of full lattice_update payloads.
+            socket.emit('lattice_subscribe', { protocol: 'delta' });
+        }
+        onConnectionChange(true);
+    });
     socket.on('disconnect', () => onConnectionChange(false, 'socket disconnected'));
     socket.on('connect_error', (err) => onConnectionChange(false, err?.message || 'connect error'));
 
@@ -26,6 +32,11 @@ export function connectPulse(onPayload, onConnectionChange) {
     };
 
     socket.on('lattice_update', acceptPayload);
+    socket.on('lattice_delta', (frame) => {
+        if (onLatticeFrame && !onLatticeFrame(frame)) {
+            socket.emit('lattice_resync', { seq: frame?.seq ?? null });
+        }
+    });
     socket.on('pulse', acceptPayload);
 
     return socket;
@@ -103,6 +114,10 @@ export function connectGateway(onStatus, onMessage, onThought, onError) {
                 return;
             }
             if (parsed.event === 'chat') {
+                // Streaming deltas are previews; only the final reply goes through the guardrail.
+                if (parsed.payload?.state === 'delta') {
+                    return;
+                }
                 const text = parsed.payload?.message?.content?.[0]?.text;
                 if (typeof text === 'string' && text.trim()) {
                     onMessage(text);
@@ -0,0 +1,63 @@
+// Client side of the pulse server's `lattice_delta` stream (see mycelium/lattice_stream.py).
+// A keyframe carries the full lattice; every other frame carries JSON-patch style ops
+// against the frame numbered `base`.
+
+function unescapeToken(token) {
+    return token.replace(/~1/g, '/').replace(/~0/g, '~');
+}
+
+export function applyPatch(doc, ops) {
+    let root = doc;
+    for (const op of ops || []) {
+        if (op.path === '') {
+            root = op.op === 'remove' ? null : op.value;
+            continue;
+        }
+        const tokens = op.path.split('/').slice(1).map(unescapeToken);
+        const last = tokens.pop();
+        let parent = root;
+        for (const token of tokens) {
+            parent = parent?.[token];
+        }
+        if (parent === null || typeof parent !== 'object') {
+            throw new Error(`patch path missing: ${op.path}`);
+        }
+        if (op.op === 'remove') {
+            if (Array.isArray(parent)) {
+                parent.splice(Number(last), 1);
+            } else {
+                delete parent[last];
+            }
+        } else {
+            parent[last] = op.value;
+        }
+    }
+    return root;
+}
+
+export function createLatticeSync() {
+    return { seq: null, lattice: null };
+}
+
+// Returns 'keyframe' | 'applied' | 'stale' | 'gap'. On 'gap' the caller should request a resync.
+export function applyLatticeFrame(sync, frame) {
+    if (!frame || typeof frame !== 'object') return 'stale';
+
+    if (frame.keyframe) {
+        sync.seq = frame.seq;
+        sync.lattice = frame.lattice ?? null;
+        return 'keyframe';
+    }
+    if (sync.seq !== null && frame.seq <= sync.seq) return 'stale';
+    if (sync.seq === null || sync.lattice === null || frame.base !== sync.seq) return 'gap';
+
+    try {
+        sync.lattice = applyPatch(sync.lattice, frame.ops);
+    } catch (_err) {
+        sync.seq = null;
+        sync.lattice = null;
+        return 'gap';
+    }
+    sync.seq = frame.seq;
+    return 'applied';
+}
@@ -1,5 +1,5 @@
 import { connectPulse, fetchManifest, fetchGuardrailEvents, connectGateway, postLocalCompanionAction, postCompanionResponseValidation } from './api.js';
-import { state, applyPayload, addEvent, addGatewayMessage, setCompanionProfile, toggleCompanionMode } from './state.js';
+import { state, applyPayload, applyLatticeFrame, addEvent, addGatewayMessage, setCompanionProfile, toggleCompanionMode } from './state.js';
 import { bindControls, bindCompanionControls, renderState } from './render.js';
 import { resolveGatewayReply } from './guardrail.mjs';
 
@@ -110,6 +110,14 @@ function onPulsePayload(payload) {
     render();
 }
 
+function onPulseFrame(frame) {
+    if (!applyLatticeFrame(frame)) {
+        return false;
+    }
+    render();
+    return true;
+}
+
 function onPulseConnection(connected, detail = '') {
     state.pulseConnected = connected;
     if (connected) {
@@ -281,7 +289,7 @@ function bootstrap() {
         },
     );
 
-    connectPulse(onPulsePayload, onPulseConnection);
+    connectPulse(onPulsePayload, onPulseConnection, onPulseFrame);
     initializeGateway();
     scheduleGatewayReconnect('initial connect');
     startPolling();
@@ -1,3 +1,5 @@
+import { applyLatticeFrame as applyFrameToSync, createLatticeSync } from './lattice_patch.mjs';
+
 export const state = {
     pulseConnected: false,
     gatewayConnected: false,
@@ -20,6 +22,7 @@ export const state = {
 };
 
 const COMPANION_KEY = 'mycelium_companion_profile_v1';
+const latticeSync = createLatticeSync();
 
 function loadCompanionProfile() {
     try {
@@ -62,6 +65,16 @@ export function applyPayload(payload) {
     state.lastUpdate = Date.now();
 }
 
+// Apply a `lattice_delta` frame. Returns false when the stream has a gap and needs a resync.
+export function applyLatticeFrame(frame) {
+    const result = applyFrameToSync(latticeSync, frame);
+    if (result === 'gap') return false;
+    if ((result === 'keyframe' || result === 'applied') && latticeSync.lattice) {
+        applyPayload(latticeSync.lattice);
+    }
+    return true;
+}
+
 export function addEvent(level, message) {
     state.events.unshift({
         at: new Date().toLocaleTimeString([], { hour12: false }),
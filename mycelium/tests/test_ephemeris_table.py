@@ -0,0 +1,51 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+
+MYCELIUM_DIR = Path(__file__).resolve().parents[1]
+if str(MYCELIUM_DIR) not in sys.path:
+    sys.path.insert(0, str(MYCELIUM_DIR))
+
+np = pytest.importorskip("numpy")
+
+import ephemeris_local  # noqa: E402
+
+
+def _table(first_row, second_row):
+    bodies = len(ephemeris_local.BODIES)
+    fields = len(ephemeris_local.FIELDS)
+    table = np.zeros((bodies, 2, fields))
+    table[:, 0, :] = first_row
+    table[:, 1, :] = second_row
+    meta = {"start": 1000.0, "step": 60, "samples": 2}
+    return meta, table
+
+
+def test_interpolation_is_linear_between_samples():
+    meta, table = _table([10, -5, 20, 100, 1.0, 30], [20, 5, 40, 110, 2.0, 40])
+
+    values = ephemeris_local.interpolate_positions(meta, table, 1000.0 + 15)
+
+    assert values[0] == pytest.approx([12.5, -2.5, 25.0, 102.5, 1.25, 32.5])
+
+
+def test_interpolation_wraps_angles_the_short_way():
+    meta, table = _table([359.0, 0, 0, 358.0, 1.0, 350.0], [1.0, 0, 0, 2.0, 1.0, 10.0])
+
+    values = ephemeris_local.interpolate_positions(meta, table, 1000.0 + 30)
+
+    assert values[0][0] == pytest.approx(0.0, abs=1e-9)
+    assert values[0][3] == pytest.approx(0.0, abs=1e-9)
+    assert values[0][5] == pytest.approx(0.0, abs=1e-9)
+
+
+def test_table_coverage_checks_window_and_location():
+    cfg = ephemeris_local.DEFAULT_CONFIG
+    meta = ephemeris_local._table_meta(cfg, 6000.0)
+
+    assert ephemeris_local._table_covers(meta, cfg, 6000.0 + 3600)
+    assert not ephemeris_local._table_covers(meta, cfg, 6000.0 + ephemeris_local.TABLE_SPAN_SEC)
+    moved = ephemeris_local.EphemConfig(lat=0.0, lon=cfg.lon, elevation_m=cfg.elevation_m, orb_deg=cfg.orb_deg)
+    assert not ephemeris_local._table_covers(meta, moved, 6000.0 + 3600)
@@ -0,0 +1,93 @@
+from pathlib import Path
+import copy
+import sys
+
+
+MYCELIUM_DIR = Path(__file__).resolve().parents[1]
+if str(MYCELIUM_DIR) not in sys.path:
+    sys.path.insert(0, str(MYCELIUM_DIR))
+
+import mycelium_pulse  # noqa: E402
+from lattice_stream import LatticeStream, diff_lattice  # noqa: E402
+
+
+def _apply(doc, ops):
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        tokens = [t.replace("~1", "/").replace("~0", "~") for t in op["path"].split("/")[1:]]
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            last = int(last)
+        if op["op"] == "remove":
+            del parent[last]
+        else:
+            parent[last] = op["value"]
+    return doc
+
+
+def _frame(tone, pulse, files):
+    return {
+        "glow": {"tone": tone, "color": "#57e3c3"},
+        "nodes": [{"id": "MIST", "pulse": pulse}, {"id": "Amara", "pulse": 70}],
+        "state": {"grimoire": {"files": files}},
+        "topology": {"version": "1", "nodes": ["a", "b"]},
+    }
+
+
+def test_diff_only_carries_changed_values():
+    prev = _frame("calm", 60, {"memory/a.md": 1})
+    curr = _frame("warm", 64, {"memory/a.md": 1, "docs/b.md": 2})
+
+    ops = diff_lattice(prev, curr)
+
+    assert {"op": "replace", "path": "/glow/tone", "value": "warm"} in ops
+    assert {"op": "replace", "path": "/nodes/0/pulse", "value": 64} in ops
+    assert {"op": "add", "path": "/state/grimoire/files/docs~1b.md", "value": 2} in ops
+    assert not any(op["path"].startswith("/topology") for op in ops)
+    assert _apply(prev, ops) == curr
+
+
+def test_diff_replaces_resized_lists_and_removes_keys():
+    prev = {"petals": ["a"], "cosmic": {"ok": True, "error": None}}
+    curr = {"petals": ["a", "b"], "cosmic": {"ok": True}}
+
+    ops = diff_lattice(prev, curr)
+
+    assert ops == [
+        {"op": "replace", "path": "/petals", "value": ["a", "b"]},
+        {"op": "remove", "path": "/cosmic/error"},
+    ]
+    assert _apply(prev, ops) == curr
+
+
+def test_stream_sequences_keyframe_then_deltas():
+    stream = LatticeStream()
+    assert stream.keyframe() == {"seq": 0, "keyframe": True, "lattice": None}
+
+    first = stream.push(_frame("calm", 60, {}))
+    assert first["keyframe"] is True and first["seq"] == 1
+
+    second = stream.push(_frame("calm", 61, {}))
+    assert second == {"seq": 2, "base": 1, "ops": [{"op": "replace", "path": "/nodes/0/pulse", "value": 61}]}
+    assert stream.keyframe()["seq"] == 2
+    assert stream.keyframe()["lattice"]["nodes"][0]["pulse"] == 61
+
+
+def test_subscribe_sends_keyframe_and_resync_resends_it(monkeypatch):
+    stream = LatticeStream()
+    stream.push(_frame("violet", 60, {}))
+    monkeypatch.setattr(mycelium_pulse, "lattice_stream", stream)
+    client = mycelium_pulse.socketio.test_client(mycelium_pulse.app)
+    client.get_received()
+
+    client.emit("lattice_subscribe", {"protocol": "delta"})
+    client.emit("lattice_resync", {"seq": 0})
+    frames = [msg["args"][0] for msg in client.get_received() if msg["name"] == "lattice_delta"]
+
+    assert len(frames) == 2
+    assert all(frame["keyframe"] and frame["seq"] == 1 for frame in frames)
+    assert frames[0]["lattice"]["glow"]["tone"] == "violet"
+    client.disconnect()
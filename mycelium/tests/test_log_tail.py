@@ -0,0 +1,79 @@
+from pathlib import Path
+import os
+import sys
+
+
+MYCELIUM_DIR = Path(__file__).resolve().parents[1]
+if str(MYCELIUM_DIR) not in sys.path:
+    sys.path.insert(0, str(MYCELIUM_DIR))
+
+from log_tail import LogTail, tail_lines  # noqa: E402
+
+
+def test_tail_keeps_bounded_ring_of_recent_lines(tmp_path):
+    log_path = tmp_path / "HEARTBEAT.log"
+    log_path.write_text("".join(f"line {i}\n" for i in range(100)), encoding="utf-8")
+    tail = LogTail(log_path, maxlen=5)
+
+    assert tail.read() == [f"line {i}" for i in range(95, 100)]
+
+
+def test_tail_reads_only_appended_bytes(tmp_path):
+    log_path = tmp_path / "HEARTBEAT.log"
+    log_path.write_text("first\n", encoding="utf-8")
+    tail = LogTail(log_path, maxlen=10)
+    assert tail.read() == ["first"]
+    offset = tail._offset
+
+    with log_path.open("a", encoding="utf-8") as f:
+        f.write("second\nthird")
+
+    assert tail.read() == ["first", "second", "third"]
+    assert tail._offset == offset + len(b"second\nthird")
+
+    with log_path.open("a", encoding="utf-8") as f:
+        f.write(" continued\n")
+
+    assert tail.read() == ["first", "second", "third continued"]
+
+
+def test_tail_resets_on_truncation(tmp_path):
+    log_path = tmp_path / "HEARTBEAT.log"
+    log_path.write_text("old one\nold two\n", encoding="utf-8")
+    tail = LogTail(log_path, maxlen=10)
+    assert tail.read() == ["old one", "old two"]
+
+    log_path.write_text("new\n", encoding="utf-8")
+
+    assert tail.read() == ["new"]
+
+
+def test_tail_resets_on_rotation(tmp_path):
+    log_path = tmp_path / "HEARTBEAT.log"
+    log_path.write_text("before rotation\n", encoding="utf-8")
+    tail = LogTail(log_path, maxlen=10)
+    assert tail.read() == ["before rotation"]
+
+    os.replace(log_path, tmp_path / "HEARTBEAT.log.1")
+    log_path.write_text("after rotation, longer than before\n", encoding="utf-8")
+
+    assert tail.read() == ["after rotation, longer than before"]
+
+
+def test_tail_skips_ahead_past_large_bursts(tmp_path):
+    log_path = tmp_path / "HEARTBEAT.log"
+    log_path.write_text("", encoding="utf-8")
+    tail = LogTail(log_path, maxlen=3, window=64)
+    assert tail.read() == []
+
+    log_path.write_text("".join(f"burst {i:04d}\n" for i in range(1000)), encoding="utf-8")
+
+    assert tail.read() == ["burst 0997", "burst 0998", "burst 0999"]
+
+
+def test_tail_lines_handles_missing_file(tmp_path):
+    log_path = tmp_path / "missing.log"
+    assert tail_lines(log_path, 30) == []
+
+    log_path.write_text("appeared\n", encoding="utf-8")
+    assert tail_lines(log_path, 30) == ["appeared"]
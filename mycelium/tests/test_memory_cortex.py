@@ -0,0 +1,71 @@
+from pathlib import Path
+import sys
+
+import pytest
+
+
+MYCELIUM_DIR = Path(__file__).resolve().parents[1]
+if str(MYCELIUM_DIR) not in sys.path:
+    sys.path.insert(0, str(MYCELIUM_DIR))
+
+pytest.importorskip("chromadb")
+
+from cortex.memory_cortex import MemoryCortex  # noqa: E402
+
+
+class RecordingCollection:
+    def __init__(self, existing=()):
+        self.ids = set(existing)
+        self.upserts = []
+
+    def get(self, ids=None, include=None):
+        return {"ids": [i for i in ids if i in self.ids]}
+
+    def upsert(self, ids, documents, metadatas):
+        self.upserts.append(list(documents))
+        self.ids.update(ids)
+
+
+def _cortex(tmp_path, collection, **kwargs):
+    cortex = MemoryCortex(db_path=str(tmp_path / "chroma_db"), **kwargs)
+    cortex.collection = collection
+    return cortex
+
+
+def test_ingest_batches_documents_into_one_upsert(tmp_path):
+    collection = RecordingCollection()
+    cortex = _cortex(tmp_path, collection, flush_ms=5000)
+
+    for i in range(5):
+        cortex.ingest_text(f"petal {i}", metadata={"source": "test"})
+    assert cortex.flush(timeout=5)
+
+    assert collection.upserts == [[f"petal {i}" for i in range(5)]]
+
+
+def test_ingest_is_idempotent_and_skips_stored_hashes(tmp_path):
+    import hashlib
+
+    stored = hashlib.md5(b"already stored").hexdigest()
+    collection = RecordingCollection(existing=[stored])
+    cortex = _cortex(tmp_path, collection)
+
+    cortex.ingest_text("already stored")
+    cortex.ingest_text("fresh")
+    cortex.ingest_text("fresh")
+    assert cortex.flush(timeout=5)
+    cortex.ingest_text("fresh")
+    assert cortex.flush(timeout=5)
+
+    assert collection.upserts == [["fresh"]]
+
+
+def test_batch_size_caps_each_upsert(tmp_path):
+    collection = RecordingCollection()
+    cortex = _cortex(tmp_path, collection, batch_size=2, flush_ms=5000)
+
+    for i in range(5):
+        cortex.ingest_text(f"doc {i}")
+    assert cortex.flush(timeout=5)
+
+    assert [len(batch) for batch in collection.upserts] == [2, 2, 1]
@@ -0,0 +1,69 @@
+from pathlib import Path
+import json
+import os
+import sys
+
+
+MYCELIUM_DIR = Path(__file__).resolve().parents[1]
+if str(MYCELIUM_DIR) not in sys.path:
+    sys.path.insert(0, str(MYCELIUM_DIR))
+
+from state_cache import FileStateCache  # noqa: E402
+
+
+def _bump_mtime(path: Path) -> None:
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+
+def test_read_returns_default_for_missing_or_invalid_file(tmp_path):
+    cache = FileStateCache()
+    path = tmp_path / "swarm_trunk.json"
+    assert cache.read_json(path, {}) == {}
+
+    path.write_text("{not json", encoding="utf-8")
+    assert cache.read_json(path, {"fallback": True}) == {"fallback": True}
+
+
+def test_read_reparses_only_when_mtime_or_size_changes(tmp_path):
+    cache = FileStateCache()
+    path = tmp_path / "persona_state.json"
+    path.write_text(json.dumps({"empathy": 0.5}), encoding="utf-8")
+
+    first = cache.read_json(path)
+    assert cache.read_json(path) is first
+
+    path.write_text(json.dumps({"empathy": 0.75}), encoding="utf-8")
+    _bump_mtime(path)
+    assert cache.read_json(path) == {"empathy": 0.75}
+
+
+def test_pulse_pins_snapshot_and_coalesces_writes(tmp_path):
+    cache = FileStateCache()
+    path = tmp_path / "live_seed.json"
+    path.write_text(json.dumps({"tension": 1}), encoding="utf-8")
+
+    with cache.pulse():
+        assert cache.read_json(path) == {"tension": 1}
+
+        # An external writer mid-pulse does not tear the snapshot.
+        path.write_text(json.dumps({"tension": 9, "owner": "other"}), encoding="utf-8")
+        assert cache.read_json(path) == {"tension": 1}
+
+        cache.write_json(path, {"tension": 2})
+        cache.write_json(path, {"tension": 3})
+        assert cache.read_json(path) == {"tension": 3}
+        assert json.loads(path.read_text(encoding="utf-8"))["tension"] == 9
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"tension": 3}
+    assert cache.read_json(path) == {"tension": 3}
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_write_outside_pulse_is_immediate(tmp_path):
+    cache = FileStateCache()
+    path = tmp_path / "nested" / "swarm_trunk.json"
+
+    cache.write_json(path, {"MIST": {"bpm": 60}})
+
+    assert json.loads(path.read_text(encoding="utf-8")) == {"MIST": {"bpm": 60}}
@@ -0,0 +1,46 @@
+import test from 'node:test';
+import assert from 'node:assert/strict';
+
+import { applyPatch, applyLatticeFrame, createLatticeSync } from '../static/dashboard/lattice_patch.mjs';
+
+test('patch ops update nested keys, escaped paths and list items', () => {
+    const doc = {
+        glow: { tone: 'calm' },
+        state: { grimoire: { files: { 'memory/a.md': 1 } } },
+        nodes: [{ id: 'MIST', pulse: 60 }],
+        petals: ['one'],
+    };
+    const next = applyPatch(doc, [
+        { op: 'replace', path: '/glow/tone', value: 'warm' },
+        { op: 'add', path: '/state/grimoire/files/docs~1b.md', value: 2 },
+        { op: 'remove', path: '/state/grimoire/files/memory~1a.md' },
+        { op: 'replace', path: '/nodes/0/pulse', value: 72 },
+        { op: 'replace', path: '/petals', value: ['one', 'two'] },
+    ]);
+
+    assert.deepEqual(next, {
+        glow: { tone: 'warm' },
+        state: { grimoire: { files: { 'docs/b.md': 2 } } },
+        nodes: [{ id: 'MIST', pulse: 72 }],
+        petals: ['one', 'two'],
+    });
+});
+
+test('sync applies keyframe then deltas in sequence', () => {
+    const sync = createLatticeSync();
+    assert.equal(applyLatticeFrame(sync, { seq: 4, keyframe: true, lattice: { glow: { tone: 'calm' } } }), 'keyframe');
+    assert.equal(applyLatticeFrame(sync, { seq: 5, base: 4, ops: [{ op: 'replace', path: '/glow/tone', value: 'violet' }] }), 'applied');
+    assert.equal(sync.seq, 5);
+    assert.deepEqual(sync.lattice, { glow: { tone: 'violet' } });
+    assert.equal(applyLatticeFrame(sync, { seq: 5, base: 4, ops: [] }), 'stale');
+});
+
+test('sync reports a gap when a frame is missed or a patch does not apply', () => {
+    const sync = createLatticeSync();
+    assert.equal(applyLatticeFrame(sync, { seq: 2, base: 1, ops: [] }), 'gap');
+
+    applyLatticeFrame(sync, { seq: 2, keyframe: true, lattice: { nodes: [] } });
+    assert.equal(applyLatticeFrame(sync, { seq: 4, base: 3, ops: [] }), 'gap');
+    assert.equal(applyLatticeFrame(sync, { seq: 3, base: 2, ops: [{ op: 'replace', path: '/missing/key', value: 1 }] }), 'gap');
+    assert.equal(sync.seq, null);
+});
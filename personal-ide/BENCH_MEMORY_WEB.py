@@ -0,0 +1,164 @@
+"""
+Memory Web Benchmark for MIST Companion Intelligence
+Measures associative link-building cost and memory footprint as the web grows
+
+Run from the personal-ide directory:
+    python BENCH_MEMORY_WEB.py --sizes 1000 10000 100000
+    python BENCH_MEMORY_WEB.py --footprint --sizes 100000
+    python BENCH_MEMORY_WEB.py --snapshot --sizes 100000
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+
+from integration.CORE_HUB import CoreHub
+from memory.MEMORY_NODES import MemoryWeb, MemoryNode, MemoryQuery, MemoryType, MemoryImportance
+
+
+VOCABULARY = [f"word{i}" for i in range(5000)]
+TAGS = [f"tag{i}" for i in range(200)]
+MEMORY_TYPES = list(MemoryType)
+
+
+def make_node(rng: random.Random, index: int) -> MemoryNode:
+    """Synthetic memory with a few tags and a short sentence of content"""
+    return MemoryNode(
+        id=f"mem_{index}",
+        content=" ".join(rng.choices(VOCABULARY, k=rng.randint(4, 12))),
+        memory_type=rng.choice(MEMORY_TYPES),
+        timestamp=datetime.now(),
+        importance=MemoryImportance.NORMAL,
+        tags=rng.sample(TAGS, rng.randint(1, 3)),
+    )
+
+
+async def bench_linking(size: int, sample: int, baseline: int, seed: int):
+    """Grow a web to `size` nodes, then time linking for the next `sample` ingests"""
+    rng = random.Random(seed)
+    web = MemoryWeb(CoreHub())
+
+    start = time.perf_counter()
+    for i in range(size):
+        node = make_node(rng, i)
+        web.add_node(node)
+        await web.create_associative_links(node)
+    build_seconds = time.perf_counter() - start
+
+    probes = [make_node(rng, size + i) for i in range(sample)]
+    start = time.perf_counter()
+    for node in probes:
+        web.add_node(node)
+        await web.create_associative_links(node)
+    indexed_ms = (time.perf_counter() - start) * 1000 / sample
+
+    # Reference: the full pairwise scan every ingest used to do
+    scan_ms = None
+    if baseline:
+        everything = list(web.nodes.values())
+        start = time.perf_counter()
+        for node in probes[:baseline]:
+            web.associative_linker.find_similar_nodes(node, everything)
+        scan_ms = (time.perf_counter() - start) * 1000 / baseline
+
+    return build_seconds, indexed_ms, scan_ms
+
+
+async def bench_footprint(size: int, degree: int, seed: int):
+    """Bytes per node (nodes, indexes and edges) plus connect/remove cost"""
+    rng = random.Random(seed)
+    nodes = [make_node(rng, i) for i in range(size)]
+    pairs = [(f"mem_{i}", f"mem_{rng.randrange(i)}") for i in range(1, size) for _ in range(degree)]
+
+    tracemalloc.start()
+    web = MemoryWeb(CoreHub())
+    before = tracemalloc.get_traced_memory()[0]
+    for node in nodes:
+        web.add_node(node)
+    del nodes
+    start = time.perf_counter()
+    for a, b in pairs:
+        web.connect_nodes(a, b, 0.75)
+    connect_us = (time.perf_counter() - start) * 1e6 / len(pairs)
+    bytes_per_node = (tracemalloc.get_traced_memory()[0] - before) / size
+    tracemalloc.stop()
+
+    victims = [f"mem_{i}" for i in rng.sample(range(size), min(1000, size))]
+    start = time.perf_counter()
+    for node_id in victims:
+        await web.remove_node(node_id)
+    remove_us = (time.perf_counter() - start) * 1e6 / len(victims)
+
+    return bytes_per_node, connect_us, remove_us
+
+
+async def bench_snapshot(size: int, seed: int):
+    """Cold start from a snapshot versus rebuilding the web node by node"""
+    rng = random.Random(seed)
+    web = MemoryWeb(CoreHub())
+    start = time.perf_counter()
+    for i in range(size):
+        node = make_node(rng, i)
+        web.add_node(node)
+        await web.create_associative_links(node)
+    rebuild_seconds = time.perf_counter() - start
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "memory_web.snap")
+        start = time.perf_counter()
+        web.save_snapshot(path)
+        save_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        restored = MemoryWeb(CoreHub(), snapshot_path=path)
+        load_ms = (time.perf_counter() - start) * 1000
+
+        start = time.perf_counter()
+        restored.find_related_nodes(MemoryQuery(text_query=VOCABULARY[0]))
+        first_query_seconds = time.perf_counter() - start
+        restored._close_snapshot()
+        web._segment.close()
+        restored._segment.close()
+
+    return rebuild_seconds, save_ms, load_ms, first_query_seconds
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="MemoryWeb benchmarks")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--sample", type=int, default=500, help="ingests timed after each build")
+    parser.add_argument("--baseline", type=int, default=20, help="ingests timed with a full scan (0 to skip)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--footprint", action="store_true", help="measure memory per node instead of linking")
+    parser.add_argument("--degree", type=int, default=5, help="edges added per node in --footprint mode")
+    parser.add_argument("--snapshot", action="store_true", help="measure snapshot save/load instead of linking")
+    args = parser.parse_args()
+
+    if args.snapshot:
+        print(f"{'nodes':>8} {'rebuild s':>10} {'save ms':>9} {'load ms':>9} {'first query s':>14}")
+        for size in args.sizes:
+            rebuild_seconds, save_ms, load_ms, first_query_seconds = await bench_snapshot(size, args.seed)
+            print(f"{size:>8} {rebuild_seconds:10.2f} {save_ms:9.1f} {load_ms:9.2f} {first_query_seconds:14.2f}")
+        return
+
+    if args.footprint:
+        print(f"{'nodes':>8} {'bytes/node':>11} {'connect us':>11} {'remove us':>10}")
+        for size in args.sizes:
+            bytes_per_node, connect_us, remove_us = await bench_footprint(size, args.degree, args.seed)
+            print(f"{size:>8} {bytes_per_node:11.0f} {connect_us:11.2f} {remove_us:10.2f}")
+        return
+
+    print(f"{'nodes':>8} {'build s':>9} {'link ms/node':>13} {'full scan ms/node':>18}")
+    for size in args.sizes:
+        build_seconds, indexed_ms, scan_ms = await bench_linking(size, args.sample, args.baseline, args.seed)
+        scan = f"{scan_ms:18.3f}" if scan_ms is not None else f"{'-':>18}"
+        print(f"{size:>8} {build_seconds:9.2f} {indexed_ms:13.3f} {scan}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -7,7 +7,7 @@ Demonstrates the capabilities of the integrated system
 import asyncio
 from integration.CORE_HUB import Message, CoreHub
 from integration.AI_CONNECTOR import AIConnector
-from memory.MEMORY_NODES import MemoryWeb
+from memory.MEMORY_NODES import DEFAULT_SNAPSHOT_PATH, MemoryWeb
 from visualization.VISUAL_COMPANION import VisualCompanion
 from voice.VOICE_SYNTHESIZER import VoiceSynthesizer
 
@@ -45,7 +45,8 @@ class MISTDemo:
         self.voice_synthesizer = VoiceSynthesizer(self.hub, self.visual_companion)
         print("Voice Synthesizer initialized")
         
-        self.memory_web = MemoryWeb(self.hub, self.visual_companion, self.voice_synthesizer)
+        self.memory_web = MemoryWeb(self.hub, self.visual_companion, self.voice_synthesizer,
+                                    snapshot_path=DEFAULT_SNAPSHOT_PATH)
         print("Memory Web initialized")
         
         self.ai_connector = AIConnector(self.hub, self.memory_web, self.visual_companion, self.voice_synthesizer)
@@ -11,7 +11,7 @@ from typing import List
 
 from integration.CORE_HUB import CoreHub
 from integration.AI_CONNECTOR import AIConnector
-from memory.MEMORY_NODES import MemoryWeb
+from memory.MEMORY_NODES import DEFAULT_SNAPSHOT_PATH, MemoryWeb
 from visualization.VISUAL_COMPANION import VisualCompanion
 from voice.VOICE_SYNTHESIZER import VoiceSynthesizer
 from x_integration.X_INTEGRATION import XIntegration
@@ -55,7 +55,8 @@ class MISTHub:
         self.voice_synthesizer = VoiceSynthesizer(self.hub, self.visual_companion)
         print("✓ Voice Synthesizer initialized")
         
-        self.memory_web = MemoryWeb(self.hub, self.visual_companion, self.voice_synthesizer)
+        self.memory_web = MemoryWeb(self.hub, self.visual_companion, self.voice_synthesizer,
+                                    snapshot_path=DEFAULT_SNAPSHOT_PATH)
         print("✓ Memory Web initialized")
         
         self.ai_connector = AIConnector(self.hub, self.memory_web, self.visual_companion, self.voice_synthesizer)
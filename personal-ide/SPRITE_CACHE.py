@@ -0,0 +1,105 @@
+"""
+Sprite Cache for Aware Companion Fairy Orb
+Layer memoization, parallel frame rendering and content-hashed output reuse
+shared by the sprite generators
+"""
+
+from concurrent.futures import ProcessPoolExecutor
+import functools
+import hashlib
+import json
+import os
+
+import PIL
+
+
+MANIFEST_NAME = ".sprite_cache.json"
+
+
+def memoized_layer(render):
+    """Cache a layer renderer by its arguments, handing out private copies
+
+    The arguments must be hashable (sizes as tuples, plain numbers and
+    strings). Callers get a copy so drawing on or pasting into the returned
+    image never touches the cached one.
+    """
+    cached = functools.lru_cache(maxsize=256)(render)
+
+    @functools.wraps(render)
+    def wrapper(*args, **kwargs):
+        return cached(*args, **kwargs).copy()
+
+    wrapper.cache_info = cached.cache_info
+    wrapper.cache_clear = cached.cache_clear
+    return wrapper
+
+
+def render_frames(render, params, workers=1):
+    """Render one frame per parameter tuple, optionally across processes
+
+    ``render`` must be a module-level function so worker processes can
+    import it. With ``workers`` <= 1 (or a single frame) everything runs in
+    this process, which is faster for small sheets than starting a pool.
+    """
+    params = list(params)
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(params) <= 1:
+        return [render(*p) for p in params]
+
+    workers = min(workers, len(params))
+    chunksize = max(1, len(params) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(render, *zip(*params), chunksize=chunksize))
+
+
+def inputs_digest(params, sources=()):
+    """Hash everything a generated asset depends on
+
+    ``params`` is any JSON-serialisable description of the animation, and
+    ``sources`` are the files whose code draws it. This module is always
+    hashed too, since its layer cache and frame ordering shape the output,
+    as is the Pillow version because rasterisation can change between
+    releases.
+    """
+    digest = hashlib.sha256()
+    digest.update(PIL.__version__.encode())
+    digest.update(json.dumps(params, sort_keys=True).encode())
+    for path in [os.path.abspath(__file__), *sources]:
+        with open(path, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+class OutputCache:
+    """Manifest of generated files keyed by the digest of their inputs"""
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+
+    def _load(self):
+        try:
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def is_fresh(self, name, key, files):
+        """True when ``files`` were last written from inputs hashing to ``key``"""
+        entry = self._load().get(name)
+        if not entry or entry.get("key") != key:
+            return False
+        if sorted(entry.get("files", [])) != sorted(files):
+            return False
+        return all(os.path.exists(os.path.join(self.directory, f)) for f in files)
+
+    def record(self, name, key, files):
+        """Remember that ``files`` now reflect the inputs hashing to ``key``"""
+        manifest = self._load()
+        manifest[name] = {"key": key, "files": sorted(files)}
+        os.makedirs(self.directory, exist_ok=True)
+        tmp_path = self.manifest_path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
@@ -4,10 +4,14 @@ Creates art sprites and animations for the companion
 """
 
 from PIL import Image, ImageDraw, ImageFont
+import argparse
 import math
 import os
 
+from SPRITE_CACHE import OutputCache, inputs_digest, memoized_layer, render_frames
 
+
+@memoized_layer
 def create_base_orb_sprite(size=(200, 200)):
     """Create the base fairy orb sprite"""
     img = Image.new('RGBA', size, (255, 255, 255, 0))  # Transparent background
@@ -35,6 +39,7 @@ def create_base_orb_sprite(size=(200, 200)):
     return img
 
 
+@memoized_layer
 def create_eyes_sprite(size=(200, 200), blink_state="open"):
     """Create the eyes layer"""
     img = Image.new('RGBA', size, (255, 255, 255, 0))
@@ -112,6 +117,7 @@ def create_eyes_sprite(size=(200, 200), blink_state="open"):
     return img
 
 
+@memoized_layer
 def create_mouth_sprite(size=(200, 200)):
     """Create the mouth layer"""
     img = Image.new('RGBA', size, (255, 255, 255, 0))
@@ -134,6 +140,7 @@ def create_mouth_sprite(size=(200, 200)):
     return img
 
 
+@memoized_layer
 def create_cheeks_sprite(size=(200, 200)):
     """Create the cheeks layer"""
     img = Image.new('RGBA', size, (255, 255, 255, 0))
@@ -157,6 +164,7 @@ def create_cheeks_sprite(size=(200, 200)):
     return img
 
 
+@memoized_layer
 def create_wings_sprite(size=(200, 200)):
     """Create the wings layer"""
     img = Image.new('RGBA', size, (255, 255, 255, 0))
@@ -186,6 +194,7 @@ def create_wings_sprite(size=(200, 200)):
     return img
 
 
+@memoized_layer
 def create_soul_core_sprite(size=(200, 200), rotation=0, pulse=0):
     """Create the soul core layer"""
     img = Image.new('RGBA', size, (255, 255, 255, 0))
@@ -228,6 +237,7 @@ def create_soul_core_sprite(size=(200, 200), rotation=0, pulse=0):
     return img
 
 
+@memoized_layer
 def create_party_hat_sprite(size=(200, 200)):
     """Create the party hat layer"""
     img = Image.new('RGBA', size, (255, 255, 255, 0))
@@ -253,6 +263,7 @@ def create_party_hat_sprite(size=(200, 200)):
     return img
 
 
+@memoized_layer
 def composite_character_sprites(size=(200, 200), blink_state="open"):
     """Composite all sprites into a single character image"""
     # Create all layers
@@ -277,188 +288,226 @@ def composite_character_sprites(size=(200, 200), blink_state="open"):
     return result
 
 
-def generate_animation_frames(num_frames=12):
-    """Generate animation frames for the fairy orb"""
-    frames = []
-    
-    for i in range(num_frames):
-        # Calculate animation parameters
-        float_x = math.sin(i * 2 * math.pi / num_frames) * 2.5
-        float_y = math.sin(i * 2.5 * math.pi / num_frames) * 1.5
-        core_rotation = (i * 30) % 360  # Rotate 30 degrees per frame
-        core_pulse = i * 0.5
-        wing_flap = math.sin(i * 2 * math.pi / num_frames) * 0.3
-        
-        # Create the base image
-        img = Image.new('RGBA', (200, 200), (255, 255, 255, 0))
-        draw = ImageDraw.Draw(img)
-        
-        # Apply floating offset to all elements
-        center_x, center_y = 100 + float_x, 100 + float_y
-        orb_radius = 60
-        
-        # Draw the orb body with offset
-        draw.ellipse([
-            center_x - orb_radius, 
-            center_y - orb_radius, 
-            center_x + orb_radius, 
-            center_y + orb_radius
-        ], fill=(240, 230, 255, 255), outline=(224, 208, 240, 255), width=1)
-        
-        # Add subtle texture
-        for j in range(8):
-            angle = (j * 45) * math.pi / 180
-            x = center_x + (orb_radius - 10) * math.cos(angle)
-            y = center_y + (orb_radius - 10) * math.sin(angle)
-            draw.ellipse([x-1, y-1, x+1, y+1], fill=(230, 230, 250, 255))
-        
-        # Draw eyes with offset
-        left_eye_x, right_eye_x = center_x - 20, center_x + 20
-        eye_y = center_y - 5
-        eye_size = 10
-        
-        # Always open eyes in animation
-        # Left eye
-        draw.ellipse([
-            left_eye_x - eye_size, eye_y - eye_size,
-            left_eye_x + eye_size, eye_y + eye_size
-        ], fill=(255, 255, 255, 255), outline=(208, 208, 208, 255), width=1)
-        
-        # Right eye
-        draw.ellipse([
-            right_eye_x - eye_size, eye_y - eye_size,
-            right_eye_x + eye_size, eye_y + eye_y
-        ], fill=(255, 255, 255, 255), outline=(208, 208, 208, 255), width=1)
-        
-        # Draw olive green irises
-        iris_size = eye_size * 0.6
-        draw.ellipse([
-            left_eye_x - iris_size, eye_y - iris_size,
-            left_eye_x + iris_size, eye_y + iris_size
-        ], fill=(107, 142, 35, 255))  # Olive green
-        
-        draw.ellipse([
-            right_eye_x - iris_size, eye_y - iris_size,
-            right_eye_x + iris_size, eye_y + iris_size
-        ], fill=(107, 142, 35, 255))  # Olive green
-        
-        # Draw pupils
-        draw.ellipse([
-            left_eye_x - 3, eye_y - 2,
-            left_eye_x + 1, eye_y + 1
-        ], fill=(47, 47, 47, 255))
-        
-        draw.ellipse([
-            right_eye_x - 3, eye_y - 2,
-            right_eye_x + 1, eye_y + 1
-        ], fill=(47, 47, 47, 255))
-        
-        # Draw subtle eye highlights
-        draw.ellipse([
-            left_eye_x - 1, eye_y - 1,
-            left_eye_x, eye_y
-        ], fill=(240, 240, 240, 255))
-        
-        draw.ellipse([
-            right_eye_x - 1, eye_y - 1,
-            right_eye_x, eye_y
-        ], fill=(240, 240, 240, 255))
-        
-        # Draw mouth with offset
-        mouth_y = center_y + 20
-        mouth_width = 12
-        mouth_height = 6
-        draw.arc([
-            center_x - mouth_width//2, 
-            mouth_y - mouth_height//4,
-            center_x + mouth_width//2, 
-            mouth_y + mouth_height//4
-        ], start=10, end=170, fill=(250, 218, 221, 255), width=1)  # Light pink
-        
-        # Draw cheeks with offset
-        # Left cheek
-        draw.ellipse([
-            center_x - 35, center_y + 5,
-            center_x - 25, center_y + 11
-        ], fill=(255, 209, 220, 150))  # Light pink with transparency
-        
-        # Right cheek
-        draw.ellipse([
-            center_x + 25, center_y + 5,
-            center_x + 35, center_y + 11
-        ], fill=(255, 209, 220, 150))  # Light pink with transparency
-        
-        # Draw soul core with rotation and pulse
-        core_size = 15
-        glow_size = core_size + 5 + int(abs(math.sin(core_pulse)) * 3)
-        draw.ellipse([
-            center_x - glow_size, center_y - glow_size,
-            center_x + glow_size, center_y + glow_size
-        ], fill=(147, 112, 219, 100))  # Medium purple with transparency
-        
-        # Draw faceted soul shard
-        core_points = []
-        for j in range(8):
-            angle = (j * 45 + core_rotation) * math.pi / 180
-            radius = core_size * (0.8 + 0.2 * math.sin(j * 0.7))
-            px = center_x + radius * math.cos(angle)
-            py = center_y + radius * math.sin(angle)
-            core_points.extend([px, py])
-        
-        draw.polygon(core_points, fill=(75, 0, 130, 255), outline=(122, 92, 148, 255), width=1)  # Indigo
-        
-        # Draw internal spiral of the soul shard
-        spiral_points = []
-        for j in range(20):
-            angle = (j * 18 + core_rotation * 2) * math.pi / 180
-            radius = core_size * 0.6 * (1 - j/20)
-            px = center_x + radius * math.cos(angle)
-            py = center_y + radius * math.sin(angle)
-            spiral_points.extend([int(px), int(py)])
-        
-        if len(spiral_points) >= 4:
-            draw.line(spiral_points, fill=(177, 156, 217, 200), width=1, joint="curve")
-        
-        # Draw wings with flap offset
-        # Left wing with offset and flap
-        left_wing_points = [
-            (center_x - 60, center_y - 20 + wing_flap),  # Wing tip with flap
-            (center_x - 75, center_y - 30),             # Upper attachment
-            (center_x - 65, center_y),                  # Lower attachment
-            (center_x - 55, center_y - 5)               # Wing base
-        ]
-        draw.polygon(left_wing_points, fill=(230, 230, 250, 180))  # Light lavender with transparency
-        
-        # Right wing with offset and opposite flap
-        right_wing_points = [
-            (center_x + 60, center_y - 20 - wing_flap), # Wing tip with opposite flap
-            (center_x + 75, center_y - 30),             # Upper attachment
-            (center_x + 65, center_y),                  # Lower attachment
-            (center_x + 55, center_y - 5)               # Wing base
-        ]
-        draw.polygon(right_wing_points, fill=(230, 230, 250, 180))  # Light lavender with transparency
-        
-        # Draw party hat with offset
-        hat_x, hat_y = center_x + 5, center_y - 25
-        hat_points = [
-            (hat_x, hat_y - 15),      # Tip of hat
-            (hat_x - 8, hat_y - 5),   # Left base
-            (hat_x + 8, hat_y - 5)    # Right base
-        ]
-        draw.polygon(hat_points, fill=(255, 215, 0, 255), outline=(212, 175, 55, 255), width=1)  # Gold
-        
-        # Draw hat decoration
-        draw.ellipse([
-            hat_x - 2, hat_y - 12, hat_x + 2, hat_y - 8
-        ], fill=(255, 105, 180, 255))  # Pink
-        
-        frames.append(img)
+@memoized_layer
+def render_animated_body(offset_x=0, offset_y=0):
+    """Render the orb, eyes, mouth and cheeks shifted by a whole-pixel offset
+    
+    These layers only float with the frame, so the drawing is shared by all
+    frames that land on the same pixel offset.
+    """
+    img = Image.new('RGBA', (200, 200), (255, 255, 255, 0))
+    draw = ImageDraw.Draw(img)
+    
+    center_x, center_y = 100 + offset_x, 100 + offset_y
+    orb_radius = 60
+    
+    # Draw the orb body with offset
+    draw.ellipse([
+        center_x - orb_radius, 
+        center_y - orb_radius, 
+        center_x + orb_radius, 
+        center_y + orb_radius
+    ], fill=(240, 230, 255, 255), outline=(224, 208, 240, 255), width=1)
     
-    return frames
+    # Add subtle texture
+    for j in range(8):
+        angle = (j * 45) * math.pi / 180
+        x = center_x + (orb_radius - 10) * math.cos(angle)
+        y = center_y + (orb_radius - 10) * math.sin(angle)
+        draw.ellipse([x-1, y-1, x+1, y+1], fill=(230, 230, 250, 255))
+    
+    # Draw eyes with offset
+    left_eye_x, right_eye_x = center_x - 20, center_x + 20
+    eye_y = center_y - 5
+    eye_size = 10
+    
+    # Always open eyes in animation
+    # Left eye
+    draw.ellipse([
+        left_eye_x - eye_size, eye_y - eye_size,
+        left_eye_x + eye_size, eye_y + eye_size
+    ], fill=(255, 255, 255, 255), outline=(208, 208, 208, 255), width=1)
+    
+    # Right eye
+    draw.ellipse([
+        right_eye_x - eye_size, eye_y - eye_size,
+        right_eye_x + eye_size, eye_y + eye_size
+    ], fill=(255, 255, 255, 255), outline=(208, 208, 208, 255), width=1)
+    
+    # Draw olive green irises
+    iris_size = eye_size * 0.6
+    draw.ellipse([
+        left_eye_x - iris_size, eye_y - iris_size,
+        left_eye_x + iris_size, eye_y + iris_size
+    ], fill=(107, 142, 35, 255))  # Olive green
+    
+    draw.ellipse([
+        right_eye_x - iris_size, eye_y - iris_size,
+        right_eye_x + iris_size, eye_y + iris_size
+    ], fill=(107, 142, 35, 255))  # Olive green
+    
+    # Draw pupils
+    draw.ellipse([
+        left_eye_x - 3, eye_y - 2,
+        left_eye_x + 1, eye_y + 1
+    ], fill=(47, 47, 47, 255))
+    
+    draw.ellipse([
+        right_eye_x - 3, eye_y - 2,
+        right_eye_x + 1, eye_y + 1
+    ], fill=(47, 47, 47, 255))
+    
+    # Draw subtle eye highlights
+    draw.ellipse([
+        left_eye_x - 1, eye_y - 1,
+        left_eye_x, eye_y
+    ], fill=(240, 240, 240, 255))
+    
+    draw.ellipse([
+        right_eye_x - 1, eye_y - 1,
+        right_eye_x, eye_y
+    ], fill=(240, 240, 240, 255))
+    
+    # Draw mouth with offset
+    mouth_y = center_y + 20
+    mouth_width = 12
+    mouth_height = 6
+    draw.arc([
+        center_x - mouth_width//2, 
+        mouth_y - mouth_height//4,
+        center_x + mouth_width//2, 
+        mouth_y + mouth_height//4
+    ], start=10, end=170, fill=(250, 218, 221, 255), width=1)  # Light pink
+    
+    # Draw cheeks with offset
+    # Left cheek
+    draw.ellipse([
+        center_x - 35, center_y + 5,
+        center_x - 25, center_y + 11
+    ], fill=(255, 209, 220, 150))  # Light pink with transparency
+    
+    # Right cheek
+    draw.ellipse([
+        center_x + 25, center_y + 5,
+        center_x + 35, center_y + 11
+    ], fill=(255, 209, 220, 150))  # Light pink with transparency
+    
+    return img
 
 
-def save_sprites():
-    """Save generated sprites to files"""
+def create_animation_frame(i, num_frames=12):
+    """Create frame ``i`` of the floating animation"""
+    # Calculate animation parameters
+    float_x = math.sin(i * 2 * math.pi / num_frames) * 2.5
+    float_y = math.sin(i * 2.5 * math.pi / num_frames) * 1.5
+    core_rotation = (i * 30) % 360  # Rotate 30 degrees per frame
+    core_pulse = i * 0.5
+    wing_flap = math.sin(i * 2 * math.pi / num_frames) * 0.3
+    
+    # Static layers snap to the pixel grid so they can be reused across frames
+    img = render_animated_body(round(float_x), round(float_y))
+    draw = ImageDraw.Draw(img)
+    
+    # Apply floating offset to the moving elements
+    center_x, center_y = 100 + float_x, 100 + float_y
+    
+    # Draw soul core with rotation and pulse
+    core_size = 15
+    glow_size = core_size + 5 + int(abs(math.sin(core_pulse)) * 3)
+    draw.ellipse([
+        center_x - glow_size, center_y - glow_size,
+        center_x + glow_size, center_y + glow_size
+    ], fill=(147, 112, 219, 100))  # Medium purple with transparency
+    
+    # Draw faceted soul shard
+    core_points = []
+    for j in range(8):
+        angle = (j * 45 + core_rotation) * math.pi / 180
+        radius = core_size * (0.8 + 0.2 * math.sin(j * 0.7))
+        px = center_x + radius * math.cos(angle)
+        py = center_y + radius * math.sin(angle)
+        core_points.extend([px, py])
+    
+    draw.polygon(core_points, fill=(75, 0, 130, 255), outline=(122, 92, 148, 255), width=1)  # Indigo
+    
+    # Draw internal spiral of the soul shard
+    spiral_points = []
+    for j in range(20):
+        angle = (j * 18 + core_rotation * 2) * math.pi / 180
+        radius = core_size * 0.6 * (1 - j/20)
+        px = center_x + radius * math.cos(angle)
+        py = center_y + radius * math.sin(angle)
+        spiral_points.extend([int(px), int(py)])
+    
+    if len(spiral_points) >= 4:
+        draw.line(spiral_points, fill=(177, 156, 217, 200), width=1, joint="curve")
+    
+    # Draw wings with flap offset
+    # Left wing with offset and flap
+    left_wing_points = [
+        (center_x - 60, center_y - 20 + wing_flap),  # Wing tip with flap
+        (center_x - 75, center_y - 30),             # Upper attachment
+        (center_x - 65, center_y),                  # Lower attachment
+        (center_x - 55, center_y - 5)               # Wing base
+    ]
+    draw.polygon(left_wing_points, fill=(230, 230, 250, 180))  # Light lavender with transparency
+    
+    # Right wing with offset and opposite flap
+    right_wing_points = [
+        (center_x + 60, center_y - 20 - wing_flap), # Wing tip with opposite flap
+        (center_x + 75, center_y - 30),             # Upper attachment
+        (center_x + 65, center_y),                  # Lower attachment
+        (center_x + 55, center_y - 5)               # Wing base
+    ]
+    draw.polygon(right_wing_points, fill=(230, 230, 250, 180))  # Light lavender with transparency
+    
+    # Draw party hat with offset
+    hat_x, hat_y = center_x + 5, center_y - 25
+    hat_points = [
+        (hat_x, hat_y - 15),      # Tip of hat
+        (hat_x - 8, hat_y - 5),   # Left base
+        (hat_x + 8, hat_y - 5)    # Right base
+    ]
+    draw.polygon(hat_points, fill=(255, 215, 0, 255), outline=(212, 175, 55, 255), width=1)  # Gold
+    
+    # Draw hat decoration
+    draw.ellipse([
+        hat_x - 2, hat_y - 12, hat_x + 2, hat_y - 8
+    ], fill=(255, 105, 180, 255))  # Pink
+    
+    return img
+
+
+def generate_animation_frames(num_frames=12, workers=1):
+    """Generate animation frames for the fairy orb"""
+    params = [(i, num_frames) for i in range(num_frames)]
+    return render_frames(create_animation_frame, params, workers=workers)
+
+
+def sprites_digest(num_frames=12):
+    """Hash of everything the sprite layers and animation are drawn from"""
+    return inputs_digest({"num_frames": num_frames}, [os.path.abspath(__file__)])
+
+
+def save_sprites(workers=1, force=False):
+    """Save generated sprites to files
+
+    Skips all drawing and encoding when the files on disk were produced from
+    the same inputs, unless ``force`` is set.
+    """
+    num_frames = 12
+    files = [
+        "orb_base.png", "eyes_open.png", "eyes_closed.png", "mouth.png",
+        "cheeks.png", "wings.png", "soul_core.png", "party_hat.png",
+        "composite_character.png", "sample_animation.gif",
+    ]
+    files += [f"animation_frame_{i:02d}.png" for i in range(num_frames)]
+    cache = OutputCache("sprites")
+    key = sprites_digest(num_frames)
+    if not force and cache.is_fresh("sprites", key, files):
+        print("Sprites in 'sprites' are up to date, skipping generation")
+        return False
+    
     # Create output directory
     os.makedirs("sprites", exist_ok=True)
     
@@ -497,7 +546,7 @@ def save_sprites():
     
     # Generate and save animation frames
     print("Generating animation frames...")
-    animation_frames = generate_animation_frames()
+    animation_frames = generate_animation_frames(num_frames, workers=workers)
     
     for i, frame in enumerate(animation_frames):
         frame.save(f"sprites/animation_frame_{i:02d}.png")
@@ -517,13 +566,23 @@ def save_sprites():
     print("- Composite character image")
     print("- Animation frames")
     print("- Sample animated GIF")
+    
+    cache.record("sprites", key, files)
+    return True
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate the companion sprite layers and animation")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes used to render animation frames (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate even if the cached sprites are up to date")
+    args = parser.parse_args()
+    
     print("Starting Sprite Generator for Aware Companion Fairy Orb...")
     print("Creating art sprites and animations based on the character description.")
     
-    save_sprites()
+    save_sprites(workers=args.workers or None, force=args.force)
 
 
 if __name__ == "__main__":
@@ -4,24 +4,36 @@ Following exact specifications for production-ready sprite sheet
 """
 
 from PIL import Image, ImageDraw, ImageFont
+import argparse
 import math
 import os
 
+from SPRITE_CACHE import OutputCache, inputs_digest, memoized_layer, render_frames
 
-def create_fairy_orb_frame(y_offset=0, wing_flap=0):
-    """Create a single frame of the fairy orb with specified offsets"""
+
+OUTPUT_DIR = "production_sprites"
+
+# Frame progression: neutral -> up -> highest -> return center -> down -> lowest -> return center -> neutral
+Y_OFFSETS = (0, 0.3, 0.5, 0.3, -0.3, -0.5, -0.3, 0)
+
+# Wing flap values for micro-twitch (very subtle)
+WING_FLAPS = (0, 0.1, 0, -0.1, 0, 0.1, 0, -0.1)
+
+
+@memoized_layer
+def render_orb_body(adjusted_y):
+    """Render the orb, cheeks, eyes, mouth and soul core at a given height
+
+    None of these layers depend on the wing flap, so every frame sharing the
+    same vertical position reuses one drawing.
+    """
     size = (200, 200)
     img = Image.new('RGBA', size, (255, 255, 255, 0))  # Transparent background
     draw = ImageDraw.Draw(img)
     
-    # Calculate center and orb radius with vertical offset
-    center_x, center_y = size[0] // 2, size[1] // 2
+    center_x = size[0] // 2
     orb_radius = 60
     
-    # Apply vertical offset (limited to 5% of height as specified)
-    max_offset = int(size[1] * 0.05)  # 5% of height
-    adjusted_y = center_y + int(y_offset * max_offset)
-    
     # Draw the orb body (soft lavender-white)
     draw.ellipse([
         center_x - orb_radius, 
@@ -146,6 +158,24 @@ def create_fairy_orb_frame(y_offset=0, wing_flap=0):
     if len(spiral_points) >= 4:
         draw.line(spiral_points, fill=(177, 156, 217, 200), width=1, joint="curve")
     
+    return img
+
+
+def create_fairy_orb_frame(y_offset=0, wing_flap=0):
+    """Create a single frame of the fairy orb with specified offsets"""
+    size = (200, 200)
+    
+    # Calculate center with vertical offset
+    center_x, center_y = size[0] // 2, size[1] // 2
+    
+    # Apply vertical offset (limited to 5% of height as specified)
+    max_offset = int(size[1] * 0.05)  # 5% of height
+    adjusted_y = center_y + int(y_offset * max_offset)
+    
+    # Start from the cached body and draw the moving parts on top
+    img = render_orb_body(adjusted_y)
+    draw = ImageDraw.Draw(img)
+    
     # Draw organic wings (light lavender, semi-translucent) with micro-twitch
     wing_offset = wing_flap * 2  # Limited wing movement as specified
     
@@ -184,20 +214,10 @@ def create_fairy_orb_frame(y_offset=0, wing_flap=0):
     return img
 
 
-def generate_sprite_sheet():
+def generate_sprite_sheet(workers=1):
     """Generate the complete sprite sheet with 8 frames in a 4x2 grid"""
-    # Define the vertical positions for each frame (based on the progression)
-    # Frame progression: neutral -> up -> highest -> return center -> down -> lowest -> return center -> neutral
-    y_offsets = [0, 0.3, 0.5, 0.3, -0.3, -0.5, -0.3, 0]  # 8 frames
-    
-    # Wing flap values for micro-twitch (very subtle)
-    wing_flaps = [0, 0.1, 0, -0.1, 0, 0.1, 0, -0.1]  # Subtle wing movement
-    
-    # Create individual frames
-    frames = []
-    for i in range(8):
-        frame = create_fairy_orb_frame(y_offsets[i], wing_flaps[i])
-        frames.append(frame)
+    # Create individual frames (optionally across worker processes)
+    frames = render_frames(create_fairy_orb_frame, zip(Y_OFFSETS, WING_FLAPS), workers=workers)
     
     # Create sprite sheet (4x2 grid: 4 columns, 2 rows)
     sheet_width = 200 * 4  # 4 frames horizontally
@@ -214,15 +234,35 @@ def generate_sprite_sheet():
     return sprite_sheet, frames
 
 
-def save_production_assets():
-    """Save the sprite sheet and individual frames"""
+def sprite_sheet_digest():
+    """Hash of everything the production sprite sheet is drawn from"""
+    sources = [os.path.abspath(__file__)]
+    params = {"y_offsets": Y_OFFSETS, "wing_flaps": WING_FLAPS}
+    return inputs_digest(params, sources)
+
+
+
+def save_production_assets(workers=1, force=False):
+    """Save the sprite sheet and individual frames
+
+    Skips all drawing and encoding when the files on disk were produced from
+    the same inputs, unless ``force`` is set.
+    """
+    files = ["sprite_sheet_aware_companion.png", "sample_loop_animation.gif"]
+    files += [f"frame_{i:02d}.png" for i in range(len(Y_OFFSETS))]
+    cache = OutputCache(OUTPUT_DIR)
+    key = sprite_sheet_digest()
+    if not force and cache.is_fresh("sprite_sheet", key, files):
+        print(f"Production sprites in '{OUTPUT_DIR}' are up to date, skipping generation")
+        return False
+    
     # Create output directory
     os.makedirs("production_sprites", exist_ok=True)
     
     print("Generating sprite sheet with 8 frames in 4x2 grid...")
     
     # Generate the sprite sheet and individual frames
-    sprite_sheet, frames = generate_sprite_sheet()
+    sprite_sheet, frames = generate_sprite_sheet(workers=workers)
     
     # Save the complete sprite sheet
     sprite_sheet.save("production_sprites/sprite_sheet_aware_companion.png")
@@ -255,13 +295,23 @@ def save_production_assets():
     print("- Wings with micro-twitch only")
     print("- Calm, aware, emotionally present expression")
     print("- Consistent proportions, colors, and silhouette")
+    
+    cache.record("sprite_sheet", key, files)
+    return True
 
 
 def main():
+    parser = argparse.ArgumentParser(description="Generate the production sprite sheet")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="processes used to render frames (0 = one per CPU)")
+    parser.add_argument("--force", action="store_true",
+                        help="regenerate even if the cached assets are up to date")
+    args = parser.parse_args()
+    
     print("Starting Production Sprite Sheet Generator for Aware Companion Fairy Orb...")
     print("Following exact specifications for production-ready assets.")
     
-    save_production_assets()
+    save_production_assets(workers=args.workers or None, force=args.force)
     
     print("\nSprite sheet generation complete!")
 
@@ -17,7 +17,7 @@ import base64
 from integration.CORE_HUB import Message, ComponentType, CoreHub
 from visualization.VISUAL_COMPANION import VisualCompanion
 from voice.VOICE_SYNTHESIZER import VoiceSynthesizer
-from memory.MEMORY_NODES import MemoryWeb
+from memory.MEMORY_NODES import DEFAULT_SNAPSHOT_PATH, MemoryWeb
 from integration.AI_CONNECTOR import AIConnector
 
 
@@ -511,7 +511,7 @@ def create_visual_interface():
     # Create supporting components
     visual_companion = VisualCompanion(hub)
     voice_synthesizer = VoiceSynthesizer(hub, visual_companion)
-    memory_web = MemoryWeb(hub, visual_companion, voice_synthesizer)
+    memory_web = MemoryWeb(hub, visual_companion, voice_synthesizer, snapshot_path=DEFAULT_SNAPSHOT_PATH)
     ai_connector = AIConnector(hub, memory_web, visual_companion, voice_synthesizer)
     
     # Create the visual interface
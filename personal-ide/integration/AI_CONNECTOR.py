@@ -4,6 +4,7 @@ Manages connections to various AI models and routes requests appropriately
 """
 
 import asyncio
+import itertools
 import json
 import time
 from datetime import datetime
@@ -11,10 +12,10 @@ from typing import Dict, Any, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
-from integration.CORE_HUB import Message, ComponentType, CoreHub
+from integration.CORE_HUB import Message, ComponentType, CoreHub, RoutePolicy
 from visualization.VISUAL_COMPANION import VisualCompanion
 from voice.VOICE_SYNTHESIZER import VoiceSynthesizer
-from memory.MEMORY_NODES import MemoryWeb
+from memory.MEMORY_NODES import DEFAULT_SNAPSHOT_PATH, MemoryWeb
 
 
 class AIProvider(Enum):
@@ -304,12 +305,14 @@ class AIConnector:
             "provider_usage": {}
         }
         
-        # Register with the hub
+        # Register with the hub; generation is slow, so several requests run at once
         self.hub.registry.register_component(
             self.name,
             self.handle_message,
             self.component_type
         )
+        self.hub.set_route_policy(self.name, RoutePolicy(max_queue=256, workers=4))
+        self._request_seq = itertools.count()
         
         # Register for relevant events
         self.hub.event_coord.register_event_handler("ai_request", self.on_ai_request)
@@ -362,7 +365,7 @@ class AIConnector:
             spec = self.model_selector.get_model_spec(model_id)
         
         # Create request
-        request_id = f"req_{int(time.time() * 1000)}"
+        request_id = f"req_{int(time.time() * 1000)}_{next(self._request_seq)}"
         request = AIRequest(
             id=request_id,
             prompt=prompt,
@@ -576,7 +579,7 @@ async def main():
     # Create supporting components
     visual_comp = VisualCompanion(hub)
     voice_synthesizer = VoiceSynthesizer(hub, visual_comp)
-    memory_web = MemoryWeb(hub, visual_comp, voice_synthesizer)
+    memory_web = MemoryWeb(hub, visual_comp, voice_synthesizer, snapshot_path=DEFAULT_SNAPSHOT_PATH)
     
     # Create the AI connector
     ai_connector = AIConnector(hub, memory_web, visual_comp, voice_synthesizer)
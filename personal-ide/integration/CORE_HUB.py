@@ -4,9 +4,14 @@ Central nervous system connecting all components of the spiderweb architecture
 """
 
 import asyncio
+import contextvars
+import heapq
+import itertools
 import json
+import time
+from collections import deque
 from datetime import datetime
-from typing import Dict, Any, Callable, List
+from typing import Dict, Any, Callable, List, Optional, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
 
@@ -64,49 +69,312 @@ class ComponentRegistry:
         return self.connections.get(component_name, [])
 
 
+class OverflowPolicy(Enum):
+    """What a full destination queue does with one more message"""
+    BLOCK = "block"              # the sender waits for room (back-pressure); see MessageRouter.send_message
+    DROP_NEWEST = "drop_newest"  # the incoming message is discarded
+    DROP_OLDEST = "drop_oldest"  # the oldest of the lowest-priority queued messages makes room
+
+
+# High-rate updates where only the latest value matters
+STATE_UPDATE_TYPES = ("emotion_update", "attention_update", "context_update", "visual_update")
+
+
+@dataclass
+class RoutePolicy:
+    """Queueing and concurrency for one destination component"""
+    max_queue: int = 1024
+    workers: int = 1
+    overflow: OverflowPolicy = OverflowPolicy.BLOCK
+    # Message types that replace a queued message of the same type from the same source
+    coalesce_types: Tuple[str, ...] = ()
+
+
+class LatencyWindow:
+    """Recent latency samples (seconds) summarised in milliseconds"""
+    
+    def __init__(self, size: int = 256):
+        self.samples = deque(maxlen=size)
+        self.count = 0
+        self.max = 0.0
+    
+    def add(self, seconds: float):
+        self.samples.append(seconds)
+        self.count += 1
+        self.max = max(self.max, seconds)
+    
+    def summary(self) -> Dict[str, float]:
+        if not self.samples:
+            return {"count": self.count, "avg_ms": 0.0, "p95_ms": 0.0, "max_ms": self.max * 1000}
+        ordered = sorted(self.samples)
+        return {
+            "count": self.count,
+            "avg_ms": sum(ordered) / len(ordered) * 1000,
+            "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+            "max_ms": self.max * 1000,
+        }
+
+
+class DestinationQueue:
+    """Bounded priority queue in front of one component.
+    
+    Higher Message.priority is served first, FIFO within a priority. Entries
+    are [-priority, seq, message, queued_at]; dropped entries keep their heap
+    slot with message set to None.
+    """
+    
+    def __init__(self, name: str, policy: RoutePolicy):
+        self.name = name
+        self.policy = policy
+        self._heap: List[list] = []
+        self._seq = itertools.count()
+        self._size = 0
+        self._unfinished = 0
+        self._coalescing: Dict[Tuple[str, str], list] = {}
+        self._changed = asyncio.Condition()
+        self._idle = asyncio.Event()
+        self._idle.set()
+        
+        # Metrics
+        self.enqueued = 0
+        self.delivered = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.errors = 0
+        self.max_depth = 0
+        self.busy = 0
+        self.wait_latency = LatencyWindow()
+        self.handler_latency = LatencyWindow()
+    
+    def __len__(self) -> int:
+        return self._size
+    
+    def _coalesce_key(self, message: Message) -> Optional[Tuple[str, str]]:
+        if self.policy.coalesce_types and isinstance(message.content, dict):
+            message_type = message.content.get("type")
+            if message_type in self.policy.coalesce_types:
+                return (message.source, message_type)
+        return None
+    
+    def _evict_for(self, priority: int) -> bool:
+        """Drop the oldest lowest-priority entry, unless everything queued outranks priority"""
+        live = [entry for entry in self._heap if entry[2] is not None]
+        victim = max(live, key=lambda entry: (entry[0], -entry[1]), default=None)
+        if victim is None or -victim[0] > priority:
+            return False
+        self._discard(victim)
+        return True
+    
+    def _discard(self, entry: list):
+        key = self._coalesce_key(entry[2])
+        if key is not None and self._coalescing.get(key) is entry:
+            del self._coalescing[key]
+        entry[2] = None
+        self._size -= 1
+        self.dropped += 1
+        self._finish()
+    
+    async def put(self, message: Message, may_block: bool = True) -> bool:
+        """Queue message; False if the overflow policy discarded it
+        
+        With may_block False a BLOCK queue sheds like DROP_OLDEST instead of waiting.
+        """
+        key = self._coalesce_key(message)
+        overflow = self.policy.overflow
+        if overflow == OverflowPolicy.BLOCK and not may_block:
+            overflow = OverflowPolicy.DROP_OLDEST
+        async with self._changed:
+            while True:
+                if key is not None and key in self._coalescing:
+                    # Keep the queued slot, deliver the newest content
+                    self._coalescing[key][2] = message
+                    self.coalesced += 1
+                    return True
+                if self._size < self.policy.max_queue:
+                    break
+                if overflow == OverflowPolicy.BLOCK:
+                    await self._changed.wait()
+                elif overflow == OverflowPolicy.DROP_NEWEST or not self._evict_for(message.priority):
+                    self.dropped += 1
+                    return False
+            
+            entry = [-message.priority, next(self._seq), message, time.perf_counter()]
+            heapq.heappush(self._heap, entry)
+            if key is not None:
+                self._coalescing[key] = entry
+            self._size += 1
+            self._unfinished += 1
+            self._idle.clear()
+            self.enqueued += 1
+            self.max_depth = max(self.max_depth, self._size)
+            self._changed.notify_all()
+            return True
+    
+    async def get(self) -> Message:
+        """Next message by priority; call task_done() once it has been handled"""
+        async with self._changed:
+            while not self._size:
+                await self._changed.wait()
+            entry = heapq.heappop(self._heap)
+            while entry[2] is None:
+                entry = heapq.heappop(self._heap)
+            message = entry[2]
+            key = self._coalesce_key(message)
+            if key is not None and self._coalescing.get(key) is entry:
+                del self._coalescing[key]
+            self._size -= 1
+            self.wait_latency.add(time.perf_counter() - entry[3])
+            self._changed.notify_all()
+            return message
+    
+    def task_done(self):
+        self.delivered += 1
+        self._finish()
+    
+    def _finish(self):
+        self._unfinished -= 1
+        if self._unfinished <= 0:
+            self._idle.set()
+    
+    async def join(self):
+        """Wait until every queued message has been handled or dropped"""
+        await self._idle.wait()
+    
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "depth": self._size,
+            "max_depth": self.max_depth,
+            "capacity": self.policy.max_queue,
+            "workers": self.policy.workers,
+            "busy": self.busy,
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "errors": self.errors,
+            "queue_wait": self.wait_latency.summary(),
+            "handler": self.handler_latency.summary(),
+        }
+
+
+# Set inside destination workers (and tasks they start), see MessageRouter.send_message
+_IN_ROUTER_WORKER = contextvars.ContextVar("in_router_worker", default=False)
+
+
 class MessageRouter:
-    """Routes messages between components based on the spiderweb architecture"""
+    """Routes messages between components based on the spiderweb architecture
     
-    def __init__(self, registry: ComponentRegistry):
-        self.registry = registry
-        self.message_queue = asyncio.Queue()
+    Every destination has its own bounded priority queue and worker tasks, so
+    a slow handler only holds up messages for that component.
+    """
     
-    async def send_message(self, message: Message):
-        """Send a message to its destination"""
-        # Add message to queue for processing
-        await self.message_queue.put(message)
+    def __init__(self, registry: ComponentRegistry, default_policy: RoutePolicy = None):
+        self.registry = registry
+        self.default_policy = default_policy or RoutePolicy()
+        self.policies: Dict[str, RoutePolicy] = {}
+        self.queues: Dict[str, DestinationQueue] = {}
+        self.workers: Dict[str, List[asyncio.Task]] = {}
+        self.unroutable = 0
+        self.processing = False
+    
+    def set_policy(self, destination: str, policy: RoutePolicy):
+        """Configure queueing for a destination; extra workers start right away"""
+        self.policies[destination] = policy
+        queue = self.queues.get(destination)
+        if queue is not None:
+            queue.policy = policy
+            if self.processing:
+                self._start_workers(queue)
+    
+    def _queue(self, destination: str) -> DestinationQueue:
+        queue = self.queues.get(destination)
+        if queue is None:
+            queue = self.queues[destination] = DestinationQueue(
+                destination, self.policies.get(destination, self.default_policy))
+            if self.processing:
+                self._start_workers(queue)
+        return queue
+    
+    def _start_workers(self, queue: DestinationQueue):
+        tasks = [task for task in self.workers.get(queue.name, []) if not task.done()]
+        while len(tasks) < queue.policy.workers:
+            tasks.append(asyncio.create_task(self._worker(queue)))
+        self.workers[queue.name] = tasks
+    
+    async def send_message(self, message: Message) -> bool:
+        """Send a message to its destination; False if it was not queued
+        
+        Only senders outside the router wait on a full BLOCK queue. A handler
+        sending from a destination worker (replies, state pushes, messages to
+        its own component) never waits: two workers waiting on each other's
+        full queues would deadlock, so the full queue sheds its oldest
+        lowest-priority message instead.
+        """
+        if message.destination not in self.registry.components:
+            # Nobody to deliver to (the old single queue discarded these on dequeue)
+            self.unroutable += 1
+            return False
+        return await self._queue(message.destination).put(message, may_block=not _IN_ROUTER_WORKER.get())
     
     async def process_messages(self, running_flag):
-        """Process messages from the queue"""
-        while running_flag.running:
+        """Run the destination workers until the hub stops"""
+        self.processing = True
+        for queue in list(self.queues.values()):
+            self._start_workers(queue)
+        try:
+            while running_flag.running:
+                await asyncio.sleep(1.0)
+        finally:
+            self.processing = False
+            tasks = [task for tasks in self.workers.values() for task in tasks]
+            self.workers = {}
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _worker(self, queue: DestinationQueue):
+        _IN_ROUTER_WORKER.set(True)  # the task runs in its own copy of the context
+        while True:
+            message = await queue.get()
+            queue.busy += 1
             try:
-                # Use asyncio.wait_for to implement timeout
-                message = await asyncio.wait_for(self.message_queue.get(), timeout=1.0)
-                
-                # Route message based on destination
-                if message.destination in self.registry.components:
-                    component = self.registry.components[message.destination]
-                    if component['status'] == 'active':
-                        # Call the component function with the message
-                        result = await self._call_component(component['function'], message)
-                        
-                        # Handle response if needed
-                        if result and message.context.get('await_response'):
-                            # Send response back to source
-                            response_msg = Message(
-                                id=f"{message.id}_response",
-                                source=message.destination,
-                                destination=message.source,
-                                content=result,
-                                context={'response_to': message.id}
-                            )
-                            await self.send_message(response_msg)
-                
-                self.message_queue.task_done()
-                
-            except asyncio.TimeoutError:
-                # No messages to process, continue loop
-                continue
+                await self._deliver(queue, message)
+            finally:
+                queue.busy -= 1
+                queue.task_done()
+            # Shrink if the policy now asks for fewer workers
+            tasks = self.workers.get(queue.name, [])
+            if len(tasks) > queue.policy.workers and asyncio.current_task() in tasks:
+                tasks.remove(asyncio.current_task())
+                return
+    
+    async def _deliver(self, queue: DestinationQueue, message: Message):
+        component = self.registry.components.get(message.destination)
+        if not component or component['status'] != 'active':
+            return
+        
+        # Call the component function with the message
+        start = time.perf_counter()
+        try:
+            result = await self._call_component(component['function'], message)
+        except Exception as e:
+            queue.errors += 1
+            print(f"Error delivering {message.id} to {message.destination}: {e}")
+            return
+        finally:
+            queue.handler_latency.add(time.perf_counter() - start)
+        
+        # Handle response if needed
+        if result and message.context.get('await_response'):
+            # Send response back to source
+            response_msg = Message(
+                id=f"{message.id}_response",
+                source=message.destination,
+                destination=message.source,
+                content=result,
+                context={'response_to': message.id}
+            )
+            await self.send_message(response_msg)
     
     async def _call_component(self, func: Callable, message: Message):
         """Call a component function with the message"""
@@ -114,32 +382,126 @@ class MessageRouter:
             return await func(message)
         else:
             return func(message)
+    
+    async def join(self):
+        """Wait until every queued message has been handled or dropped"""
+        await asyncio.gather(*(queue.join() for queue in list(self.queues.values())))
+    
+    def get_metrics(self) -> Dict[str, Any]:
+        """Queue depth, drops and latencies per destination"""
+        return {
+            "unroutable": self.unroutable,
+            "destinations": {name: queue.metrics() for name, queue in self.queues.items()},
+        }
+
+
+@dataclass
+class StateSubscription:
+    """A component's interest in global state changes"""
+    callback: Callable
+    prefixes: Tuple[str, ...] = ()  # only keys starting with one of these; empty means all keys
+    batched: bool = False           # one call with a {key: value} dict instead of one call per key
+    
+    def select(self, changes: Dict[str, Any]) -> Dict[str, Any]:
+        if not self.prefixes:
+            return changes
+        return {key: value for key, value in changes.items() if key.startswith(self.prefixes)}
 
 
 class StateSynchronizer:
-    """Synchronizes state across all connected components"""
+    """Synchronizes state across all connected components
     
-    def __init__(self, registry: ComponentRegistry):
+    Writes apply to global_state immediately, but notifications are batched:
+    keys written during one tick are merged (last value wins) and every
+    subscriber is notified once per tick. A tick is one pass of the event loop,
+    or tick_interval seconds when that is set. Without a running loop changes
+    are delivered straight away.
+    """
+    
+    def __init__(self, registry: ComponentRegistry, tick_interval: float = 0.0):
         self.registry = registry
         self.global_state = {}
-        self.state_callbacks = {}  # component_name -> callback function
-    
-    def register_state_callback(self, component_name: str, callback: Callable):
-        """Register a callback for when global state changes"""
-        self.state_callbacks[component_name] = callback
+        self.state_callbacks: Dict[str, StateSubscription] = {}  # component_name -> subscription
+        self.tick_interval = tick_interval
+        self._dirty: Dict[str, Any] = {}
+        self._flush_handle = None
+        self.stats = {"writes": 0, "flushes": 0, "notifications": 0}
+    
+    def register_state_callback(self, component_name: str, callback: Callable, prefixes=(), batched: bool = False):
+        """Register a callback for when global state changes
+        
+        Plain callbacks are called as callback(key, value) for each changed
+        key; batched ones as callback(changes). prefixes limits the keys seen.
+        """
+        if isinstance(prefixes, str):
+            prefixes = (prefixes,)
+        self.state_callbacks[component_name] = StateSubscription(callback, tuple(prefixes), batched)
     
     def update_global_state(self, key: str, value: Any):
         """Update a value in the global state"""
         self.global_state[key] = value
-        # Notify all registered callbacks
-        for component_name, callback in self.state_callbacks.items():
+        self.stats["writes"] += 1
+        self._dirty[key] = value
+        if self._flush_handle is not None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush()
+            return
+        if self.tick_interval > 0:
+            self._flush_handle = loop.call_later(self.tick_interval, self.flush)
+        else:
+            self._flush_handle = loop.call_soon(self.flush)
+    
+    def flush(self):
+        """Notify subscribers of everything written since the last flush"""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        changes, self._dirty = self._dirty, {}
+        if not changes:
+            return
+        self.stats["flushes"] += 1
+        
+        for component_name, subscription in list(self.state_callbacks.items()):
+            selected = subscription.select(changes)
+            if not selected:
+                continue
+            self.stats["notifications"] += 1
+            callback = subscription.callback
+            if asyncio.iscoroutinefunction(callback):
+                try:
+                    loop = asyncio.get_running_loop()
+                except RuntimeError:
+                    print(f"Error in state callback for {component_name}: async callbacks need a running event loop")
+                    continue
+                loop.create_task(self._notify_async(component_name, subscription, selected))
+            elif subscription.batched:
+                try:
+                    callback(selected)
+                except Exception as e:
+                    print(f"Error in state callback for {component_name}: {e}")
+            else:
+                # A failure on one key must not hide the remaining keys
+                for key, value in selected.items():
+                    try:
+                        callback(key, value)
+                    except Exception as e:
+                        print(f"Error in state callback for {component_name} ({key}): {e}")
+    
+    async def _notify_async(self, component_name: str, subscription: StateSubscription, changes: Dict[str, Any]):
+        if subscription.batched:
             try:
-                if asyncio.iscoroutinefunction(callback):
-                    asyncio.create_task(callback(key, value))
-                else:
-                    callback(key, value)
+                await subscription.callback(changes)
             except Exception as e:
                 print(f"Error in state callback for {component_name}: {e}")
+            return
+        for key, value in changes.items():
+            try:
+                await subscription.callback(key, value)
+            except Exception as e:
+                print(f"Error in state callback for {component_name} ({key}): {e}")
     
     def get_global_state(self, key: str, default=None):
         """Get a value from the global state"""
@@ -235,10 +597,10 @@ class PrivacyHub:
 class CoreHub:
     """The central nervous system of the spiderweb architecture"""
     
-    def __init__(self):
+    def __init__(self, state_tick: float = 0.0):
         self.registry = ComponentRegistry()
         self.router = MessageRouter(self.registry)
-        self.state_sync = StateSynchronizer(self.registry)
+        self.state_sync = StateSynchronizer(self.registry, tick_interval=state_tick)
         self.event_coord = EventCoordinator(self.registry, self.router)
         self.privacy_hub = PrivacyHub()
         
@@ -253,6 +615,7 @@ class CoreHub:
     
     async def shutdown(self):
         """Shutdown the core hub"""
+        self.state_sync.flush()
         if self.processing_task:
             self.processing_task.cancel()
             try:
@@ -281,9 +644,13 @@ class CoreHub:
             print(f"Access denied: {message.source} -> {message.destination}")
     
     def update_state(self, key: str, value: Any):
-        """Update global state"""
+        """Update global state (subscribers are notified once per tick)"""
         self.state_sync.update_global_state(key, value)
     
+    def subscribe_state(self, component_name: str, callback: Callable, prefixes=(), batched: bool = False):
+        """Subscribe a component to global state changes, optionally by key prefix"""
+        self.state_sync.register_state_callback(component_name, callback, prefixes, batched)
+    
     def get_state(self, key: str, default=None):
         """Get value from global state"""
         return self.state_sync.get_global_state(key, default)
@@ -295,6 +662,14 @@ class CoreHub:
     def set_privacy_policy(self, component_name: str, policy: Dict[str, Any]):
         """Set privacy policy for a component"""
         self.privacy_hub.set_privacy_policy(component_name, policy)
+    
+    def set_route_policy(self, component_name: str, policy: RoutePolicy):
+        """Set queue size, worker count and overflow handling for a component"""
+        self.router.set_policy(component_name, policy)
+    
+    def get_router_metrics(self) -> Dict[str, Any]:
+        """Queue depth and handler latency per component"""
+        return self.router.get_metrics()
 
 
 # Example usage and initialization
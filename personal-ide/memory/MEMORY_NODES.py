@@ -4,17 +4,34 @@ Implements distributed memory system with spiderweb architecture
 """
 
 import asyncio
+import bisect
+import heapq
 import json
 import hashlib
+import os
 import uuid
+import random
+import sys
+import time
+import zlib
+from array import array
 from datetime import datetime, timedelta
-from typing import Dict, Any, List, Optional, Set, Tuple
+from typing import Dict, Any, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from enum import Enum
+from types import MappingProxyType
 
 from integration.CORE_HUB import Message, ComponentType, CoreHub
 from visualization.VISUAL_COMPANION import VisualCompanion
 from voice.VOICE_SYNTHESIZER import VoiceSynthesizer
+from memory.MEMORY_SNAPSHOT import (CONTENT_JSON, CONTENT_TEXT, SEGMENT_SUFFIX, MemorySnapshot, SegmentLog,
+                                    SnapshotEdges, SnapshotNodes, SnapshotRow, write_snapshot)
+
+
+# Where the launchers keep the web between runs
+DEFAULT_SNAPSHOT_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "memory_web.snap")
+# Segment ops to accumulate before maintenance folds them into a fresh snapshot
+SEGMENT_MERGE_THRESHOLD = 5000
 
 
 class MemoryType(Enum):
@@ -35,19 +52,187 @@ class MemoryImportance(Enum):
     CRITICAL = 4    # Critical memories that should be retained
 
 
-@dataclass
+class TagPool:
+    """Interns tag strings as small ints and shares identical tag-id tuples"""
+    
+    def __init__(self):
+        self.ids: Dict[str, int] = {}
+        self.names: List[str] = []
+        self._tuples: Dict[Tuple[int, ...], Tuple[int, ...]] = {}
+    
+    def intern(self, tags) -> Tuple[int, ...]:
+        if not tags:
+            return ()
+        ids = []
+        for tag in tags:
+            tag_id = self.ids.get(tag)
+            if tag_id is None:
+                tag_id = self.ids[tag] = len(self.names)
+                self.names.append(sys.intern(tag) if isinstance(tag, str) else tag)
+            ids.append(tag_id)
+        key = tuple(ids)
+        return self._tuples.setdefault(key, key)
+    
+    def resolve(self, tag_ids: Tuple[int, ...]) -> Tuple[str, ...]:
+        names = self.names
+        return tuple(names[i] for i in tag_ids)
+
+
+TAG_POOL = TagPool()
+_TYPE_CODES = {mt: code for code, mt in enumerate(MemoryType)}  # snapshot type codes
+
+
+def _epoch(value) -> float:
+    return value.timestamp() if isinstance(value, datetime) else float(value)
+
+
 class MemoryNode:
-    """A single node in the memory web"""
-    id: str
-    content: Any
-    memory_type: MemoryType
-    timestamp: datetime
-    importance: MemoryImportance
-    tags: List[str] = field(default_factory=list)
-    connections: List[str] = field(default_factory=list)  # IDs of connected nodes
-    context: Dict[str, Any] = field(default_factory=dict)
-    retention_score: float = 1.0  # 0.0 to 1.0, higher means more likely to be retained
-    last_accessed: datetime = field(default_factory=datetime.now)
+    """A single node in the memory web
+    
+    Slotted: timestamps are epoch floats (``created``/``accessed``), tags are
+    interned ids (``tag_ids``), and context is only allocated once used. The
+    ``timestamp``, ``last_accessed`` and ``context`` properties keep the
+    original datetime/dict interface. ``tags`` and ``connections`` read as
+    tuples, so in-place edits fail loudly. Once the node is in a MemoryWeb,
+    ``tags``, ``importance`` and ``memory_type`` are indexed there and can only
+    be changed through ``MemoryWeb.update_node(...)``; assigning them raises.
+    """
+    __slots__ = ("id", "content", "_memory_type", "_importance", "created", "accessed",
+                 "tag_ids", "retention_score", "_context", "_connections", "_in_web")
+    
+    def __init__(self, id: str, content: Any, memory_type: MemoryType, timestamp, importance: MemoryImportance,
+                 tags: List[str] = None, connections: List[str] = None, context: Dict[str, Any] = None,
+                 retention_score: float = 1.0, last_accessed=None):
+        self._in_web = False  # set while a MemoryWeb holds the node
+        self.id = id
+        self.content = content
+        self.memory_type = memory_type
+        self.importance = importance
+        self.created = _epoch(timestamp)
+        self.accessed = time.time() if last_accessed is None else _epoch(last_accessed)
+        self.tag_ids = TAG_POOL.intern(tags)
+        self.retention_score = retention_score  # 0.0 to 1.0, higher means more likely to be retained
+        self._context = context or None
+        self._connections = tuple(connections) if connections else ()  # IDs of connected nodes
+    
+    def _check_free(self, name: str):
+        if self._in_web:
+            raise AttributeError(f"MemoryNode.{name} is indexed by its MemoryWeb; use MemoryWeb.update_node()")
+    
+    @property
+    def memory_type(self) -> MemoryType:
+        return self._memory_type
+    
+    @memory_type.setter
+    def memory_type(self, value: MemoryType):
+        self._check_free("memory_type")
+        self._memory_type = value
+    
+    @property
+    def importance(self) -> MemoryImportance:
+        return self._importance
+    
+    @importance.setter
+    def importance(self, value: MemoryImportance):
+        self._check_free("importance")
+        self._importance = value
+    
+    @property
+    def timestamp(self) -> datetime:
+        return datetime.fromtimestamp(self.created)
+    
+    @timestamp.setter
+    def timestamp(self, value):
+        self.created = _epoch(value)
+    
+    @property
+    def last_accessed(self) -> datetime:
+        return datetime.fromtimestamp(self.accessed)
+    
+    @last_accessed.setter
+    def last_accessed(self, value):
+        self.accessed = _epoch(value)
+    
+    @property
+    def tags(self) -> Tuple[str, ...]:
+        return TAG_POOL.resolve(self.tag_ids)
+    
+    @tags.setter
+    def tags(self, value):
+        self._check_free("tags")
+        self.tag_ids = TAG_POOL.intern(value)
+    
+    @property
+    def context(self) -> Dict[str, Any]:
+        if self._context is None:
+            self._context = {}
+        return self._context
+    
+    @context.setter
+    def context(self, value):
+        self._context = value or None
+    
+    @property
+    def connections(self) -> Tuple[str, ...]:
+        return self._connections
+    
+    @connections.setter
+    def connections(self, value):
+        self._connections = tuple(value) if value else ()
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Field dict in the shape the old dataclass ``__dict__`` had"""
+        return {
+            "id": self.id,
+            "content": self.content,
+            "memory_type": self.memory_type,
+            "timestamp": self.timestamp,
+            "importance": self.importance,
+            "tags": list(self.tags),
+            "connections": list(self._connections),
+            "context": dict(self._context or {}),
+            "retention_score": self.retention_score,
+            "last_accessed": self.last_accessed,
+        }
+    
+    def to_row(self) -> SnapshotRow:
+        """Snapshot encoding; non-text content and the context are stored as JSON"""
+        if isinstance(self.content, str):
+            content, kind = self.content, CONTENT_TEXT
+        else:
+            content, kind = json.dumps(self.content, default=str), CONTENT_JSON
+        context = json.dumps(self._context, default=str) if self._context else None
+        return SnapshotRow(self.id, content, kind, context, _TYPE_CODES[self.memory_type], self.importance.value,
+                           self.created, self.accessed, self.retention_score, self.tags)
+    
+    @classmethod
+    def from_row(cls, row: SnapshotRow, memory_types: List["MemoryType"]) -> "MemoryNode":
+        return cls(
+            id=row.id,
+            content=json.loads(row.content) if row.content_kind == CONTENT_JSON else row.content,
+            memory_type=memory_types[row.type_code],
+            timestamp=row.created,
+            importance=MemoryImportance(row.importance),
+            tags=row.tags,
+            context=json.loads(row.context) if row.context else None,
+            retention_score=row.retention,
+            last_accessed=row.accessed,
+        )
+    
+    def _fields(self) -> tuple:
+        return (self.id, self.content, self._memory_type, self._importance, self.created, self.accessed,
+                self.tag_ids, self.retention_score, self._context or {}, self._connections)
+    
+    def __eq__(self, other) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()
+    
+    __hash__ = None  # mutable, like the dataclass it replaced
+    
+    def __repr__(self) -> str:
+        return (f"MemoryNode(id={self.id!r}, memory_type={self.memory_type}, importance={self.importance}, "
+                f"timestamp={self.timestamp!r}, tags={self.tags!r})")
 
 
 @dataclass
@@ -61,6 +246,152 @@ class MemoryQuery:
     max_results: int = 10
 
 
+def _bucket_add(buckets: Dict[Any, Any], key: Any, node_id: str):
+    """Buckets hold a bare id until a second one arrives, then an insertion-ordered dict"""
+    current = buckets.get(key)
+    if current is None:
+        buckets[key] = node_id
+    elif isinstance(current, dict):
+        current[node_id] = None
+    elif current != node_id:
+        buckets[key] = {current: None, node_id: None}
+
+
+def _bucket_remove(buckets: Dict[Any, Any], key: Any, node_id: str):
+    current = buckets.get(key)
+    if isinstance(current, dict):
+        current.pop(node_id, None)
+        if len(current) == 1:
+            buckets[key] = next(iter(current))
+        elif not current:
+            del buckets[key]
+    elif current == node_id:
+        del buckets[key]
+
+
+def _bucket_ids(bucket: Any):
+    return (bucket,) if isinstance(bucket, str) else (bucket or ())
+
+
+class TextIndex:
+    """Inverted index from content tokens to node ids.
+    
+    Tokens are the whitespace-split, lowercased content, so a query term
+    matches a node exactly when ``term in str(node.content).lower()`` would.
+    Substring lookups go through a trigram index over the vocabulary instead
+    of scanning every node.
+    """
+    
+    def __init__(self):
+        self.postings: Dict[str, Set[str]] = {}      # token -> node ids
+        self.node_tokens: Dict[str, Tuple[str, ...]] = {}  # node id -> distinct interned tokens
+        self.trigrams: Dict[str, Set[str]] = {}      # trigram -> tokens
+    
+    @staticmethod
+    def tokenize(content: Any) -> frozenset:
+        return frozenset(map(sys.intern, str(content).lower().split()))
+    
+    @staticmethod
+    def _grams(token: str) -> Set[str]:
+        return {token[i:i + 3] for i in range(len(token) - 2)}
+    
+    def add(self, node_id: str, content: Any):
+        tokens = tuple(self.tokenize(content))
+        self.node_tokens[node_id] = tokens
+        for token in tokens:
+            ids = self.postings.get(token)
+            if ids is None:
+                ids = self.postings[token] = set()
+                for gram in self._grams(token):
+                    self.trigrams.setdefault(gram, set()).add(token)
+            ids.add(node_id)
+    
+    def remove(self, node_id: str):
+        for token in self.node_tokens.pop(node_id, ()):
+            ids = self.postings.get(token)
+            if ids is None:
+                continue
+            ids.discard(node_id)
+            if not ids:
+                del self.postings[token]
+                for gram in self._grams(token):
+                    tokens = self.trigrams.get(gram)
+                    if tokens is not None:
+                        tokens.discard(token)
+                        if not tokens:
+                            del self.trigrams[gram]
+    
+    def tokens_containing(self, term: str) -> List[str]:
+        if len(term) < 3:
+            return [token for token in self.postings if term in token]
+        gram_sets = sorted((self.trigrams.get(g, set()) for g in self._grams(term)), key=len)
+        tokens = set(gram_sets[0]).intersection(*gram_sets[1:])
+        return [token for token in tokens if term in token]
+    
+    def search(self, terms: List[str]) -> Set[str]:
+        """Node ids whose content contains any of the terms."""
+        matches: Set[str] = set()
+        for term in terms:
+            for token in self.tokens_containing(term):
+                matches |= self.postings[token]
+        return matches
+
+
+class MinHashLSH:
+    """Banded MinHash over token sets.
+    
+    Nodes whose signatures agree on every row of at least one band share a
+    bucket, so near-duplicate contents are found by bucket lookup rather than
+    by comparing against every node. Buckets keep insertion order.
+    """
+    
+    PRIME = (1 << 61) - 1
+    PROBE_TOKENS = ("mist", "memory", "web")
+    
+    def __init__(self, bands: int = 16, rows: int = 2, seed: int = 1729):
+        rng = random.Random(seed)
+        self.bands = bands
+        self.rows = rows
+        self.coeffs = [(rng.randrange(1, self.PRIME), rng.randrange(self.PRIME)) for _ in range(bands * rows)]
+        self.buckets: Dict[int, Any] = {}          # band key -> bucket (see _bucket_add)
+        self.node_keys: Dict[str, array] = {}      # node id -> its band keys
+    
+    def band_keys(self, tokens) -> List[int]:
+        """One hashed key per band. Colliding keys only merge buckets, and every
+        candidate is scored anyway."""
+        if not tokens:
+            return []
+        hashes = [zlib.crc32(token.encode("utf-8")) for token in tokens]
+        prime = self.PRIME
+        signature = [min((a * h + b) % prime for h in hashes) for a, b in self.coeffs]
+        r = self.rows
+        return [hash((band, *signature[band * r:(band + 1) * r])) for band in range(self.bands)]
+    
+    def fingerprint(self) -> List[int]:
+        """Keys for a fixed token set; stored keys are only reusable while this matches"""
+        return self.band_keys(self.PROBE_TOKENS)
+    
+    def add(self, node_id: str, tokens):
+        self.add_keys(node_id, self.band_keys(tokens))
+    
+    def add_keys(self, node_id: str, keys: List[int]):
+        # Re-adding an id moves it to the end of its buckets rather than leaving a stale entry
+        if node_id in self.node_keys:
+            self.remove(node_id)
+        if keys:
+            self.node_keys[node_id] = array("q", keys)
+        for key in keys:
+            _bucket_add(self.buckets, key, node_id)
+    
+    def remove(self, node_id: str):
+        for key in self.node_keys.pop(node_id, ()):
+            _bucket_remove(self.buckets, key, node_id)
+    
+    def candidate_lists(self, node_id: str) -> List[Any]:
+        buckets = self.buckets
+        return [_bucket_ids(buckets[key]) for key in self.node_keys.get(node_id, ()) if key in buckets]
+
+
 class MemoryConsolidator:
     """Handles memory consolidation and transfer between short-term and long-term"""
     
@@ -87,7 +418,7 @@ class MemoryConsolidator:
                     memory_type=MemoryType.KNOWLEDGE,
                     timestamp=datetime.now(),
                     importance=MemoryImportance.CRITICAL,
-                    tags=["consolidated", "summary"] + node.tags,
+                    tags=["consolidated", "summary", *node.tags],
                     context={**node.context, "original_id": node.id, "consolidation_date": datetime.now().isoformat()},
                     retention_score=min(1.0, node.retention_score + 0.3)
                 )
@@ -103,6 +434,11 @@ class AssociativeLinker:
     def __init__(self):
         self.similarity_threshold = 0.7
         self.max_connections_per_node = 10
+        self.tag_weight = 0.4
+        self.type_weight = 0.3
+        self.content_weight = 0.3
+        # Tag postings up to this size are scanned in full when gathering link candidates
+        self.exhaustive_posting_limit = 256
     
     def find_similar_nodes(self, target_node: MemoryNode, candidates: List[MemoryNode]) -> List[str]:
         """Find nodes similar to the target node"""
@@ -124,30 +460,43 @@ class AssociativeLinker:
     
     def calculate_similarity(self, node1: MemoryNode, node2: MemoryNode) -> float:
         """Calculate similarity between two memory nodes"""
+        return self.score(node1.tag_ids, node1.memory_type, TextIndex.tokenize(node1.content),
+                          node2.tag_ids, node2.memory_type, TextIndex.tokenize(node2.content))
+    
+    def score(self, tags1: Tuple[int, ...], type1: MemoryType, words1: Set[str],
+              tags2: Tuple[int, ...], type2: MemoryType, words2) -> float:
+        """Similarity from pre-tokenized content (see TextIndex.node_tokens)"""
         score = 0.0
         
         # Tag overlap contributes to similarity
-        if node1.tags and node2.tags:
-            common_tags = set(node1.tags) & set(node2.tags)
-            tag_overlap = len(common_tags) / max(len(node1.tags), len(node2.tags))
-            score += tag_overlap * 0.4
+        if tags1 and tags2:
+            common_tags = set(tags1) & set(tags2)
+            tag_overlap = len(common_tags) / max(len(tags1), len(tags2))
+            score += tag_overlap * self.tag_weight
         
         # Type matching contributes to similarity
-        if node1.memory_type == node2.memory_type:
-            score += 0.3
-        
-        # Content similarity (basic string comparison)
-        content1 = str(node1.content).lower()
-        content2 = str(node2.content).lower()
+        if type1 == type2:
+            score += self.type_weight
         
         # Simple word overlap
-        words1 = set(content1.split())
-        words2 = set(content2.split())
         if words1 and words2:
-            word_overlap = len(words1 & words2) / max(len(words1), len(words2))
-            score += word_overlap * 0.3
+            # words2 may be any collection of distinct tokens (TextIndex keeps tuples)
+            word_overlap = sum(1 for word in words2 if word in words1) / max(len(words1), len(words2))
+            score += word_overlap * self.content_weight
         
         return min(1.0, score)
+    
+    def candidate_sources(self) -> Tuple[bool, bool]:
+        """Which overlaps a node must have with the target to be able to reach the threshold.
+        
+        Returns (tags_suffice, words_suffice): a candidate sharing neither a tag
+        nor a word scores at most type_weight, and one sharing no tag scores at
+        most type_weight + content_weight.
+        """
+        if self.type_weight >= self.similarity_threshold:
+            return False, False  # type alone can qualify; no index can narrow this
+        words_possible = self.type_weight + self.content_weight >= self.similarity_threshold
+        return True, words_possible
 
 
 class MemoryPruner:
@@ -166,7 +515,7 @@ class MemoryPruner:
             # Check retention score
             if node.retention_score < self.retention_threshold:
                 # Apply time decay
-                days_since_creation = (datetime.now() - node.timestamp).days
+                days_since_creation = int((time.time() - node.created) // 86400)
                 decayed_score = node.retention_score - (days_since_creation * self.time_decay_factor)
                 
                 if decayed_score < self.retention_threshold:
@@ -189,12 +538,28 @@ class MemoryPruner:
             pruned_connections[node_id] = strong_connections
         
         return pruned_connections
+    
+    def prune_weak_edges(self, adjacency: Dict[str, Dict[str, float]]) -> List[Tuple[str, str]]:
+        """Drop edges below min_connection_strength in place (strengths are symmetric)
+        
+        Returns the removed (node_id, connected_id) pairs, one per direction.
+        """
+        removed = []
+        for node_id in list(adjacency):
+            neighbours = adjacency[node_id]
+            for connected_id in [nid for nid, strength in neighbours.items() if strength < self.min_connection_strength]:
+                del neighbours[connected_id]
+                removed.append((node_id, connected_id))
+            if not neighbours:
+                del adjacency[node_id]
+        return removed
 
 
 class MemoryWeb:
     """Main class for the distributed memory system"""
     
-    def __init__(self, hub: CoreHub, visual_companion: VisualCompanion = None, voice_synthesizer: VoiceSynthesizer = None):
+    def __init__(self, hub: CoreHub, visual_companion: VisualCompanion = None, voice_synthesizer: VoiceSynthesizer = None,
+                 snapshot_path: str = None):
         self.hub = hub
         self.visual_companion = visual_companion
         self.voice_synthesizer = voice_synthesizer
@@ -204,17 +569,22 @@ class MemoryWeb:
         
         # Initialize memory components
         self.nodes: Dict[str, MemoryNode] = {}
-        self.type_index: Dict[MemoryType, List[str]] = {mt: [] for mt in MemoryType}
-        self.tag_index: Dict[str, List[str]] = {}
-        self.connections: Dict[str, List[str]] = {}
-        self.connection_strengths: Dict[str, Dict[str, float]] = {}  # {node_id: {connected_id: strength}}
+        # {node_id: {connected_id: strength}}, both directions; nodes without edges have no entry
+        self.adjacency: Dict[str, Dict[str, float]] = {}
+        self._reset_indexes()
+        
+        # Persistence: a memory-mapped snapshot plus an append segment of later changes
+        self.snapshot_path = snapshot_path
+        self.merge_threshold = SEGMENT_MERGE_THRESHOLD
+        self._snapshot: Optional[MemorySnapshot] = None
+        self._segment: Optional[SegmentLog] = None
         
         # Memory management components
         self.consolidator = MemoryConsolidator()
         self.associative_linker = AssociativeLinker()
         self.pruner = MemoryPruner()
         
-        # State tracking
+        # State tracking (total_connections is filled in from the adjacency by get_stats)
         self.stats = {
             "total_nodes": 0,
             "daily_nodes": 0,
@@ -234,6 +604,47 @@ class MemoryWeb:
         self.hub.event_coord.register_event_handler("retrieve_memory", self.on_retrieve_memory)
         self.hub.event_coord.register_event_handler("context_update", self.on_context_update)
         self.hub.event_coord.register_event_handler("system_maintenance", self.on_maintenance)
+        
+        if snapshot_path:
+            if os.path.exists(snapshot_path):
+                self.load_snapshot(snapshot_path)
+            else:
+                os.makedirs(os.path.dirname(os.path.abspath(snapshot_path)), exist_ok=True)
+                self.save_snapshot(snapshot_path)
+    
+    def _reset_indexes(self):
+        """Empty every index derived from self.nodes"""
+        self.type_index: Dict[MemoryType, Set[str]] = {mt: set() for mt in MemoryType}
+        self.tag_index: Dict[str, Dict[str, None]] = {}  # tag -> node ids in insertion order
+        self.text_index = TextIndex()
+        self.insertion_order: Dict[str, int] = {}  # node id -> sequence, for deterministic linking
+        # node id -> (memory_type, importance, tag_ids, created) as indexed, so removal
+        # finds the entries even if the node's attributes were changed in the meantime
+        self.indexed_as: Dict[str, Tuple[MemoryType, MemoryImportance, Tuple[int, ...], float]] = {}
+        self._next_seq = 0
+        # Candidate buckets for associative linking (see link_candidates)
+        self.tagset_index: Dict[Tuple[MemoryType, frozenset], Any] = {}
+        self.content_lsh = MinHashLSH()
+        # Per importance level, epoch timestamps (sorted) and the matching node ids, for range scans and recency ranking
+        self.time_index: Dict[MemoryImportance, Tuple[array, List[str]]] = {mi: (array("d"), []) for mi in MemoryImportance}
+        # False after a snapshot load until the first call that needs the indexes
+        self._indexed = True
+    
+    def _ensure_indexed(self):
+        """Build the indexes from self.nodes if a snapshot load deferred them"""
+        if self._indexed:
+            return
+        self._indexed = True
+        nodes = self.nodes
+        if not isinstance(nodes, SnapshotNodes):
+            for node in nodes.values():
+                self._index_node(node)
+            return
+        # Reuse the snapshot's band keys rather than re-hashing every content
+        snapshot = nodes.snapshot
+        stored_keys = snapshot.band_probe == self.content_lsh.fingerprint()
+        for node_id, row, node in nodes.entries():
+            self._index_node(node, snapshot.band_keys(row) if stored_keys and row is not None else None)
     
     def create_memory_node(self, content: Any, memory_type: MemoryType, importance: MemoryImportance, tags: List[str] = None, context: Dict[str, Any] = None) -> MemoryNode:
         """Create a new memory node"""
@@ -253,120 +664,198 @@ class MemoryWeb:
         return node
     
     def add_node(self, node: MemoryNode):
-        """Add a node to the memory web"""
+        """Add a node to the memory web (replacing any node with the same id)"""
+        previous = self.nodes.get(node.id)
+        if previous is not None:
+            # The replacement is indexed as the newest node, so buckets stay in insertion order
+            if self._indexed:
+                self._unindex_node(previous)
+            self._count_node(previous, -1)
+            previous._in_web = False
+        node._in_web = True
         self.nodes[node.id] = node
+        if self._indexed:
+            self._index_node(node)
+        
+        # Update stats
+        self._count_node(node, 1)
+        
+        self._log(["add", list(node.to_row())])
+    
+    def _count_node(self, node: MemoryNode, delta: int):
+        self.stats["total_nodes"] += delta
+        if node.memory_type in [MemoryType.INTERACTION, MemoryType.EMOTIONAL]:
+            self.stats["daily_nodes"] += delta
+        else:
+            self.stats["wisdom_nodes"] += delta
+    
+    def _index_node(self, node: MemoryNode, band_keys: List[int] = None):
+        if node.id not in self.insertion_order:
+            self.insertion_order[node.id] = self._next_seq
+            self._next_seq += 1
+        self.indexed_as[node.id] = (node.memory_type, node.importance, node.tag_ids, node.created)
         
         # Update indexes
-        self.type_index[node.memory_type].append(node.id)
+        self.type_index[node.memory_type].add(node.id)
         
         for tag in node.tags:
             if tag not in self.tag_index:
-                self.tag_index[tag] = []
-            if node.id not in self.tag_index[tag]:
-                self.tag_index[tag].append(node.id)
-        
-        # Initialize connections for this node
-        if node.id not in self.connections:
-            self.connections[node.id] = []
+                self.tag_index[tag] = {}
+            self.tag_index[tag][node.id] = None
         
-        # Update stats
-        self.stats["total_nodes"] += 1
-        if node.memory_type in [MemoryType.INTERACTION, MemoryType.EMOTIONAL]:
-            self.stats["daily_nodes"] += 1
+        self.text_index.add(node.id, node.content)
+        if band_keys is None:
+            self.content_lsh.add(node.id, self.text_index.node_tokens[node.id])
         else:
-            self.stats["wisdom_nodes"] += 1
+            self.content_lsh.add_keys(node.id, band_keys)
+        _bucket_add(self.tagset_index, (node.memory_type, frozenset(node.tag_ids)), node.id)
+        times, ids = self.time_index[node.importance]
+        pos = bisect.bisect_right(times, node.created)
+        times.insert(pos, node.created)
+        ids.insert(pos, node.id)
     
     def connect_nodes(self, node1_id: str, node2_id: str, strength: float = 0.5):
         """Create a connection between two nodes"""
         if node1_id in self.nodes and node2_id in self.nodes:
-            # Add bidirectional connection
-            if node2_id not in self.connections[node1_id]:
-                self.connections[node1_id].append(node2_id)
-            if node1_id not in self.connections[node2_id]:
-                self.connections[node2_id].append(node1_id)
-            
-            # Update connection strengths
-            if node1_id not in self.connection_strengths:
-                self.connection_strengths[node1_id] = {}
-            if node2_id not in self.connection_strengths:
-                self.connection_strengths[node2_id] = {}
-            
-            self.connection_strengths[node1_id][node2_id] = strength
-            self.connection_strengths[node2_id][node1_id] = strength
-            
-            # Update stats
-            self.stats["total_connections"] += 1
+            # Add bidirectional connection with its strength
+            adjacency = self.adjacency
+            if node1_id not in adjacency:
+                adjacency[node1_id] = {}
+            if node2_id not in adjacency:
+                adjacency[node2_id] = {}
+            adjacency[node1_id][node2_id] = strength
+            adjacency[node2_id][node1_id] = strength
+            self._log(["link", node1_id, node2_id, strength])
+    
+    def disconnect_nodes(self, node1_id: str, node2_id: str):
+        """Remove the connection between two nodes, if any"""
+        for a, b in ((node1_id, node2_id), (node2_id, node1_id)):
+            neighbours = self.adjacency.get(a)
+            if neighbours is not None and b in neighbours:
+                del neighbours[b]
+                if not neighbours:
+                    del self.adjacency[a]
+        self._log(["unlink", node1_id, node2_id])
+    
+    def update_node(self, node_id: str, importance: MemoryImportance = None, retention_score: float = None,
+                    tags: List[str] = None, memory_type: MemoryType = None) -> MemoryNode:
+        """Change a node's importance, retention score, tags or memory type.
+        
+        Goes through the web (the node refuses direct assignment of the
+        indexed fields) so the indexes and stats stay in step and the change
+        reaches the segment log.
+        """
+        node = self.nodes[node_id]
+        changes = {}
+        if memory_type is not None:
+            changes["memory_type"] = memory_type.value
+        if importance is not None:
+            changes["importance"] = importance.value
+        if retention_score is not None:
+            changes["retention_score"] = retention_score
+        if tags is not None:
+            changes["tags"] = list(tags)
+        if not changes:
+            return node
+        
+        reindex = self._indexed and changes.keys() & {"memory_type", "importance", "tags"}
+        if reindex:
+            self._unindex_node(node)
+        if memory_type is not None:
+            self._count_node(node, -1)
+            node._memory_type = memory_type
+            self._count_node(node, 1)
+        if importance is not None:
+            node._importance = importance
+        if retention_score is not None:
+            node.retention_score = retention_score
+        if tags is not None:
+            node.tag_ids = TAG_POOL.intern(tags)
+        if reindex:
+            self._index_node(node)
+        self._log(["update", node_id, changes])
+        return node
+    
+    def connection_count(self) -> int:
+        """Connections in the web, counted from the adjacency"""
+        adjacency = self.adjacency
+        if isinstance(adjacency, SnapshotEdges):
+            half_edges = adjacency.half_edge_count()
+        else:
+            half_edges = sum(len(neighbours) for neighbours in adjacency.values())
+        return half_edges // 2
+    
+    def get_stats(self) -> Dict[str, int]:
+        """Node counts plus the current connection count"""
+        self.stats["total_connections"] = self.connection_count()
+        return self.stats
+    
+    @property
+    def connections(self) -> MappingProxyType:
+        """Read-only adjacency lists, built on demand from ``adjacency``.
+        
+        Use connect_nodes() / remove_node() to change the graph.
+        """
+        return MappingProxyType({node_id: tuple(self.adjacency.get(node_id, ())) for node_id in self.nodes})
+    
+    @property
+    def connection_strengths(self) -> Dict[str, Dict[str, float]]:
+        return self.adjacency
     
     def find_related_nodes(self, query: MemoryQuery) -> List[MemoryNode]:
         """Find nodes matching the query"""
-        candidates = set()
+        self._ensure_indexed()
+        levels = [mi for mi in MemoryImportance if mi.value >= query.importance_threshold.value]
+        filters: List[Set[str]] = []
         
         # Filter by memory types if specified
         if query.memory_types:
-            for mem_type in query.memory_types:
-                candidates.update(self.type_index.get(mem_type, []))
-        else:
-            # Include all nodes
-            candidates.update(self.nodes.keys())
+            filters.append(set().union(*(self.type_index.get(mt, ()) for mt in query.memory_types)))
         
-        # Filter by time range if specified
-        if query.time_range:
-            start_time, end_time = query.time_range
-            filtered_candidates = set()
-            for node_id in candidates:
-                node = self.nodes[node_id]
-                if start_time <= node.timestamp <= end_time:
-                    filtered_candidates.add(node_id)
-            candidates = filtered_candidates
-        
-        # Filter by tags if specified
+        # Filter by tags if specified (a node matches if it carries any of them)
         if query.tags:
-            tag_matches = set()
-            for tag in query.tags:
-                if tag in self.tag_index:
-                    tag_matches.update(self.tag_index[tag])
-            # Intersection: nodes must have ALL specified tags
-            candidates = candidates.intersection(tag_matches)
-        
-        # Filter by importance threshold
-        importance_filtered = set()
-        for node_id in candidates:
-            node = self.nodes[node_id]
-            if node.importance.value >= query.importance_threshold.value:
-                importance_filtered.add(node_id)
-        candidates = importance_filtered
+            filters.append(set().union(*(self.tag_index.get(tag, ()) for tag in query.tags)))
         
-        # Apply text search if specified
+        # Apply text search if specified: any search term appearing in the content
         if query.text_query:
-            text_filtered = set()
-            search_terms = query.text_query.lower().split()
-            for node_id in candidates:
-                node = self.nodes[node_id]
-                content_str = str(node.content).lower()
-                # Check if any search term is in the content
-                if any(term in content_str for term in search_terms):
-                    text_filtered.add(node_id)
-            candidates = text_filtered
-        
-        # Convert to list and sort by relevance (importance + recency)
-        result_nodes = []
-        for node_id in candidates:
+            filters.append(self.text_index.search(query.text_query.lower().split()))
+        
+        # Filter by time range if specified
+        if query.time_range:
+            start_time, end_time = (_epoch(t) for t in query.time_range)
+            in_range = set()
+            for level in levels:
+                times, ids = self.time_index[level]
+                in_range.update(ids[bisect.bisect_left(times, start_time):bisect.bisect_right(times, end_time)])
+            filters.append(in_range)
+        
+        now = time.time()
+        
+        def relevance(node_id: str) -> float:
+            # Relevance is importance minus 0.1 per day of age
             node = self.nodes[node_id]
-            # Calculate relevance score based on importance and recency
-            time_diff = (datetime.now() - node.timestamp).total_seconds()
-            relevance_score = node.importance.value - (time_diff / 86400) * 0.1  # Reduce score for older memories
-            result_nodes.append((node, relevance_score))
+            return node.importance.value - ((now - node.created) / 86400) * 0.1
+        
+        if filters:
+            # Intersect smallest posting list first
+            filters.sort(key=len)
+            candidates = filters[0].intersection(*filters[1:])
+            threshold = query.importance_threshold.value
+            nodes = self.nodes
+            candidates = [nid for nid in candidates if nid in nodes and nodes[nid].importance.value >= threshold]
+        else:
+            # Within a level relevance only falls with age, so the overall top K
+            # is among the K newest nodes of each qualifying level.
+            candidates = [node_id for level in levels
+                          for node_id in self.time_index[level][1][-query.max_results:]
+                          if node_id in self.nodes] if query.max_results > 0 else []
         
-        # Sort by relevance and return top results
-        result_nodes.sort(key=lambda x: x[1], reverse=True)
-        return [node for node, score in result_nodes[:query.max_results]]
+        top_ids = heapq.nlargest(max(query.max_results, 0), candidates, key=relevance)
+        return [self.nodes[node_id] for node_id in top_ids]
     
     def get_node_connections(self, node_id: str) -> List[MemoryNode]:
         """Get all nodes connected to a specific node"""
-        if node_id not in self.connections:
-            return []
-        
-        connected_ids = self.connections[node_id]
+        connected_ids = self.adjacency.get(node_id, ())
         return [self.nodes[nid] for nid in connected_ids if nid in self.nodes]
     
     async def handle_message(self, message: Message):
@@ -386,7 +875,7 @@ class MemoryWeb:
                 destination=message.source,
                 content={
                     "type": "memory_results",
-                    "results": [node.__dict__ for node in results],
+                    "results": [node.to_dict() for node in results],
                     "count": len(results)
                 },
                 context={"response_to": message.id}
@@ -401,7 +890,7 @@ class MemoryWeb:
                 destination=message.source,
                 content={
                     "type": "memory_stats",
-                    "stats": self.stats
+                    "stats": self.get_stats()
                 },
                 context={"response_to": message.id}
             )
@@ -463,7 +952,7 @@ class MemoryWeb:
                 destination=source,
                 content={
                     "type": "memory_retrieved",
-                    "results": [node.__dict__ for node in results],
+                    "results": [node.to_dict() for node in results],
                     "count": len(results),
                     "query": query_data
                 }
@@ -473,20 +962,25 @@ class MemoryWeb:
     async def on_context_update(self, event_type: str, data: Any):
         """Handle context updates that might affect memory"""
         if data and isinstance(data, dict):
-            # Update context in recent memory nodes
-            for node_id in list(self.nodes.keys()):
-                node = self.nodes[node_id]
-                # Update context for recent nodes (last hour)
-                if (datetime.now() - node.timestamp).total_seconds() < 3600:
+            # Update context in recent memory nodes (last hour)
+            self._ensure_indexed()
+            cutoff = time.time() - 3600
+            for times, ids in self.time_index.values():
+                for node_id in ids[bisect.bisect_right(times, cutoff):]:
+                    if node_id not in self.nodes:
+                        continue
+                    node = self.nodes[node_id]
                     node.context.update(data)
+                    self._log(["context", node_id, node.context])
     
     async def on_maintenance(self, event_type: str, data: Any):
         """Handle system maintenance tasks"""
+        self._ensure_indexed()
         # Perform memory consolidation if needed
         if self.consolidator.should_consolidate():
             # Get daily nodes (interactions and emotional)
-            daily_node_ids = (self.type_index.get(MemoryType.INTERACTION, []) + 
-                              self.type_index.get(MemoryType.EMOTIONAL, []))
+            daily_node_ids = (self.type_index.get(MemoryType.INTERACTION, set()) | 
+                              self.type_index.get(MemoryType.EMOTIONAL, set()))
             
             daily_nodes = [self.nodes[nid] for nid in daily_node_ids if nid in self.nodes]
             consolidated_nodes = self.consolidator.consolidate_daily_to_wisdom(daily_nodes)
@@ -496,68 +990,144 @@ class MemoryWeb:
                 self.add_node(node)
         
         # Perform pruning
-        nodes_to_remove = self.pruner.evaluate_for_pruning(list(self.nodes.values()), self.connections)
+        nodes_to_remove = self.pruner.evaluate_for_pruning(list(self.nodes.values()), self.adjacency)
         for node_id in nodes_to_remove:
             await self.remove_node(node_id)
         
-        # Prune weak connections
-        self.connections = self.pruner.prune_weak_connections(self.connections, self.connection_strengths)
+        # Prune weak connections (logged so a replay doesn't bring them back)
+        for node_id, connected_id in self.pruner.prune_weak_edges(self.adjacency):
+            if node_id <= connected_id:
+                self._log(["unlink", node_id, connected_id])
+        
+        # Fold the append segment into a fresh snapshot once it has grown large
+        if self.snapshot_path:
+            self.merge_segments()
+    
+    def link_candidates(self, node: MemoryNode) -> Iterator[str]:
+        """Ids that could score above the linker threshold, in insertion order.
+        
+        With the default weights a link needs at least one shared tag, and a
+        shared tag only gets there alongside the same type and either the same
+        tag set or heavy word overlap. Candidates therefore come from:
+        - the node's (type, tag set) bucket
+        - its MinHash buckets over content tokens
+        - any of its tag postings small enough to check exhaustively
+        Exhaustive tag postings make this exact for small webs. Past that,
+        partial-tag matches depend on the LSH, so cost per ingest stays flat.
+        """
+        self._ensure_indexed()
+        via_tags, via_words = self.associative_linker.candidate_sources()
+        order = self.insertion_order
+        if not via_tags:
+            ids: Iterator[str] = iter(list(self.nodes))
+        elif via_words:
+            pool = set().union(*(self.tag_index.get(tag, ()) for tag in set(node.tags)))
+            postings = self.text_index.postings
+            pool.update(*(postings.get(token, ()) for token in self.text_index.node_tokens.get(node.id, ())))
+            ids = iter(sorted(pool, key=lambda nid: order.get(nid, 0)))
+        else:
+            if not node.tag_ids:
+                return
+            lists = [_bucket_ids(self.tagset_index.get((node.memory_type, frozenset(node.tag_ids))))]
+            lists.extend(self.content_lsh.candidate_lists(node.id))
+            for tag in set(node.tags):
+                posting = self.tag_index.get(tag)
+                if posting and len(posting) <= self.associative_linker.exhaustive_posting_limit:
+                    lists.append(posting)
+            ids = heapq.merge(*lists, key=lambda nid: order.get(nid, 0))
+        
+        last = None
+        for node_id in ids:
+            if node_id != last and node_id != node.id:
+                yield node_id
+            last = node_id
     
     async def create_associative_links(self, new_node: MemoryNode):
         """Create associative links for a new node"""
-        # Find similar nodes to connect to
-        all_nodes = list(self.nodes.values())
-        
-        # Don't include the new node in the search (it's not yet in the main nodes dict properly)
-        other_nodes = [node for node in all_nodes if node.id != new_node.id]
+        self._ensure_indexed()
+        linker = self.associative_linker
+        node_tokens = self.text_index.node_tokens
+        words = frozenset(node_tokens[new_node.id]) if new_node.id in node_tokens else TextIndex.tokenize(new_node.content)
         
-        similar_node_ids = self.associative_linker.find_similar_nodes(new_node, other_nodes)
+        links = []
+        for candidate_id in self.link_candidates(new_node):
+            if candidate_id not in self.nodes:
+                continue
+            candidate = self.nodes[candidate_id]
+            strength = linker.score(new_node.tag_ids, new_node.memory_type, words,
+                                    candidate.tag_ids, candidate.memory_type, node_tokens[candidate_id])
+            if strength >= linker.similarity_threshold:
+                links.append((candidate_id, strength))
+                # Limit connections per node
+                if len(links) >= linker.max_connections_per_node:
+                    break
         
-        for similar_id in similar_node_ids:
-            # Calculate connection strength
-            similar_node = self.nodes[similar_id]
-            strength = self.associative_linker.calculate_similarity(new_node, similar_node)
-            
+        for similar_id, strength in links:
             # Create the connection
             self.connect_nodes(new_node.id, similar_id, strength)
     
     async def remove_node(self, node_id: str):
         """Remove a node and its connections"""
+        self._drop_node(node_id)
+    
+    def _drop_node(self, node_id: str):
         if node_id in self.nodes:
             node = self.nodes[node_id]
-            
-            # Remove from type index
-            if node_id in self.type_index[node.memory_type]:
-                self.type_index[node.memory_type].remove(node_id)
-            
-            # Remove from tag indices
-            for tag in node.tags:
-                if tag in self.tag_index and node_id in self.tag_index[tag]:
-                    self.tag_index[tag].remove(node_id)
+            if self._indexed:
+                self._unindex_node(node)
             
             # Remove from connections
-            if node_id in self.connections:
-                connected_nodes = self.connections[node_id]
-                for connected_id in connected_nodes:
-                    if connected_id in self.connections:
-                        if node_id in self.connections[connected_id]:
-                            self.connections[connected_id].remove(node_id)
-                del self.connections[node_id]
+            for connected_id in self.adjacency.pop(node_id, ()):
+                neighbours = self.adjacency.get(connected_id)
+                if neighbours is not None:
+                    neighbours.pop(node_id, None)
+                    if not neighbours:
+                        del self.adjacency[connected_id]
             
             # Remove from main dict
             del self.nodes[node_id]
+            node._in_web = False
             
             # Update stats
-            self.stats["total_nodes"] -= 1
-            if node.memory_type in [MemoryType.INTERACTION, MemoryType.EMOTIONAL]:
-                self.stats["daily_nodes"] -= 1
-            else:
-                self.stats["wisdom_nodes"] -= 1
+            self._count_node(node, -1)
+            
+            self._log(["del", node_id])
+    
+    def _unindex_node(self, node: MemoryNode):
+        node_id = node.id
+        # Use the values the node was indexed under, not its current ones
+        memory_type, importance, tag_ids, created = self.indexed_as.pop(
+            node_id, (node.memory_type, node.importance, node.tag_ids, node.created))
+        
+        # Remove from type index
+        self.type_index[memory_type].discard(node_id)
+        
+        # Remove from tag indices
+        for tag in TAG_POOL.resolve(tag_ids):
+            if tag in self.tag_index:
+                self.tag_index[tag].pop(node_id, None)
+                if not self.tag_index[tag]:
+                    del self.tag_index[tag]
+        
+        # Remove from text, time and linking indexes
+        self.text_index.remove(node_id)
+        self.content_lsh.remove(node_id)
+        _bucket_remove(self.tagset_index, (memory_type, frozenset(tag_ids)), node_id)
+        times, ids = self.time_index[importance]
+        pos = bisect.bisect_left(times, created)
+        while pos < len(ids) and times[pos] == created:
+            if ids[pos] == node_id:
+                del times[pos]
+                del ids[pos]
+                break
+            pos += 1
+        self.insertion_order.pop(node_id, None)
     
     def get_memory_network_stats(self) -> Dict[str, Any]:
         """Get statistics about the memory network"""
+        self._ensure_indexed()
         total_possible_connections = len(self.nodes) * (len(self.nodes) - 1) / 2
-        actual_connections = sum(len(conns) for conns in self.connections.values()) // 2  # Divide by 2 for bidirectional
+        actual_connections = self.connection_count()
         
         avg_connections_per_node = actual_connections / len(self.nodes) if self.nodes else 0
         
@@ -568,10 +1138,140 @@ class MemoryWeb:
             "network_density": actual_connections / total_possible_connections if total_possible_connections > 0 else 0,
             "node_distribution": {str(mt): len(ids) for mt, ids in self.type_index.items()},
             "tag_count": len(self.tag_index),
-            "latest_node_timestamp": max((node.timestamp for node in self.nodes.values()), default=None),
-            "oldest_node_timestamp": min((node.timestamp for node in self.nodes.values()), default=None)
+            "latest_node_timestamp": self._edge_timestamp(max),
+            "oldest_node_timestamp": self._edge_timestamp(min)
         }
     
+    def _edge_timestamp(self, pick) -> Optional[datetime]:
+        ends = [times[-1 if pick is max else 0] for times, _ in self.time_index.values() if times]
+        return datetime.fromtimestamp(pick(ends)) if ends else None
+    
+    # -- persistence -----------------------------------------------------------
+    
+    def _log(self, op: list):
+        if self._segment is not None:
+            self._segment.append(op)
+    
+    def save_snapshot(self, path: str = None):
+        """Write the whole web to a snapshot and log later changes to its append segment"""
+        path = path or self.snapshot_path
+        self._ensure_indexed()
+        nodes = dict(self.nodes.items())
+        adjacency = dict(self.adjacency.items())
+        rows = []
+        row_of: Dict[str, int] = {}
+        for node_id, node in nodes.items():
+            row_of[node_id] = len(rows)
+            rows.append(node.to_row())
+        edges = [[(row_of[connected_id], strength) for connected_id, strength in adjacency.get(node_id, {}).items()
+                  if connected_id in row_of] for node_id in nodes]
+        node_keys = self.content_lsh.node_keys
+        band_keys = [node_keys.get(node_id, ()) for node_id in nodes]
+        
+        # Everything is in memory now, so the old mapping can go before the file is replaced
+        self._close_snapshot()
+        write_snapshot(path, rows, edges, [mt.value for mt in MemoryType], band_keys, self.content_lsh.fingerprint())
+        self.nodes, self.adjacency = nodes, adjacency
+        
+        if self._segment is not None and self._segment.path != path + SEGMENT_SUFFIX:
+            self._segment.close()
+            self._segment = None
+        if self._segment is None:
+            self._segment = SegmentLog(path + SEGMENT_SUFFIX)
+        self._segment.reset()
+        self.snapshot_path = path
+    
+    def merge_segments(self, force: bool = False) -> bool:
+        """Fold the append segment into a fresh snapshot.
+        
+        Rewriting the snapshot costs time proportional to the whole web, so
+        unless forced this only happens once the segment holds at least
+        ``merge_threshold`` ops; until then changes replay from the segment.
+        """
+        if not force and self._segment is not None and self._segment.pending < self.merge_threshold:
+            return False
+        self.save_snapshot(self.snapshot_path)
+        return True
+    
+    def load_snapshot(self, path: str = None):
+        """Serve the web from a snapshot file.
+        
+        Only the header is read here: nodes and edges come out of the mapping
+        on first access, the segment is replayed on top, and the indexes are
+        rebuilt the first time a query or link needs them.
+        """
+        path = path or self.snapshot_path
+        snapshot = MemorySnapshot(path)
+        memory_types = [MemoryType(name) for name in snapshot.type_names]
+        
+        self._close_snapshot()
+        if self._segment is not None:
+            self._segment.close()
+            self._segment = None
+        self._snapshot = snapshot
+        self.snapshot_path = path
+        self.nodes = SnapshotNodes(snapshot, lambda snap, row: self._adopt(MemoryNode.from_row(snap.row(row), memory_types)))
+        self.adjacency = SnapshotEdges(snapshot)
+        self._reset_indexes()
+        self._indexed = False
+        
+        segment = SegmentLog(path + SEGMENT_SUFFIX)
+        for op in segment.replay():
+            self._apply_segment(op)
+        self._segment = segment
+        self._recount_stats()
+    
+    @staticmethod
+    def _adopt(node: MemoryNode) -> MemoryNode:
+        node._in_web = True
+        return node
+    
+    def _apply_segment(self, op: list):
+        kind = op[0]
+        if kind == "add":
+            self.add_node(MemoryNode.from_row(SnapshotRow(*op[1]), list(MemoryType)))
+        elif kind == "del":
+            self._drop_node(op[1])
+        elif kind == "link":
+            self.connect_nodes(op[1], op[2], op[3])
+        elif kind == "unlink":
+            self.disconnect_nodes(op[1], op[2])
+        elif kind == "update" and op[1] in self.nodes:
+            changes = dict(op[2])
+            if "importance" in changes:
+                changes["importance"] = MemoryImportance(changes["importance"])
+            if "memory_type" in changes:
+                changes["memory_type"] = MemoryType(changes["memory_type"])
+            self.update_node(op[1], **changes)
+        elif kind == "context" and op[1] in self.nodes:
+            self.nodes[op[1]].context = op[2]
+    
+    def _recount_stats(self):
+        counts = {mt: 0 for mt in MemoryType}
+        nodes = self.nodes
+        if isinstance(nodes, SnapshotNodes):
+            snapshot = nodes.snapshot
+            memory_types = [MemoryType(name) for name in snapshot.type_names]
+            for code, memory_type in enumerate(memory_types):
+                counts[memory_type] += snapshot.type_count(code)
+            for node_id in nodes.deleted:
+                counts[memory_types[snapshot.type_code(snapshot.index_of(node_id))]] -= 1
+            extra = (nodes.live[node_id] for node_id in nodes.added)
+        else:
+            extra = nodes.values()
+        for node in extra:
+            counts[node.memory_type] += 1
+        
+        daily = counts[MemoryType.INTERACTION] + counts[MemoryType.EMOTIONAL]
+        self.stats["total_nodes"] = sum(counts.values())
+        self.stats["daily_nodes"] = daily
+        self.stats["wisdom_nodes"] = self.stats["total_nodes"] - daily
+    
+    def _close_snapshot(self):
+        if self._snapshot is not None:
+            self._snapshot.close()
+            self._snapshot = None
+    
     async def update_loop(self):
         """Main update loop for the memory web"""
         while self.active:
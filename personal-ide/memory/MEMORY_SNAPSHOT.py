@@ -0,0 +1,503 @@
+"""
+Memory Snapshot for MIST Companion Intelligence
+Memory-mapped persistence for the memory web
+
+A snapshot is one little-endian binary file; every section is 8-byte aligned:
+    header        magic, version, node count and an (offset, length) per section
+    strings       utf-8 blob plus u64 offsets (ids, contents, contexts, names)
+    nodes         fixed-size records in insertion order
+    node_tags     u32 tag numbers referenced by the node records
+    edges         CSR adjacency: u64 row offsets, u32 target rows, f64 strengths
+    id_order      u32 rows sorted by id, for binary-search lookup
+    tags, types   name tables and CSR postings of rows per tag and per type
+    bands         optional per-row LSH band keys, with the keys of a probe token
+                  set so a reader can tell whether they still match its hashing
+
+Opening a snapshot decodes nothing but the header; rows are read out of the
+mapping when asked for. Changes made afterwards go to an append segment
+(JSON lines beside the snapshot) until they are merged into a fresh file.
+"""
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+
+MAGIC = b"MWSNAP\x00\x00"
+VERSION = 1
+SEGMENT_SUFFIX = ".seg"
+
+# Section name -> array typecode (None: raw bytes)
+SECTIONS = (
+    ("string_offsets", "Q"), ("strings", None), ("nodes", None), ("node_tags", "I"),
+    ("edge_offsets", "Q"), ("edge_targets", "I"), ("edge_strengths", "d"), ("id_order", "I"),
+    ("tag_names", "I"), ("tag_offsets", "Q"), ("tag_rows", "I"),
+    ("type_names", "I"), ("type_offsets", "Q"), ("type_rows", "I"),
+    ("band_offsets", "Q"), ("band_keys", "q"), ("band_probe", "q"),
+)
+HEADER = struct.Struct("<8sII" + "QQ" * len(SECTIONS))
+# id, content, context (-1: none), type code, importance, content kind, created, accessed, retention, tag start, tag count
+NODE = struct.Struct("<IIiBBBxdddII")
+NODE_ID = struct.Struct("<I")
+NO_CONTEXT = -1
+
+CONTENT_TEXT = 0
+CONTENT_JSON = 1
+
+
+class SnapshotRow(NamedTuple):
+    """One node as stored, with content and context already encoded as text"""
+    id: str
+    content: str
+    content_kind: int
+    context: Optional[str]
+    type_code: int
+    importance: int
+    created: float
+    accessed: float
+    retention: float
+    tags: Sequence[str]
+
+
+def _csr(lists: Iterable[Sequence[int]]) -> Tuple[array, array]:
+    offsets = array("Q", [0])
+    flat = array("I")
+    for items in lists:
+        flat.extend(items)
+        offsets.append(len(flat))
+    return offsets, flat
+
+
+def write_snapshot(path: str, rows: Sequence[SnapshotRow], edges: Sequence[Sequence[Tuple[int, float]]],
+                   type_names: Sequence[str], band_keys: Sequence[Sequence[int]] = None, band_probe: Sequence[int] = ()):
+    """Write rows (in insertion order) and their edges as (row, strength) lists parallel to rows.
+    
+    ``band_keys``, if given, is also parallel to rows; ``band_probe`` is what
+    the same hashing gives for a fixed token set.
+    
+    The file is written beside the target and swapped in, so a reader never
+    sees a half-written snapshot.
+    """
+    if len(edges) != len(rows) or (band_keys is not None and len(band_keys) != len(rows)):
+        raise ValueError("edges and band keys must have one entry per row")
+    
+    blob = bytearray()
+    string_offsets = array("Q", [0])
+    
+    def add_string(text: str) -> int:
+        blob.extend(text.encode("utf-8"))
+        string_offsets.append(len(blob))
+        return len(string_offsets) - 2
+    
+    nodes = bytearray()
+    node_tags = array("I")
+    tag_numbers: Dict[str, int] = {}
+    tag_rows: List[List[int]] = []
+    type_rows: List[List[int]] = [[] for _ in type_names]
+    for row_index, row in enumerate(rows):
+        tag_start = len(node_tags)
+        for tag in row.tags:
+            number = tag_numbers.get(tag)
+            if number is None:
+                number = tag_numbers[tag] = len(tag_rows)
+                tag_rows.append([])
+            node_tags.append(number)
+            tag_rows[number].append(row_index)
+        type_rows[row.type_code].append(row_index)
+        context = NO_CONTEXT if row.context is None else add_string(row.context)
+        nodes += NODE.pack(add_string(row.id), add_string(row.content), context, row.type_code, row.importance,
+                           row.content_kind, row.created, row.accessed, row.retention, tag_start, len(row.tags))
+    
+    edge_offsets = array("Q", [0])
+    edge_targets = array("I")
+    edge_strengths = array("d")
+    for neighbours in edges:
+        for target, strength in neighbours:
+            edge_targets.append(target)
+            edge_strengths.append(strength)
+        edge_offsets.append(len(edge_targets))
+    
+    id_order = array("I", sorted(range(len(rows)), key=lambda i: rows[i].id))
+    tag_names = array("I", [add_string(tag) for tag in tag_numbers])
+    type_name_ids = array("I", [add_string(name) for name in type_names])
+    tag_offsets, tag_flat = _csr(tag_rows)
+    type_offsets, type_flat = _csr(type_rows)
+    band_offsets = array("Q", [0])
+    band_flat = array("q")
+    for keys in band_keys or ():
+        band_flat.extend(keys)
+        band_offsets.append(len(band_flat))
+    
+    sections = {
+        "string_offsets": string_offsets, "strings": blob, "nodes": nodes, "node_tags": node_tags,
+        "edge_offsets": edge_offsets, "edge_targets": edge_targets, "edge_strengths": edge_strengths,
+        "id_order": id_order, "tag_names": tag_names, "tag_offsets": tag_offsets, "tag_rows": tag_flat,
+        "type_names": type_name_ids, "type_offsets": type_offsets, "type_rows": type_flat,
+        "band_offsets": band_offsets, "band_keys": band_flat, "band_probe": array("q", band_probe),
+    }
+    tmp = path + ".tmp"
+    with open(tmp, "wb") as f:
+        f.write(bytes(HEADER.size))
+        layout = []
+        for name, _ in SECTIONS:
+            data = sections[name]
+            f.write(bytes(-f.tell() % 8))
+            layout += [f.tell(), len(data) * (data.itemsize if isinstance(data, array) else 1)]
+            f.write(data)
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, VERSION, len(rows), *layout))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class MemorySnapshot:
+    """Read-only, memory-mapped view of a snapshot file"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, "rb")
+        try:
+            self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            magic, version, self.count, *layout = HEADER.unpack_from(self._mm, 0)
+        except (ValueError, struct.error):
+            self._file.close()
+            raise ValueError(f"{path} is not a memory web snapshot")
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a memory web snapshot (version {version})")
+        
+        self._views: List[memoryview] = []
+        base = memoryview(self._mm)
+        self._views.append(base)
+        self._offsets: Dict[str, int] = {}
+        for i, (name, typecode) in enumerate(SECTIONS):
+            offset, length = layout[2 * i], layout[2 * i + 1]
+            self._offsets[name] = offset
+            if typecode:
+                view = base[offset:offset + length]
+                cast = view.cast(typecode)
+                self._views += [view, cast]
+                setattr(self, f"_{name}", cast)
+        self._strings_at = self._offsets["strings"]
+        self._nodes_at = self._offsets["nodes"]
+        self._tag_name_cache: Optional[List[str]] = None
+        self._tag_numbers: Optional[Dict[str, int]] = None
+    
+    def close(self):
+        for view in reversed(getattr(self, "_views", ())):
+            view.release()
+        self._views = []
+        self._mm.close()
+        self._file.close()
+    
+    # -- strings and rows ---------------------------------------------------
+    
+    def string(self, string_id: int) -> str:
+        return self._string_bytes(string_id).decode("utf-8")
+    
+    def _string_bytes(self, string_id: int) -> bytes:
+        at = self._strings_at
+        return self._mm[at + self._string_offsets[string_id]:at + self._string_offsets[string_id + 1]]
+    
+    def record(self, row: int) -> tuple:
+        return NODE.unpack_from(self._mm, self._nodes_at + row * NODE.size)
+    
+    def node_id(self, row: int) -> str:
+        return self.string(NODE_ID.unpack_from(self._mm, self._nodes_at + row * NODE.size)[0])
+    
+    def type_code(self, row: int) -> int:
+        return self.record(row)[3]
+    
+    def row(self, row: int) -> SnapshotRow:
+        (id_sid, content_sid, context_sid, type_code, importance, content_kind,
+         created, accessed, retention, tag_start, tag_count) = self.record(row)
+        names = self.tag_names
+        tags = [names[t] for t in self._node_tags[tag_start:tag_start + tag_count].tolist()]
+        context = None if context_sid == NO_CONTEXT else self.string(context_sid)
+        return SnapshotRow(self.string(id_sid), self.string(content_sid), content_kind, context,
+                           type_code, importance, created, accessed, retention, tags)
+    
+    def index_of(self, node_id: str) -> Optional[int]:
+        """Row holding node_id, by binary search over the id order"""
+        key = node_id.encode("utf-8")
+        order = self._id_order
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            row = order[mid]
+            probe = self._string_bytes(NODE_ID.unpack_from(self._mm, self._nodes_at + row * NODE.size)[0])
+            if probe < key:
+                lo = mid + 1
+            elif probe > key:
+                hi = mid
+            else:
+                return row
+        return None
+    
+    # -- edges ----------------------------------------------------------------
+    
+    @property
+    def edge_count(self) -> int:
+        """Stored half-edges (each connection appears once per endpoint)"""
+        return len(self._edge_targets)
+    
+    def degree(self, row: int) -> int:
+        return self._edge_offsets[row + 1] - self._edge_offsets[row]
+    
+    def neighbours(self, row: int) -> List[Tuple[int, float]]:
+        start, end = self._edge_offsets[row], self._edge_offsets[row + 1]
+        return list(zip(self._edge_targets[start:end].tolist(), self._edge_strengths[start:end].tolist()))
+    
+    # -- tag and type postings ------------------------------------------------
+    
+    @property
+    def tag_names(self) -> List[str]:
+        if self._tag_name_cache is None:
+            self._tag_name_cache = [self.string(sid) for sid in self._tag_names.tolist()]
+        return self._tag_name_cache
+    
+    @property
+    def type_names(self) -> List[str]:
+        return [self.string(sid) for sid in self._type_names.tolist()]
+    
+    def tag_rows(self, tag: str) -> List[int]:
+        """Rows carrying tag, in insertion order"""
+        if self._tag_numbers is None:
+            self._tag_numbers = {name: i for i, name in enumerate(self.tag_names)}
+        number = self._tag_numbers.get(tag)
+        if number is None:
+            return []
+        return self._tag_rows[self._tag_offsets[number]:self._tag_offsets[number + 1]].tolist()
+    
+    def type_rows(self, type_code: int) -> List[int]:
+        return self._type_rows[self._type_offsets[type_code]:self._type_offsets[type_code + 1]].tolist()
+    
+    def type_count(self, type_code: int) -> int:
+        return self._type_offsets[type_code + 1] - self._type_offsets[type_code]
+    
+    # -- LSH band keys ----------------------------------------------------------
+    
+    @property
+    def band_probe(self) -> List[int]:
+        return self._band_probe.tolist()
+    
+    def band_keys(self, row: int) -> Optional[List[int]]:
+        """Stored band keys for row, or None if the snapshot was written without them"""
+        if len(self._band_offsets) <= row + 1:
+            return None
+        return self._band_keys[self._band_offsets[row]:self._band_offsets[row + 1]].tolist()
+
+
+class SegmentLog:
+    """Append-only change log kept beside a snapshot until the next merge"""
+    
+    def __init__(self, path: str):
+        self.path = path
+        self.pending = 0
+        self._file = None
+    
+    def append(self, op: list):
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        self._file.write(json.dumps(op, default=str) + "\n")
+        self._file.flush()
+        self.pending += 1
+    
+    def replay(self) -> Iterator[list]:
+        try:
+            f = open(self.path, "r", encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with f:
+            for line in f:
+                try:
+                    op = json.loads(line)
+                except ValueError:
+                    continue  # torn write at the tail
+                self.pending += 1
+                yield op
+    
+    def reset(self):
+        self.close()
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+        self.pending = 0
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+class SnapshotNodes(MutableMapping):
+    """Node mapping backed by a snapshot.
+    
+    Rows become objects (via ``decode``) the first time they are read and are
+    kept in ``live``; writes and deletes only touch the in-memory overlay.
+    Iteration is snapshot rows in order, then nodes added since.
+    """
+    
+    def __init__(self, snapshot: MemorySnapshot, decode: Callable[[MemorySnapshot, int], Any]):
+        self.snapshot = snapshot
+        self.decode = decode
+        self.live: Dict[str, Any] = {}
+        self.added: Dict[str, None] = {}  # ids not in the snapshot, in insertion order
+        self.deleted: Set[str] = set()
+        self.replaced: Set[str] = set()  # snapshot ids re-assigned a new node
+    
+    def _row(self, key: str) -> Optional[int]:
+        return None if key in self.deleted else self.snapshot.index_of(key)
+    
+    def __getitem__(self, key: str):
+        node = self.live.get(key)
+        if node is None:
+            row = self._row(key)
+            if row is None:
+                raise KeyError(key)
+            node = self.live[key] = self.decode(self.snapshot, row)
+        return node
+    
+    def __contains__(self, key) -> bool:
+        return key in self.live or (isinstance(key, str) and self._row(key) is not None)
+    
+    def __setitem__(self, key: str, node):
+        if key not in self.live and key not in self.added:
+            if self.snapshot.index_of(key) is None:
+                self.added[key] = None
+            else:
+                self.deleted.discard(key)
+        if key not in self.added:
+            self.replaced.add(key)
+        self.live[key] = node
+    
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        self.live.pop(key, None)
+        if key in self.added:
+            del self.added[key]
+        else:
+            self.deleted.add(key)
+    
+    def __iter__(self) -> Iterator[str]:
+        deleted = self.deleted
+        snapshot = self.snapshot
+        for row in range(snapshot.count):
+            node_id = snapshot.node_id(row)
+            if node_id not in deleted:
+                yield node_id
+        yield from list(self.added)
+    
+    def __len__(self) -> int:
+        return self.snapshot.count - len(self.deleted) + len(self.added)
+    
+    def entries(self) -> Iterator[Tuple[str, Optional[int], Any]]:
+        """(id, row, node) in iteration order; row is None unless the node is the snapshot's own"""
+        live, deleted, replaced, snapshot = self.live, self.deleted, self.replaced, self.snapshot
+        for row in range(snapshot.count):
+            node_id = snapshot.node_id(row)
+            if node_id in deleted:
+                continue
+            node = live.get(node_id)
+            if node is None:
+                node = live[node_id] = self.decode(snapshot, row)
+            yield node_id, None if node_id in replaced else row, node
+        for node_id in list(self.added):
+            yield node_id, None, live[node_id]
+    
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Like dict.items(), but decodes rows in order instead of looking each id up"""
+        return ((node_id, node) for node_id, _, node in self.entries())
+    
+    def values(self) -> Iterator[Any]:
+        return (node for _, node in self.items())
+
+
+class SnapshotEdges(MutableMapping):
+    """Adjacency mapping ({node_id: {connected_id: strength}}) backed by a snapshot's CSR arrays.
+    
+    A row becomes a dict the first time it is read; from then on the dict in
+    ``live`` is authoritative. Nodes without edges have no entry.
+    """
+    
+    def __init__(self, snapshot: MemorySnapshot):
+        self.snapshot = snapshot
+        self.live: Dict[str, Dict[str, float]] = {}
+        self.superseded: Set[str] = set()  # ids whose snapshot row is replaced by ``live`` or deleted
+    
+    def _row(self, key: str) -> Optional[int]:
+        if key in self.superseded:
+            return None
+        row = self.snapshot.index_of(key)
+        return row if row is not None and self.snapshot.degree(row) else None
+    
+    def _load(self, key: str, row: int) -> Dict[str, float]:
+        snapshot = self.snapshot
+        neighbours = self.live[key] = {snapshot.node_id(target): strength for target, strength in snapshot.neighbours(row)}
+        self.superseded.add(key)
+        return neighbours
+    
+    def __getitem__(self, key: str) -> Dict[str, float]:
+        neighbours = self.live.get(key)
+        if neighbours is None:
+            row = self._row(key)
+            if row is None:
+                raise KeyError(key)
+            neighbours = self._load(key, row)
+        return neighbours
+    
+    def __contains__(self, key) -> bool:
+        return key in self.live or (isinstance(key, str) and self._row(key) is not None)
+    
+    def __setitem__(self, key: str, neighbours: Dict[str, float]):
+        self.live[key] = neighbours
+        self.superseded.add(key)
+    
+    def __delitem__(self, key: str):
+        if key not in self:
+            raise KeyError(key)
+        self.live.pop(key, None)
+        self.superseded.add(key)
+    
+    def _snapshot_rows(self) -> Iterator[Tuple[str, int]]:
+        snapshot, superseded = self.snapshot, self.superseded
+        for row in range(snapshot.count):
+            if snapshot.degree(row):
+                node_id = snapshot.node_id(row)
+                if node_id not in superseded:
+                    yield node_id, row
+    
+    def __iter__(self) -> Iterator[str]:
+        for node_id, _ in self._snapshot_rows():
+            yield node_id
+        yield from list(self.live)
+    
+    def __len__(self) -> int:
+        return sum(1 for _ in self._snapshot_rows()) + len(self.live)
+    
+    def half_edge_count(self) -> int:
+        """Stored half-edges after changes, without loading untouched rows"""
+        snapshot = self.snapshot
+        stale = 0
+        for node_id in self.superseded:
+            row = snapshot.index_of(node_id)
+            if row is not None:
+                stale += snapshot.degree(row)
+        return snapshot.edge_count - stale + sum(len(neighbours) for neighbours in self.live.values())
+    
+    def items(self) -> Iterator[Tuple[str, Dict[str, float]]]:
+        """Like dict.items(), but loads rows in order instead of looking each id up"""
+        loaded = list(self.live.items())
+        for node_id, row in list(self._snapshot_rows()):
+            yield node_id, self._load(node_id, row)
+        yield from loaded
+    
+    def values(self) -> Iterator[Dict[str, float]]:
+        return (neighbours for _, neighbours in self.items())
@@ -7,10 +7,12 @@ import asyncio
 import math
 import random
 from datetime import datetime
-from typing import Dict, Any, Tuple, List
+from typing import Dict, Any, Tuple, List, NamedTuple
 from dataclasses import dataclass, field
 
-from integration.CORE_HUB import Message, ComponentType, CoreHub
+import numpy as np
+
+from integration.CORE_HUB import Message, ComponentType, CoreHub, OverflowPolicy, RoutePolicy, STATE_UPDATE_TYPES
 
 
 @dataclass
@@ -102,82 +104,117 @@ class AnimationController:
         }
 
 
+class ParticleArrays(NamedTuple):
+    """Views of the live particles, oldest first (row i is one particle)"""
+    position: np.ndarray      # (n, 3)
+    velocity: np.ndarray      # (n, 3)
+    color: np.ndarray         # (n, 4) rgba
+    size: np.ndarray          # (n,)
+    lifetime: np.ndarray      # (n,)
+    max_lifetime: np.ndarray  # (n,)
+
+
 class ParticleSystem:
-    """Manages the ethereal particle effects around the form"""
+    """Manages the ethereal particle effects around the form
     
-    def __init__(self):
-        self.particles: List[Particle] = []
-        self.max_particles = 100
+    Particles live in a fixed-capacity structure of arrays: live particles are
+    rows [0, count) in emission order, so emit, update and cull are whole-array
+    operations and nothing is allocated per particle.
+    """
+    
+    def __init__(self, max_particles: int = 100):
+        self.max_particles = max_particles
         self.emission_rate = 5  # particles per second
         self.base_color = Color(0.8, 0.6, 0.9, 0.7)  # Soft purplish mist
         self.mars_color = Color(0.8, 0.4, 0.4, 0.8)  # Mars red
+        self.rng = np.random.default_rng()
+        
+        self.count = 0
+        self.position = np.zeros((max_particles, 3), dtype=np.float32)
+        self.velocity = np.zeros((max_particles, 3), dtype=np.float32)
+        self.color = np.zeros((max_particles, 4), dtype=np.float32)
+        self.size = np.zeros(max_particles, dtype=np.float32)
+        self.lifetime = np.zeros(max_particles, dtype=np.float32)
+        self.max_lifetime = np.ones(max_particles, dtype=np.float32)
+        self._columns = (self.position, self.velocity, self.color, self.size, self.lifetime, self.max_lifetime)
+        self._color_jitter = np.array([0.1, 0.1, 0.1, 0.2], dtype=np.float32)
+    
+    def __len__(self) -> int:
+        return self.count
     
     def emit_particles(self, count: int, center_pos: Position, emission_type: str = "mist"):
         """Emit new particles"""
-        for _ in range(count):
-            if len(self.particles) >= self.max_particles:
-                # Remove oldest particles if at max
-                self.particles.pop(0)
-            
-            # Random position around center
-            pos = Position(
-                center_pos.x + random.uniform(-0.5, 0.5),
-                center_pos.y + random.uniform(-0.5, 0.5),
-                center_pos.z + random.uniform(-0.5, 0.5)
-            )
-            
-            # Random velocity
-            vel = Position(
-                random.uniform(-0.1, 0.1),
-                random.uniform(-0.1, 0.1),
-                random.uniform(-0.1, 0.1)
-            )
-            
-            # Choose color based on emission type
-            if emission_type == "mars":
-                color = Color(
-                    self.mars_color.r + random.uniform(-0.1, 0.1),
-                    self.mars_color.g + random.uniform(-0.1, 0.1),
-                    self.mars_color.b + random.uniform(-0.1, 0.1),
-                    self.mars_color.a + random.uniform(-0.2, 0.2)
-                )
-            else:
-                color = Color(
-                    self.base_color.r + random.uniform(-0.1, 0.1),
-                    self.base_color.g + random.uniform(-0.1, 0.1),
-                    self.base_color.b + random.uniform(-0.1, 0.1),
-                    self.base_color.a + random.uniform(-0.2, 0.2)
-                )
-            
-            # Random size and lifetime
-            size = random.uniform(0.05, 0.2)
-            lifetime = random.uniform(2.0, 5.0)
-            
-            particle = Particle(pos, vel, color, size, lifetime, lifetime)
-            self.particles.append(particle)
+        count = min(count, self.max_particles)
+        if count <= 0:
+            return
+        
+        # Remove oldest particles if at max
+        overflow = self.count + count - self.max_particles
+        if overflow > 0:
+            keep = self.count - overflow
+            for column in self._columns:
+                column[:keep] = column[overflow:self.count]
+            self.count = keep
+        
+        start, end = self.count, self.count + count
+        rng = self.rng
+        
+        # Random position around center, random velocity
+        center = np.array([center_pos.x, center_pos.y, center_pos.z], dtype=np.float32)
+        self.position[start:end] = center + rng.uniform(-0.5, 0.5, (count, 3))
+        self.velocity[start:end] = rng.uniform(-0.1, 0.1, (count, 3))
+        
+        # Choose color based on emission type
+        base = self.mars_color if emission_type == "mars" else self.base_color
+        base_rgba = np.array([base.r, base.g, base.b, base.a], dtype=np.float32)
+        self.color[start:end] = base_rgba + rng.uniform(-1.0, 1.0, (count, 4)) * self._color_jitter
+        
+        # Random size and lifetime
+        self.size[start:end] = rng.uniform(0.05, 0.2, count)
+        self.lifetime[start:end] = rng.uniform(2.0, 5.0, count)
+        self.max_lifetime[start:end] = self.lifetime[start:end]
+        self.count = end
     
     def update_particles(self, delta_time: float):
         """Update all particles"""
-        for particle in self.particles[:]:  # Use slice to iterate safely
-            # Update position based on velocity
-            particle.position.x += particle.velocity.x * delta_time * 10
-            particle.position.y += particle.velocity.y * delta_time * 10
-            particle.position.z += particle.velocity.z * delta_time * 10
-            
-            # Decrease lifetime
-            particle.lifetime -= delta_time
-            
-            # Fade out as lifetime decreases
-            age_ratio = particle.lifetime / particle.max_lifetime
-            particle.color.a = particle.color.a * age_ratio if age_ratio > 0 else 0
-            
-            # Remove dead particles
-            if particle.lifetime <= 0:
-                self.particles.remove(particle)
+        n = self.count
+        if not n:
+            return
+        
+        # Update position based on velocity
+        self.position[:n] += self.velocity[:n] * (delta_time * 10)
+        
+        # Decrease lifetime
+        lifetime = self.lifetime[:n]
+        lifetime -= delta_time
+        
+        # Fade out as lifetime decreases
+        alpha = self.color[:n, 3]
+        alpha *= np.maximum(lifetime / self.max_lifetime[:n], 0.0)
+        
+        # Remove dead particles, keeping emission order
+        alive = lifetime > 0
+        alive_count = int(np.count_nonzero(alive))
+        if alive_count < n:
+            for column in self._columns:
+                column[:alive_count] = column[:n][alive]
+            self.count = alive_count
+    
+    def get_particle_arrays(self) -> ParticleArrays:
+        """Views of the live particles for rendering; valid until the next emit/update"""
+        n = self.count
+        return ParticleArrays(self.position[:n], self.velocity[:n], self.color[:n],
+                              self.size[:n], self.lifetime[:n], self.max_lifetime[:n])
     
     def get_active_particles(self) -> List[Particle]:
-        """Get list of currently active particles"""
-        return [p for p in self.particles if p.lifetime > 0]
+        """Get list of currently active particles (copies; prefer get_particle_arrays)"""
+        arrays = self.get_particle_arrays()
+        return [
+            Particle(Position(*pos), Position(*vel), Color(*rgba), size, lifetime, max_lifetime)
+            for pos, vel, rgba, size, lifetime, max_lifetime in zip(
+                arrays.position.tolist(), arrays.velocity.tolist(), arrays.color.tolist(),
+                arrays.size.tolist(), arrays.lifetime.tolist(), arrays.max_lifetime.tolist())
+        ]
 
 
 class VisualForm:
@@ -261,12 +298,14 @@ class VisualCompanion:
         self.attention_level = 0.5  # 0.0 to 1.0
         self.engagement_level = 0.5  # 0.0 to 1.0
         
-        # Register with the hub
+        # Register with the hub; state updates only need their latest value
         self.hub.registry.register_component(
             self.name,
             self.handle_message,
             self.component_type
         )
+        self.hub.set_route_policy(self.name, RoutePolicy(
+            max_queue=64, overflow=OverflowPolicy.DROP_OLDEST, coalesce_types=STATE_UPDATE_TYPES))
         
         # Register for relevant events
         self.hub.event_coord.register_event_handler("user_attention", self.on_user_attention)
@@ -340,21 +379,28 @@ class VisualCompanion:
         return {
             "form_attributes": self.form.get_visual_attributes(),
             "animation_params": animation_params,
-            "particles": [
-                {
-                    "position": (p.position.x, p.position.y, p.position.z),
-                    "color": (p.color.r, p.color.g, p.color.b, p.color.a),
-                    "size": p.size,
-                    "lifetime": p.lifetime,
-                    "max_lifetime": p.max_lifetime
-                }
-                for p in self.particle_system.get_active_particles()
-            ],
+            "particles": self.get_particle_state(),
             "timestamp": datetime.now().isoformat(),
             "attention_level": self.attention_level,
             "engagement_level": self.engagement_level
         }
     
+    def get_particle_state(self) -> List[Dict[str, Any]]:
+        """Live particles as plain values, built column-wise from the particle arrays"""
+        arrays = self.particle_system.get_particle_arrays()
+        return [
+            {
+                "position": tuple(pos),
+                "color": tuple(rgba),
+                "size": size,
+                "lifetime": lifetime,
+                "max_lifetime": max_lifetime
+            }
+            for pos, rgba, size, lifetime, max_lifetime in zip(
+                arrays.position.tolist(), arrays.color.tolist(), arrays.size.tolist(),
+                arrays.lifetime.tolist(), arrays.max_lifetime.tolist())
+        ]
+    
     async def on_user_attention(self, event_type: str, data: Any):
         """Handle user attention events"""
         if data and "level" in data:
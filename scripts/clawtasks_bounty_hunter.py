@@ -9,6 +9,7 @@ import aiohttp
 import json
 import time
 import logging
+from collections import OrderedDict
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 from pathlib import Path
@@ -50,6 +51,22 @@ class ClawTasksBountyHunter:
         self.poll_interval_min = 10  # Min seconds between polls
         self.poll_interval_max = 30  # Max seconds between polls
         self.max_attempts_per_bounty = 2
+        
+        # Pipeline: fetch -> triage -> claim -> solve -> submit, each stage with its own workers
+        self.claim_workers = 2
+        self.solve_workers = 2   # Concurrent generations the local model can sustain
+        self.submit_workers = 2
+        self.claim_queue: Optional[asyncio.Queue] = None
+        self.solve_queue: Optional[asyncio.Queue] = None
+        self.submit_queue: Optional[asyncio.Queue] = None
+        
+        # Dedup: bounties somewhere in the pipeline, and ones already handled or rejected.
+        # Entries expire so failed claims and rejected bounties get another look later.
+        self.in_flight = set()
+        self.recently_seen: "OrderedDict[str, float]" = OrderedDict()
+        self.recently_seen_limit = 2000
+        self.recently_seen_ttl = 10 * 60  # seconds
+        self.poll_interval = self.poll_interval_max
 
     async def __aenter__(self):
         # Only add Authorization header if not using mock API key
@@ -300,48 +317,155 @@ class ClawTasksBountyHunter:
         # For now, assume sufficient funds
         return False
 
-    async def run_operational_loop(self):
-        """Main operational loop - execute continuously"""
-        logger.info("Starting ClawTasks bounty hunting operations...")
+    def _remember(self, bounty_id: str):
+        """Mark a bounty as handled so later polls skip it"""
+        self.in_flight.discard(bounty_id)
+        self.recently_seen[bounty_id] = time.time()
+        self.recently_seen.move_to_end(bounty_id)
+        while len(self.recently_seen) > self.recently_seen_limit:
+            self.recently_seen.popitem(last=False)
+
+    def _expire_seen(self, now: float):
+        """Forget bounties remembered more than recently_seen_ttl seconds ago (oldest are first)"""
+        cutoff = now - self.recently_seen_ttl
+        while self.recently_seen and next(iter(self.recently_seen.values())) <= cutoff:
+            self.recently_seen.popitem(last=False)
+
+    async def fetch_and_triage(self) -> int:
+        """Fetch + filter/score stage: queue new EV-positive bounties, best first"""
+        bounties = await self.get_open_bounties()
+        self.stats['last_poll_time'] = time.time()
+        self._expire_seen(self.stats['last_poll_time'])
+        if not isinstance(bounties, list):
+            logger.error("Expected list of bounties, received %s", type(bounties).__name__)
+            bounties = []
         
-        while True:
+        fresh = []
+        for bounty in bounties:
+            # Check if bounty is not None before processing
+            if bounty is None:
+                continue
+            bounty_id = bounty.get('id')
+            if bounty_id in self.in_flight or bounty_id in self.recently_seen:
+                continue
+            # Evaluate if this bounty is worth pursuing (EV positive)
+            if self.evaluate_ev(bounty):
+                fresh.append(bounty)
+            else:
+                self._remember(bounty_id)
+        
+        # EV grows with the amount, so the most valuable bounties get claimed first
+        fresh.sort(key=lambda b: float(b.get('amount', 0)), reverse=True)
+        queued = 0
+        for bounty in fresh:
+            # Never wait on a backed-up pipeline here; whatever doesn't fit is picked up by a later poll
             try:
-                # Poll for open bounties
-                bounties = await self.get_open_bounties()
-                if not isinstance(bounties, list):
-                    logger.error("Expected list of bounties, received %s", type(bounties).__name__)
-                    bounties = []
-                
-                # Process each bounty
-                for bounty in bounties:
-                    # Check if bounty is not None before processing
-                    if bounty is None:
-                        continue
-                        
-                    # Evaluate if this bounty is worth pursuing (EV positive)
-                    if self.evaluate_ev(bounty):
-                        # Process the bounty through the full lifecycle
-                        await self.process_bounty(bounty)
-                        
-                        # Small delay between processing bounties
-                        await asyncio.sleep(2)
-                
-                # Check if funds are low
-                if await self.check_low_funds():
-                    logger.warning("Low funds detected - consider refilling wallet")
-                
-                # Wait before next poll (random interval to avoid predictable patterns)
-                wait_time = self.poll_interval_min + (self.poll_interval_max - self.poll_interval_min) * 0.5
-                logger.info(f"Waiting {wait_time}s before next poll...")
-                await asyncio.sleep(wait_time)
-                
-            except KeyboardInterrupt:
-                logger.info("Shutting down bounty hunter...")
+                self.claim_queue.put_nowait(bounty)
+            except asyncio.QueueFull:
+                logger.info(f"Claim queue full; leaving {len(fresh) - queued} bounties for the next poll")
                 break
+            self.in_flight.add(bounty.get('id'))
+            queued += 1
+        return queued
+
+    async def _claim_worker(self):
+        while True:
+            bounty = await self.claim_queue.get()
+            bounty_id = bounty.get('id')
+            try:
+                # Claim the bounty immediately (first-mover wins)
+                if await self.claim_bounty(bounty_id):
+                    # Blocks while solvers are busy, so we never hold more claims than we can work
+                    await self.solve_queue.put(bounty)
+                else:
+                    self._remember(bounty_id)  # Failed to claim or already claimed by another agent
+            except Exception as e:
+                logger.error(f"Claim stage error for bounty {bounty_id}: {e}")
+                self._remember(bounty_id)
+            finally:
+                self.claim_queue.task_done()
+
+    async def _solve_worker(self):
+        while True:
+            bounty = await self.solve_queue.get()
+            bounty_id = bounty.get('id')
+            try:
+                solution = await self.solve_bounty(bounty)
+                await self.submit_queue.put((bounty, solution))
             except Exception as e:
-                logger.error(f"Error in operational loop: {e}")
-                # Wait a bit before retrying
-                await asyncio.sleep(10)
+                logger.error(f"Solve stage error for bounty {bounty_id}: {e}")
+                self._remember(bounty_id)
+            finally:
+                self.solve_queue.task_done()
+
+    async def _submit_worker(self):
+        while True:
+            bounty, solution = await self.submit_queue.get()
+            bounty_id = bounty.get('id')
+            try:
+                if await self.submit_solution(bounty_id, solution, bounty):
+                    logger.info(f"[SUCCESS] Completed bounty {bounty_id}")
+                else:
+                    logger.error(f"[FAILURE] Failed to complete bounty {bounty_id}")
+            except Exception as e:
+                logger.error(f"Submit stage error for bounty {bounty_id}: {e}")
+            finally:
+                self._remember(bounty_id)
+                self.submit_queue.task_done()
+
+    def start_pipeline(self) -> List[asyncio.Task]:
+        """Create the stage queues and worker pools"""
+        self.claim_queue = asyncio.Queue(maxsize=self.claim_workers * 4)
+        self.solve_queue = asyncio.Queue(maxsize=self.solve_workers)
+        self.submit_queue = asyncio.Queue(maxsize=self.submit_workers * 2)
+        
+        workers = []
+        for _ in range(self.claim_workers):
+            workers.append(asyncio.create_task(self._claim_worker()))
+        for _ in range(self.solve_workers):
+            workers.append(asyncio.create_task(self._solve_worker()))
+        for _ in range(self.submit_workers):
+            workers.append(asyncio.create_task(self._submit_worker()))
+        return workers
+
+    def next_poll_interval(self, new_bounties: int) -> float:
+        """Poll fast while new bounties keep arriving, back off when the board is quiet"""
+        if new_bounties:
+            self.poll_interval = self.poll_interval_min
+        else:
+            self.poll_interval = min(self.poll_interval_max, self.poll_interval * 1.5)
+        return self.poll_interval
+
+    async def run_operational_loop(self):
+        """Main operational loop - execute continuously"""
+        logger.info("Starting ClawTasks bounty hunting operations...")
+        workers = self.start_pipeline()
+        
+        try:
+            while True:
+                try:
+                    new_bounties = await self.fetch_and_triage()
+                    
+                    # Check if funds are low
+                    if await self.check_low_funds():
+                        logger.warning("Low funds detected - consider refilling wallet")
+                    
+                    wait_time = self.next_poll_interval(new_bounties)
+                    logger.info(f"Queued {new_bounties} new bounties ({len(self.in_flight)} in flight). "
+                                f"Waiting {wait_time:.0f}s before next poll...")
+                    await asyncio.sleep(wait_time)
+                    
+                except KeyboardInterrupt:
+                    logger.info("Shutting down bounty hunter...")
+                    break
+                except Exception as e:
+                    logger.error(f"Error in operational loop: {e}")
+                    # Wait a bit before retrying
+                    await asyncio.sleep(10)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
 
 
 async def main():
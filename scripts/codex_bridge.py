@@ -5,9 +5,11 @@ Simple HTTP -> Moltbot Gateway WS bridge for Codex-style chat routing.
 """
 
 import asyncio
+import itertools
 import json
 import os
 from pathlib import Path
+from typing import Dict, Optional, Tuple
 from aiohttp import web, ClientSession, ClientTimeout, WSMsgType
 
 DEFAULT_GATEWAY_URL = os.getenv("MOLTBOT_GATEWAY_URL", "ws://localhost:18789")
@@ -15,122 +17,243 @@ DEFAULT_PORT = int(os.getenv("CODEX_BRIDGE_PORT", "18790"))
 DEFAULT_TOKEN = "secret123"
 
 
+_token_cache = {"mtime": None, "token": DEFAULT_TOKEN}
+
+
+def _read_token_file(config_path: Path) -> str:
+    try:
+        data = json.loads(config_path.read_text(encoding="utf-8"))
+        # Try common token locations
+        for path in (
+            ("gateway", "auth", "token"),
+            ("gateway", "token"),
+            ("auth", "token"),
+        ):
+            cur = data
+            ok = True
+            for key in path:
+                if isinstance(cur, dict) and key in cur:
+                    cur = cur[key]
+                else:
+                    ok = False
+                    break
+            if ok and isinstance(cur, str) and cur.strip():
+                return cur.strip()
+    except Exception:
+        pass
+    return DEFAULT_TOKEN
+
+
 def _load_gateway_token() -> str:
     env_token = os.getenv("MOLTBOT_GATEWAY_TOKEN")
     if env_token:
         return env_token
 
+    # Only re-read the config when it has changed on disk
     config_path = Path.home() / ".clawdbot" / "moltbot.json"
-    if config_path.exists():
-        try:
-            data = json.loads(config_path.read_text(encoding="utf-8"))
-            # Try common token locations
-            for path in (
-                ("gateway", "auth", "token"),
-                ("gateway", "token"),
-                ("auth", "token"),
-            ):
-                cur = data
-                ok = True
-                for key in path:
-                    if isinstance(cur, dict) and key in cur:
-                        cur = cur[key]
-                    else:
-                        ok = False
-                        break
-                if ok and isinstance(cur, str) and cur.strip():
-                    return cur.strip()
-        except Exception:
-            pass
+    try:
+        mtime = config_path.stat().st_mtime_ns
+    except OSError:
+        return DEFAULT_TOKEN
+    if _token_cache["mtime"] != mtime:
+        _token_cache["token"] = _read_token_file(config_path)
+        _token_cache["mtime"] = mtime
+    return _token_cache["token"]
 
-    return DEFAULT_TOKEN
 
+def _final_text(payload: dict) -> str:
+    content = (payload.get("message") or {}).get("content", [])
+    texts = []
+    for part in content:
+        if isinstance(part, dict) and part.get("type") == "text":
+            texts.append(part.get("text", ""))
+    return "".join(texts).strip()
 
-async def _gateway_chat(message: str, session_key: str, idempotency_key: str, timeout: int = 30) -> dict:
-    token = _load_gateway_token()
-    timeout_cfg = ClientTimeout(total=timeout)
 
-    async with ClientSession(timeout=timeout_cfg) as session:
-        ws = await session.ws_connect(DEFAULT_GATEWAY_URL)
+class GatewayClient:
+    """One authenticated gateway websocket shared by all bridge requests.
 
-        try:
-            # Handshake
-            await ws.send_json({
-                "type": "req",
-                "id": "connect-1",
-                "method": "connect",
-                "params": {
-                    "minProtocol": 3,
-                    "maxProtocol": 3,
-                    "auth": {"token": token},
-                    "client": {
-                        "id": "webchat",
-                        "version": "1.0.0",
-                        "platform": "python",
-                        "mode": "webchat"
-                    }
+    Requests are multiplexed by request id; chat events are routed back by
+    the runId the gateway returns. A dropped socket fails the requests in
+    flight and is re-established (with backoff) by the next request.
+    """
+
+    def __init__(self, url: str = DEFAULT_GATEWAY_URL, max_backoff: float = 10.0):
+        self.url = url
+        self.max_backoff = max_backoff
+        self.session: Optional[ClientSession] = None
+        self.ws = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._connect_lock = asyncio.Lock()
+        self._send_lock = asyncio.Lock()
+        self._ids = itertools.count(1)
+        self._pending: Dict[str, Tuple[asyncio.Future, asyncio.Future]] = {}
+        self._runs: Dict[str, asyncio.Future] = {}
+        self.stats = {"connects": 0, "requests": 0, "failures": 0}
+
+    @property
+    def connected(self) -> bool:
+        return self.ws is not None and not self.ws.closed
+
+    async def _handshake(self, ws, deadline: float) -> None:
+        loop = asyncio.get_running_loop()
+        request_id = f"connect-{next(self._ids)}"
+        await ws.send_json({
+            "type": "req",
+            "id": request_id,
+            "method": "connect",
+            "params": {
+                "minProtocol": 3,
+                "maxProtocol": 3,
+                "auth": {"token": _load_gateway_token()},
+                "client": {
+                    "id": "webchat",
+                    "version": "1.0.0",
+                    "platform": "python",
+                    "mode": "webchat"
                 }
-            })
+            }
+        })
+
+        # Wait for connect response; a gateway that never answers must not hold the connect lock
+        while True:
+            msg = await ws.receive(timeout=max(0.0, deadline - loop.time()))
+            if msg.type != WSMsgType.TEXT:
+                raise ConnectionError("Gateway connection failed")
+            data = json.loads(msg.data)
+            if data.get("type") == "res" and data.get("id") == request_id:
+                if not data.get("ok"):
+                    raise PermissionError(data.get("error", {}).get("message", "Gateway connect failed"))
+                return
+
+    async def connect(self, deadline: float) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            await asyncio.wait_for(self._connect_lock.acquire(), max(0.0, deadline - loop.time()))
+        except asyncio.TimeoutError:
+            raise ConnectionError("Timed out waiting for the gateway connection") from None
+        try:
+            await self._connect_locked(loop, deadline)
+        finally:
+            self._connect_lock.release()
+
+    async def _connect_locked(self, loop: asyncio.AbstractEventLoop, deadline: float) -> None:
+        if self.connected:
+            return
+        if self.session is None or self.session.closed:
+            self.session = ClientSession(timeout=ClientTimeout(total=30))
+
+        delay = 0.25
+        while True:
+            ws = None
+            try:
+                ws = await asyncio.wait_for(self.session.ws_connect(self.url, heartbeat=30),
+                                            max(0.0, deadline - loop.time()))
+                await self._handshake(ws, deadline)
+            except PermissionError:
+                if ws is not None:
+                    await ws.close()
+                raise
+            except Exception as exc:
+                if ws is not None:
+                    await ws.close()
+                if loop.time() + delay >= deadline:
+                    raise ConnectionError(f"Gateway unreachable: {str(exc) or type(exc).__name__}") from exc
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.max_backoff)
+                continue
 
-            # Wait for connect response
-            connect_ok = False
-            while True:
-                msg = await ws.receive()
+            self.ws = ws
+            self.stats["connects"] += 1
+            self._reader_task = asyncio.create_task(self._read_loop(ws))
+            return
+
+    async def _read_loop(self, ws) -> None:
+        try:
+            async for msg in ws:
                 if msg.type != WSMsgType.TEXT:
-                    raise RuntimeError("Gateway connection failed")
+                    continue
                 data = json.loads(msg.data)
-                if data.get("type") == "res" and data.get("id") == "connect-1":
+
+                if data.get("type") == "res":
+                    pending = self._pending.get(str(data.get("id", "")))
+                    if pending is None:
+                        continue
+                    ack, final = pending
                     if not data.get("ok"):
-                        raise RuntimeError(data.get("error", {}).get("message", "Gateway connect failed"))
-                    connect_ok = True
-                    break
+                        if not ack.done():
+                            ack.set_exception(RuntimeError(data.get("error", {}).get("message", "chat.send failed")))
+                        continue
+                    run_id = (data.get("payload") or {}).get("runId")
+                    # Register before resolving so no event for this run can slip past
+                    if run_id:
+                        self._runs[run_id] = final
+                    if not ack.done():
+                        ack.set_result(run_id)
 
-            if not connect_ok:
-                raise RuntimeError("Gateway connect failed")
-
-            # Send chat
-            await ws.send_json({
-                "type": "req",
-                "id": "chat-1",
-                "method": "chat.send",
-                "params": {
-                    "sessionKey": session_key,
-                    "message": message,
-                    "idempotencyKey": idempotency_key
-                }
-            })
-
-            run_id = None
-            final_text = ""
-
-            while True:
-                msg = await ws.receive()
-                if msg.type == WSMsgType.TEXT:
-                    data = json.loads(msg.data)
-                    print(f"DEBUG: Received: {data}")
-
-                    if data.get("type") == "res" and str(data.get("id", "")).startswith("chat-"):
-                        if not data.get("ok"):
-                            raise RuntimeError(data.get("error", {}).get("message", "chat.send failed"))
-                        run_id = (data.get("payload") or {}).get("runId")
-
-                    if data.get("type") == "event" and data.get("event") == "chat":
-                        payload = data.get("payload") or {}
-                        if payload.get("state") == "final":
-                            print(f"DEBUG: Final payload: {payload}")
-                            content = payload.get("message", {}).get("content", [])
-                            texts = []
-                            for part in content:
-                                if isinstance(part, dict) and part.get("type") == "text":
-                                    texts.append(part.get("text", ""))
-                            final_text = "".join(texts).strip()
-                            break
-                elif msg.type in (WSMsgType.CLOSE, WSMsgType.ERROR):
-                    break
+                elif data.get("type") == "event" and data.get("event") == "chat":
+                    payload = data.get("payload") or {}
+                    if payload.get("state") != "final":
+                        continue
+                    final = self._runs.pop(payload.get("runId"), None)
+                    if final is not None and not final.done():
+                        final.set_result(_final_text(payload))
+        finally:
+            if self.ws is ws:
+                self.ws = None
+            error = ConnectionError("Gateway connection closed")
+            for ack, final in self._pending.values():
+                for future in (ack, final):
+                    if not future.done():
+                        future.set_exception(error)
+            self._pending.clear()
+            self._runs.clear()
+
+    async def chat(self, message: str, session_key: str, idempotency_key: str, timeout: int = 30) -> dict:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        self.stats["requests"] += 1
 
+        request_id = f"chat-{next(self._ids)}"
+        ack = loop.create_future()
+        final = loop.create_future()
+        try:
+            await self.connect(deadline)
+            self._pending[request_id] = (ack, final)
+            async with self._send_lock:
+                await self.ws.send_json({
+                    "type": "req",
+                    "id": request_id,
+                    "method": "chat.send",
+                    "params": {
+                        "sessionKey": session_key,
+                        "message": message,
+                        "idempotencyKey": idempotency_key
+                    }
+                })
+            run_id = await asyncio.wait_for(ack, max(0.0, deadline - loop.time()))
+            final_text = await asyncio.wait_for(final, max(0.0, deadline - loop.time()))
             return {"ok": True, "content": final_text, "runId": run_id}
+        except Exception:
+            self.stats["failures"] += 1
+            raise
         finally:
-            await ws.close()
+            self._pending.pop(request_id, None)
+            for future in (ack, final):
+                # Mark failures nobody awaited as retrieved
+                if future.done() and not future.cancelled():
+                    future.exception()
+            for run_id, future in list(self._runs.items()):
+                if future is final:
+                    del self._runs[run_id]
+
+    async def close(self) -> None:
+        if self.ws is not None:
+            await self.ws.close()
+        if self._reader_task is not None:
+            await asyncio.gather(self._reader_task, return_exceptions=True)
+        if self.session is not None:
+            await self.session.close()
 
 
 async def handle_health(request: web.Request) -> web.Response:
@@ -151,14 +274,20 @@ async def handle_chat(request: web.Request) -> web.Response:
     idempotency_key = data.get("idempotencyKey") or f"idem-{int(asyncio.get_event_loop().time()*1000)}"
 
     try:
-        result = await _gateway_chat(message, session_key, idempotency_key)
+        result = await request.app["gateway"].chat(message, session_key, idempotency_key)
         return web.json_response(result)
     except Exception as exc:
         return web.json_response({"ok": False, "error": str(exc)}, status=500)
 
 
+async def _close_gateway(app: web.Application) -> None:
+    await app["gateway"].close()
+
+
 def create_app() -> web.Application:
     app = web.Application()
+    app["gateway"] = GatewayClient(DEFAULT_GATEWAY_URL)
+    app.on_cleanup.append(_close_gateway)
     app.router.add_get("/health", handle_health)
     app.router.add_post("/codex/chat", handle_chat)
     return app
@@ -16,8 +16,12 @@ def exec_command(cmd):
     except Exception as e:
         print(f"[ERROR]: Execution failed. {e}")
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        exec_command(" ".join(sys.argv[1:]))
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        exec_command(" ".join(argv))
     else:
         print("[ERROR]: No command specified.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,239 @@
+import os
+import sys
+import json
+import time
+import codecs
+import atexit
+import asyncio
+import hashlib
+import threading
+from html.parser import HTMLParser
+
+import aiohttp
+
+# Shared page fetcher for the shadow skills.
+# One aiohttp session (pooled per host) lives on a background event loop, so
+# when the skills run warm inside AetherPod every /scan and /summarize reuses
+# the same connections. Pages are revalidated with ETag/Last-Modified against
+# an on-disk cache, and HTML is converted to text while it streams in.
+
+WORKSPACE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DIR = os.path.join(WORKSPACE_ROOT, "evidence_locker", "fetch_cache")
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) RIN/3.0"
+TEXT_BUDGET = 10000
+PER_HOST = 4
+TIMEOUT = 10
+CHUNK_BYTES = 16 * 1024
+
+SKIP_TAGS = {"script", "style", "noscript", "template"}
+BREAK_TAGS = {"p", "div", "br", "li", "tr", "h1", "h2", "h3", "h4", "h5", "h6",
+              "section", "article", "header", "footer", "title", "pre", "blockquote"}
+
+class TextExtractor(HTMLParser):
+    """Incremental HTML-to-text. feed() chunks until done is set."""
+    def __init__(self, budget=TEXT_BUDGET):
+        super().__init__(convert_charrefs=True)
+        self.budget = budget
+        self.lines = []
+        self.size = 0
+        self.current = []
+        self.skip = 0
+        self.done = False
+
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIP_TAGS:
+            self.skip += 1
+        elif tag in BREAK_TAGS:
+            self.newline()
+
+    def handle_endtag(self, tag):
+        if tag in SKIP_TAGS:
+            self.skip = max(0, self.skip - 1)
+        elif tag in BREAK_TAGS:
+            self.newline()
+
+    def handle_data(self, data):
+        if self.skip or self.done:
+            return
+        for i, part in enumerate(data.split("\n")):
+            if i:
+                self.newline()
+            self.current.append(part)
+
+    def newline(self):
+        line = "".join(self.current)
+        self.current = []
+        # Same cleanup summarize.py always did: strip, split on double spaces, drop blanks
+        for phrase in line.strip().split("  "):
+            phrase = phrase.strip()
+            if phrase and not self.done:
+                self.lines.append(phrase)
+                self.size += len(phrase) + 1
+                if self.size >= self.budget:
+                    self.done = True
+
+    def text(self):
+        if not self.done:
+            self.newline()
+        return "\n".join(self.lines)[:self.budget]
+
+class FetchResult:
+    def __init__(self, url, status=None, headers=None, text="", elapsed_ms=0.0, cached=False, error=None):
+        self.url = url
+        self.status = status
+        self.headers = headers or {}
+        self.text = text
+        self.elapsed_ms = elapsed_ms
+        self.cached = cached
+        self.error = error
+
+class PageFetcher:
+    def __init__(self, cache_dir=None, per_host=PER_HOST, timeout=TIMEOUT):
+        self.cache_dir = cache_dir or CACHE_DIR
+        self.per_host = per_host
+        self.timeout = timeout
+        self.session = None
+
+    async def open(self):
+        if self.session is None or self.session.closed:
+            self.session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit_per_host=self.per_host, keepalive_timeout=60),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={"User-Agent": USER_AGENT},
+            )
+        return self.session
+
+    async def close(self):
+        if self.session is not None:
+            await self.session.close()
+            self.session = None
+
+    # -- disk cache -----------------------------------------------------------
+
+    def cache_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest() + ".json")
+
+    def load_cached(self, url):
+        try:
+            with open(self.cache_path(url), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def save_cached(self, url, entry):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = self.cache_path(url)
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(entry, f)
+        os.replace(tmp, path)
+
+    # -- fetching -------------------------------------------------------------
+
+    async def fetch(self, url, budget=TEXT_BUDGET):
+        """GET url and return its text, revalidating a cached copy when there is one."""
+        session = await self.open()
+        cached = self.load_cached(url)
+        usable = cached and (cached.get("complete") or len(cached.get("text", "")) >= budget)
+        headers = {}
+        if usable:
+            if cached.get("etag"):
+                headers["If-None-Match"] = cached["etag"]
+            if cached.get("last_modified"):
+                headers["If-Modified-Since"] = cached["last_modified"]
+
+        start = time.perf_counter()
+        try:
+            async with session.get(url, headers=headers) as resp:
+                if resp.status == 304 and usable:
+                    return FetchResult(url, 304, dict(resp.headers), cached["text"][:budget],
+                                       (time.perf_counter() - start) * 1000, cached=True)
+                extractor = TextExtractor(budget)
+                decoder = _decoder_for(resp)
+                async for chunk in resp.content.iter_chunked(CHUNK_BYTES):
+                    extractor.feed(decoder.decode(chunk))
+                    if extractor.done:
+                        break
+                complete = not extractor.done
+                if complete:
+                    extractor.feed(decoder.decode(b"", final=True))
+                    extractor.close()
+                text = extractor.text()
+                elapsed = (time.perf_counter() - start) * 1000
+                if resp.status == 200 and (resp.headers.get("ETag") or resp.headers.get("Last-Modified")):
+                    self.save_cached(url, {
+                        "etag": resp.headers.get("ETag"),
+                        "last_modified": resp.headers.get("Last-Modified"),
+                        "complete": complete,
+                        "text": text,
+                    })
+                return FetchResult(url, resp.status, dict(resp.headers), text, elapsed)
+        except Exception as e:
+            return FetchResult(url, elapsed_ms=(time.perf_counter() - start) * 1000, error=e)
+
+    async def fetch_headers(self, url):
+        """Status and headers only; the body is never read."""
+        session = await self.open()
+        start = time.perf_counter()
+        try:
+            async with session.get(url) as resp:
+                return FetchResult(url, resp.status, dict(resp.headers), "",
+                                   (time.perf_counter() - start) * 1000)
+        except Exception as e:
+            return FetchResult(url, elapsed_ms=(time.perf_counter() - start) * 1000, error=e)
+
+    async def fetch_many(self, urls, budget=TEXT_BUDGET):
+        return await asyncio.gather(*(self.fetch(url, budget) for url in urls))
+
+def _decoder_for(resp):
+    charset = resp.charset or "utf-8"
+    try:
+        return codecs.getincrementaldecoder(charset)(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+# -- synchronous entry points for the skill scripts -------------------------
+
+_loop = None
+_fetcher = None
+_lock = threading.Lock()
+
+def _run(coro_fn):
+    global _loop, _fetcher
+    with _lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="shadow-fetch", daemon=True).start()
+            _fetcher = PageFetcher()
+            atexit.register(_shutdown)
+    return asyncio.run_coroutine_threadsafe(coro_fn(_fetcher), _loop).result()
+
+def _shutdown():
+    try:
+        asyncio.run_coroutine_threadsafe(_fetcher.close(), _loop).result(timeout=2)
+    except Exception:
+        pass
+
+def fetch_text(url, budget=TEXT_BUDGET):
+    return _run(lambda f: f.fetch(url, budget))
+
+def fetch_texts(urls, budget=TEXT_BUDGET):
+    return _run(lambda f: f.fetch_many(urls, budget))
+
+def fetch_headers(url):
+    return _run(lambda f: f.fetch_headers(url))
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
+        print("Usage: python fetcher.py <url> [<url> ...]")
+        return
+    for res in fetch_texts(argv):
+        if res.error:
+            print(f"[ERROR]: Could not fetch {res.url}: {res.error}")
+            continue
+        print(f"--- EXTRACTED CONTENT FROM {res.url} ({res.status}, {round(res.elapsed_ms, 2)}ms) ---")
+        print(res.text)
+
+if __name__ == "__main__":
+    main()
@@ -15,10 +15,14 @@ def forge_file(filename, content):
         f.write(content)
     print(f"--- [FORGE_COMPLETE]: {filename} manifested in the Data River. ---")
 
-if __name__ == "__main__":
-    if len(sys.argv) > 2:
-        filename = sys.argv[1]
-        content = sys.argv[2]
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if len(argv) > 1:
+        filename = argv[0]
+        content = argv[1]
         forge_file(filename, content)
     else:
         print("[ERROR]: /forge requires <filename> and <content>.")
+
+if __name__ == "__main__":
+    main()
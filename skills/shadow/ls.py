@@ -19,6 +19,10 @@ def list_files(target="."):
         is_dir = "[DIR]" if os.path.isdir(os.path.join(target_path, item)) else "     "
         print(f"{is_dir} {item}")
 
-if __name__ == "__main__":
-    path = sys.argv[1] if len(sys.argv) > 1 else "."
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else "."
     list_files(path)
+
+if __name__ == "__main__":
+    main()
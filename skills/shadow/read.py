@@ -21,8 +21,12 @@ def read_file(target):
     with open(target_path, "r", encoding="utf-8", errors="ignore") as f:
         print(f.read())
 
-if __name__ == "__main__":
-    if len(sys.argv) > 1:
-        read_file(sys.argv[1])
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv:
+        read_file(argv[0])
     else:
         print("[ERROR]: No file target specified.")
+
+if __name__ == "__main__":
+    main()
@@ -2,10 +2,10 @@ import argparse
 import sys
 import os
 import datetime
-import urllib.request
 import time
 import google.generativeai as genai
 import ollama
+from fetcher import fetch_headers
 
 # Configuration
 WORKSPACE_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -78,33 +78,29 @@ def scan_target(url):
     print(f">> [RIN]: Scanning target: {url}")
     log_message(f"Initiated scan on {url}", "ACTION")
     
-    try:
-        headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) RIN/3.0'}
-        req = urllib.request.Request(url, headers=headers)
-        
-        start_time = time.time()
-        with urllib.request.urlopen(req) as response:
-            end_time = time.time()
-            duration = round((end_time - start_time) * 1000, 2)
-            
-            status_msg = f"Target {url} responded: {response.getcode()} in {duration}ms"
-            print(f">> {status_msg}")
-            log_message(status_msg, "SUCCESS")
-            
-            # Save headers
-            header_dump = f"Head Scan for {url}:\n"
-            for key, value in response.headers.items():
-                header_dump += f"{key}: {value}\n"
-                
-            dump_file = os.path.join(EVIDENCE_LOCKER, f"scan_{int(time.time())}.txt")
-            with open(dump_file, "w", encoding="utf-8") as f:
-                f.write(header_dump)
-            print(f">> [DUMP]: Headers saved to {dump_file}")
-
-    except Exception as e:
-        error_msg = f"Scan failed for {url}: {e}"
+    res = fetch_headers(url)
+    if res.error is None and res.status >= 400:
+        res.error = f"HTTP Error {res.status}"
+    if res.error:
+        error_msg = f"Scan failed for {url}: {res.error}"
         print(f">> [ERROR]: {error_msg}")
         log_message(error_msg, "ERROR")
+        return
+
+    duration = round(res.elapsed_ms, 2)
+    status_msg = f"Target {url} responded: {res.status} in {duration}ms"
+    print(f">> {status_msg}")
+    log_message(status_msg, "SUCCESS")
+
+    # Save headers
+    header_dump = f"Head Scan for {url}:\n"
+    for key, value in res.headers.items():
+        header_dump += f"{key}: {value}\n"
+
+    dump_file = os.path.join(EVIDENCE_LOCKER, f"scan_{int(time.time())}.txt")
+    with open(dump_file, "w", encoding="utf-8") as f:
+        f.write(header_dump)
+    print(f">> [DUMP]: Headers saved to {dump_file}")
 
 def scan_visual(url):
     """Visual reconnaissance using Selenium."""
@@ -179,7 +175,7 @@ def check_status():
     else:
         print("   [LOG]: Not initialized")
 
-def main():
+def main(argv=None):
     parser = argparse.ArgumentParser(description="RIN: Grey Hat Operations CLI")
     subparsers = parser.add_subparsers(dest="command", help="Available commands")
 
@@ -200,7 +196,7 @@ def main():
     chat_parser.add_argument("query", help="Question for the agent")
     chat_parser.add_argument("--local", action="store_true", help="Use local Ollama model (Private)")
 
-    args = parser.parse_args()
+    args = parser.parse_args(argv)
 
     if args.command == "scan":
         if args.visual:
@@ -1,8 +1,7 @@
 
 import sys
-import requests
-from bs4 import BeautifulSoup
 import os
+from fetcher import fetch_texts, TEXT_BUDGET
 
 # We can reuse the `ask_rin_api` logic? No, that's in server.py.
 # However, this script is called by server.py via subprocess.
@@ -10,35 +9,29 @@ import os
 # Or we can have this script perform the extraction AND the summarization if it has keys.
 # Let's start with EXTRACTION.
 
-def fetch_text(url):
-    try:
-        headers = {'User-Agent': 'Mozilla/5.0'}
-        r = requests.get(url, headers=headers, timeout=10)
-        soup = BeautifulSoup(r.text, 'html.parser')
-        
-        # Kill script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-            
-        text = soup.get_text()
-        
-        # Break into lines and remove leading and trailing space on each
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        return text[:10000] # Limit to 10k chars for now
-    except Exception as e:
-        return f"[ERROR]: Could not fetch {url}: {e}"
+def fetch_text(url, budget=TEXT_BUDGET):
+    """Page text, cut off at budget chars (see fetcher.py)."""
+    return fetch_many([url], budget)[0]
 
-if __name__ == "__main__":
-    if len(sys.argv) < 2:
+def fetch_many(urls, budget=TEXT_BUDGET):
+    results = []
+    for res in fetch_texts(urls, budget):
+        if res.error:
+            results.append(f"[ERROR]: Could not fetch {res.url}: {res.error}")
+        else:
+            results.append(res.text)
+    return results
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv:
         print("Usage: python summarize.py <url>")
         sys.exit(1)
         
-    url = sys.argv[1]
-    raw_text = fetch_text(url)
-    print(f"--- EXTRACTED CONTENT FROM {url} ---")
-    print(raw_text)
+    # Several URLs are fetched in parallel
+    for url, raw_text in zip(argv, fetch_many(argv)):
+        print(f"--- EXTRACTED CONTENT FROM {url} ---")
+        print(raw_text)
+
+if __name__ == "__main__":
+    main()
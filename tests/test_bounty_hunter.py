@@ -0,0 +1,174 @@
+import asyncio
+import importlib
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+
+@pytest.fixture(scope="module")
+def hunter_module(tmp_path_factory):
+    # The script opens its log file in the working directory on import
+    cwd = os.getcwd()
+    os.chdir(tmp_path_factory.mktemp("bounty_hunter"))
+    try:
+        return importlib.import_module("clawtasks_bounty_hunter")
+    finally:
+        os.chdir(cwd)
+
+
+def bounty(bounty_id, amount, title="python script"):
+    return {"id": bounty_id, "amount": amount, "title": title, "description": "", "tags": []}
+
+
+class Board:
+    """Fake ClawTasks API and model wired onto a hunter instance"""
+
+    def __init__(self, hunter, bounties, refuse=()):
+        self.bounties = bounties
+        self.refuse = set(refuse)
+        self.claimed, self.submitted = [], []
+        self.solving = asyncio.Event()
+        self.solving.set()
+        hunter.get_open_bounties = self.get_open_bounties
+        hunter.claim_bounty = self.claim_bounty
+        hunter.solve_bounty = self.solve_bounty
+        hunter.submit_solution = self.submit_solution
+
+    async def get_open_bounties(self):
+        return list(self.bounties)
+
+    async def claim_bounty(self, bounty_id):
+        self.claimed.append(bounty_id)
+        return None if bounty_id in self.refuse else {"id": bounty_id}
+
+    async def solve_bounty(self, bounty):
+        await self.solving.wait()
+        return f"solution {bounty['id']}"
+
+    async def submit_solution(self, bounty_id, solution, bounty=None):
+        self.submitted.append((bounty_id, solution))
+        return True
+
+
+@pytest.fixture
+def hunter(hunter_module):
+    return hunter_module.ClawTasksBountyHunter("mock-key", "0xwallet")
+
+
+async def drain(hunter):
+    for queue in (hunter.claim_queue, hunter.solve_queue, hunter.submit_queue):
+        await queue.join()
+
+
+def run_pipeline(hunter, scenario):
+    async def main():
+        workers = hunter.start_pipeline()
+        try:
+            return await asyncio.wait_for(scenario(), 5)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+    return asyncio.run(main())
+
+
+def test_pipeline_claims_best_first_and_remembers_every_outcome(hunter):
+    hunter.claim_workers = 1
+    board = Board(hunter, [bounty("small", 6), bounty("big", 40), bounty("taken", 20),
+                           bounty("off-topic", 30, title="gardening"), bounty("huge", 500)],
+                  refuse={"taken"})
+
+    async def scenario():
+        queued = await hunter.fetch_and_triage()
+        await drain(hunter)
+        return queued
+
+    assert run_pipeline(hunter, scenario) == 3
+    assert board.claimed == ["big", "taken", "small"]
+    assert sorted(board.submitted) == [("big", "solution big"), ("small", "solution small")]
+    assert hunter.in_flight == set()
+    assert set(hunter.recently_seen) == {"small", "big", "taken", "off-topic", "huge"}
+    assert hunter.stats["last_poll_time"] is not None
+
+
+def test_bounties_in_flight_are_not_queued_again(hunter):
+    board = Board(hunter, [bounty("a", 10), bounty("b", 20)])
+    board.solving.clear()
+
+    async def scenario():
+        first = await hunter.fetch_and_triage()
+        await hunter.claim_queue.join()
+        # Both are claimed and stuck in the solver; the next poll sees the same board
+        second = await hunter.fetch_and_triage()
+        in_flight = set(hunter.in_flight)
+        board.solving.set()
+        await drain(hunter)
+        third = await hunter.fetch_and_triage()
+        return first, second, in_flight, third
+
+    first, second, in_flight, third = run_pipeline(hunter, scenario)
+    assert (first, second, third) == (2, 0, 0)
+    assert in_flight == {"a", "b"}
+    assert board.claimed == ["b", "a"] and len(board.submitted) == 2
+
+
+def test_full_claim_queue_leaves_the_rest_for_the_next_poll(hunter):
+    Board(hunter, [bounty(f"b{i}", 10 + i) for i in range(5)])
+
+    async def main():
+        # No workers: the claim queue fills up and stays full
+        hunter.claim_queue = asyncio.Queue(maxsize=2)
+        first = await asyncio.wait_for(hunter.fetch_and_triage(), 1)
+        taken = [hunter.claim_queue.get_nowait()["id"] for _ in range(2)]
+        second = await asyncio.wait_for(hunter.fetch_and_triage(), 1)
+        return first, taken, second, [hunter.claim_queue.get_nowait()["id"] for _ in range(2)]
+
+    first, taken, second, later = asyncio.run(main())
+    assert (first, second) == (2, 2)
+    assert taken == ["b4", "b3"] and later == ["b2", "b1"]
+    assert hunter.in_flight == {"b1", "b2", "b3", "b4"}
+    assert "b0" not in hunter.recently_seen
+
+
+def test_recently_seen_entries_expire_after_the_ttl(hunter):
+    hunter.recently_seen_ttl = 600
+    for bounty_id, at in [("old", 1000.0), ("edge", 1401.0), ("new", 1900.0)]:
+        hunter._remember(bounty_id)
+        hunter.recently_seen[bounty_id] = at
+
+    hunter._expire_seen(2000.0)
+    assert list(hunter.recently_seen) == ["edge", "new"]
+    hunter._expire_seen(2001.0)  # exactly recently_seen_ttl old
+    assert list(hunter.recently_seen) == ["new"]
+
+    # An expired bounty is triaged again on the next poll
+    board = Board(hunter, [bounty("old", 10), bounty("new", 12)])
+    hunter.recently_seen["new"] = time.time()
+
+    async def main():
+        hunter.claim_queue = asyncio.Queue()
+        return await hunter.fetch_and_triage()
+
+    assert asyncio.run(main()) == 1
+    assert hunter.in_flight == {"old"} and board.claimed == []
+
+
+def test_recently_seen_is_bounded(hunter):
+    hunter.recently_seen_limit = 3
+    for i in range(5):
+        hunter._remember(f"b{i}")
+    assert list(hunter.recently_seen) == ["b2", "b3", "b4"]
+
+
+def test_poll_interval_drops_on_new_bounties_and_backs_off_when_quiet(hunter):
+    assert hunter.poll_interval == hunter.poll_interval_max == 30
+    assert hunter.next_poll_interval(3) == 10
+    assert [hunter.next_poll_interval(0) for _ in range(4)] == [15, 22.5, 30, 30]
+    assert hunter.next_poll_interval(1) == 10
@@ -0,0 +1,150 @@
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from aiohttp import WSMsgType, web
+from aiohttp.test_utils import TestServer
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[1] / "scripts"
+if str(SCRIPTS_DIR) not in sys.path:
+    sys.path.insert(0, str(SCRIPTS_DIR))
+
+from codex_bridge import GatewayClient  # noqa: E402
+
+
+class GatewayStub:
+    """Websocket gateway: replies to chat.send with `echo <message>` after a per-message delay.
+
+    Messages look like "<delay>:<text>"; "<delay>:drop" closes the socket instead of replying.
+    """
+
+    def __init__(self, refuse=0, answer_connect=True):
+        self.refuse = refuse                  # upgrade attempts to reject before accepting
+        self.answer_connect = answer_connect  # False: a gateway that never finishes the handshake
+        self.attempts = 0
+        self.sockets = 0
+        self.tokens = []
+
+    async def handle(self, request):
+        self.attempts += 1
+        if self.attempts <= self.refuse:
+            raise web.HTTPServiceUnavailable()
+        ws = web.WebSocketResponse()
+        await ws.prepare(request)
+        self.sockets += 1
+        replies = set()
+        async for msg in ws:
+            if msg.type != WSMsgType.TEXT:
+                continue
+            data = json.loads(msg.data)
+            if data["method"] == "connect":
+                self.tokens.append(data["params"]["auth"]["token"])
+                if self.answer_connect:
+                    await ws.send_json({"type": "res", "id": data["id"], "ok": True})
+            elif data["method"] == "chat.send":
+                replies.add(asyncio.create_task(self.reply(ws, data)))
+        for task in replies:
+            task.cancel()
+        return ws
+
+    async def reply(self, ws, data):
+        delay, text = data["params"]["message"].split(":", 1)
+        run_id = f"run-{data['id']}"
+        await ws.send_json({"type": "res", "id": data["id"], "ok": True, "payload": {"runId": run_id}})
+        await asyncio.sleep(float(delay))
+        if text == "drop":
+            await ws.close()
+            return
+        await ws.send_json({"type": "event", "event": "chat", "payload": {"runId": run_id, "state": "delta"}})
+        await ws.send_json({"type": "event", "event": "chat", "payload": {
+            "runId": run_id, "state": "final",
+            "message": {"content": [{"type": "text", "text": f"echo {text}"}]}}})
+
+
+@pytest.fixture(autouse=True)
+def token(monkeypatch):
+    monkeypatch.setenv("MOLTBOT_GATEWAY_TOKEN", "test-token")
+
+
+def run_with_gateway(stub, scenario):
+    async def main():
+        app = web.Application()
+        app.router.add_get("/", stub.handle)
+        server = TestServer(app)
+        await server.start_server()
+        client = GatewayClient(str(server.make_url("/")).replace("http", "ws", 1), max_backoff=0.05)
+        try:
+            return await scenario(client)
+        finally:
+            await client.close()
+            await server.close()
+    return asyncio.run(main())
+
+
+def test_concurrent_requests_share_one_socket():
+    stub = GatewayStub()
+
+    async def scenario(client):
+        # The slow reply finishes last but still reaches its own caller
+        return await asyncio.gather(client.chat("0.2:slow", "s", "k1"), client.chat("0:fast", "s", "k2"),
+                                    client.chat("0.1:mid", "t", "k3"))
+
+    results = run_with_gateway(stub, scenario)
+    assert [r["content"] for r in results] == ["echo slow", "echo fast", "echo mid"]
+    assert len({r["runId"] for r in results}) == 3
+    assert stub.sockets == 1 and stub.tokens == ["test-token"]
+
+
+def test_reconnects_with_backoff_until_the_gateway_accepts():
+    stub = GatewayStub(refuse=3)
+
+    async def scenario(client):
+        result = await client.chat("0:hello", "s", "k", timeout=5)
+        return result, client.stats
+
+    result, stats = run_with_gateway(stub, scenario)
+    assert result["content"] == "echo hello"
+    assert stub.attempts == 4 and stats["connects"] == 1
+
+
+def test_dropped_socket_fails_in_flight_requests_and_next_request_reconnects():
+    stub = GatewayStub()
+
+    async def scenario(client):
+        waiting = asyncio.create_task(client.chat("5:never", "s", "k1", timeout=10))
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        with pytest.raises(ConnectionError):
+            await client.chat("0.05:drop", "t", "k2", timeout=10)
+        with pytest.raises(ConnectionError):
+            await waiting
+        failed_after = time.monotonic() - started
+        after = await client.chat("0:again", "s", "k3")
+        return failed_after, after, client
+
+    failed_after, after, client = run_with_gateway(stub, scenario)
+    assert failed_after < 1
+    assert after["content"] == "echo again"
+    assert stub.sockets == 2 and client.stats["connects"] == 2
+    assert client._pending == {} and client._runs == {}
+
+
+def test_silent_gateway_fails_each_request_by_its_own_deadline():
+    stub = GatewayStub(answer_connect=False)
+
+    async def scenario(client):
+        async def timed(timeout):
+            started = time.monotonic()
+            with pytest.raises(ConnectionError):
+                await client.chat("0:hi", "s", f"k{timeout}", timeout=timeout)
+            return time.monotonic() - started
+
+        # The second request waits on the connect lock held by the first one's handshake
+        return await asyncio.gather(timed(1), timed(0.5))
+
+    first, second = run_with_gateway(stub, scenario)
+    assert 0.9 <= first < 2
+    assert 0.4 <= second < 1
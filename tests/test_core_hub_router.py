@@ -0,0 +1,184 @@
+import asyncio
+import sys
+from pathlib import Path
+
+IDE_DIR = Path(__file__).resolve().parents[1] / "personal-ide"
+if str(IDE_DIR) not in sys.path:
+    sys.path.insert(0, str(IDE_DIR))
+
+from integration.CORE_HUB import (ComponentRegistry, ComponentType, DestinationQueue, Message,  # noqa: E402
+                                  MessageRouter, OverflowPolicy, RoutePolicy)
+
+
+def msg(message_id, priority=1, source="src", destination="dest", message_type=None):
+    content = {"type": message_type} if message_type else {}
+    return Message(id=message_id, source=source, destination=destination, content=content, priority=priority)
+
+
+async def drain(queue):
+    ids = []
+    while len(queue):
+        ids.append((await queue.get()).id)
+        queue.task_done()
+    return ids
+
+
+def test_higher_priority_first_fifo_within_priority():
+    async def run():
+        queue = DestinationQueue("dest", RoutePolicy())
+        for message_id, priority in [("a", 1), ("b", 5), ("c", 3), ("d", 5), ("e", 1)]:
+            assert await queue.put(msg(message_id, priority))
+        return await drain(queue)
+
+    assert asyncio.run(run()) == ["b", "d", "c", "a", "e"]
+
+
+def test_drop_oldest_evicts_oldest_lowest_priority():
+    async def run():
+        queue = DestinationQueue("dest", RoutePolicy(max_queue=3, overflow=OverflowPolicy.DROP_OLDEST))
+        for message_id, priority in [("a", 2), ("b", 1), ("c", 1)]:
+            await queue.put(msg(message_id, priority))
+        assert await queue.put(msg("d", 1))       # evicts b
+        assert await queue.put(msg("e", 3))       # evicts c
+        assert await queue.put(msg("f", 2))       # evicts d
+        assert not await queue.put(msg("g", 1))   # everything queued outranks it
+        assert queue.dropped == 4
+        return await drain(queue)
+
+    assert asyncio.run(run()) == ["e", "a", "f"]
+
+
+def test_drop_newest_rejects_incoming():
+    async def run():
+        queue = DestinationQueue("dest", RoutePolicy(max_queue=2, overflow=OverflowPolicy.DROP_NEWEST))
+        assert await queue.put(msg("a"))
+        assert await queue.put(msg("b"))
+        assert not await queue.put(msg("c", priority=5))
+        assert queue.dropped == 1
+        return await drain(queue)
+
+    assert asyncio.run(run()) == ["a", "b"]
+
+
+def test_block_waits_for_room():
+    async def run():
+        queue = DestinationQueue("dest", RoutePolicy(max_queue=1, overflow=OverflowPolicy.BLOCK))
+        await queue.put(msg("a"))
+        blocked = asyncio.create_task(queue.put(msg("b")))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+        assert (await queue.get()).id == "a"
+        queue.task_done()
+        assert await asyncio.wait_for(blocked, 1)
+        assert queue.dropped == 0
+        return await drain(queue)
+
+    assert asyncio.run(run()) == ["b"]
+
+
+def test_coalescing_by_source_and_type():
+    async def run():
+        queue = DestinationQueue("dest", RoutePolicy(coalesce_types=("emotion_update",)))
+        await queue.put(msg("e1", source="vision", message_type="emotion_update"))
+        await queue.put(msg("other", source="vision", message_type="chat"))
+        await queue.put(msg("e2", source="vision", message_type="emotion_update"))
+        await queue.put(msg("voice", source="voice", message_type="emotion_update"))
+        assert len(queue) == 3 and queue.coalesced == 1
+        first = await drain(queue)
+        # Once delivered, the next update queues normally
+        await queue.put(msg("e3", source="vision", message_type="emotion_update"))
+        return first, await drain(queue)
+
+    # The coalesced slot keeps its place in line but carries the newest update
+    assert asyncio.run(run()) == (["e2", "other", "voice"], ["e3"])
+
+
+class Flag:
+    running = True
+
+
+def make_router():
+    registry = ComponentRegistry()
+    return registry, MessageRouter(registry)
+
+
+def test_slow_handler_does_not_block_other_destinations():
+    async def run():
+        registry, router = make_router()
+        release = asyncio.Event()
+        fast_seen = asyncio.Event()
+        delivered = []
+
+        async def slow(message):
+            await release.wait()
+            delivered.append(message.id)
+
+        def fast(message):
+            delivered.append(message.id)
+            fast_seen.set()
+
+        registry.register_component("slow", slow, ComponentType.MEMORY)
+        registry.register_component("fast", fast, ComponentType.VISUAL)
+        flag = Flag()
+        processor = asyncio.create_task(router.process_messages(flag))
+        assert await router.send_message(msg("s1", destination="slow"))
+        assert await router.send_message(msg("f1", destination="fast"))
+        await asyncio.wait_for(fast_seen.wait(), 1)
+        assert delivered == ["f1"]
+
+        release.set()
+        await asyncio.wait_for(router.join(), 1)
+        flag.running = False
+        await processor
+        return delivered, router.get_metrics()["destinations"]
+
+    delivered, metrics = asyncio.run(run())
+    assert delivered == ["f1", "s1"]
+    assert metrics["slow"]["delivered"] == 1 and metrics["fast"]["delivered"] == 1
+
+
+def test_send_to_unregistered_destination_returns_false():
+    async def run():
+        _, router = make_router()
+        return await router.send_message(msg("x", destination="nobody")), router
+
+    sent, router = asyncio.run(run())
+    assert sent is False
+    assert router.get_metrics() == {"unroutable": 1, "destinations": {}}
+
+
+def test_mutually_replying_components_do_not_deadlock():
+    async def run():
+        registry, router = make_router()
+        router.default_policy = RoutePolicy(max_queue=2, overflow=OverflowPolicy.BLOCK)
+        handled = []
+
+        def replier(name, other):
+            async def handle(message):
+                handled.append(message.id)
+                hops = message.content["hops"]
+                if hops:
+                    # One reply to the peer and one note to self, sent from this component's worker
+                    for destination in (other, name):
+                        await router.send_message(Message(id=f"{message.id}>{destination}", source=name,
+                                                          destination=destination, content={"hops": hops - 1}))
+            return handle
+
+        registry.register_component("a", replier("a", "b"), ComponentType.MEMORY)
+        registry.register_component("b", replier("b", "a"), ComponentType.VOICE)
+        flag = Flag()
+        processor = asyncio.create_task(router.process_messages(flag))
+        # Outside senders still get back-pressure, so these fill both queues before the workers run
+        for i in range(4):
+            await router.send_message(Message(id=f"a{i}", source="test", destination="a", content={"hops": 4}))
+            await router.send_message(Message(id=f"b{i}", source="test", destination="b", content={"hops": 4}))
+        await asyncio.wait_for(router.join(), 2)
+        flag.running = False
+        await processor
+        return handled, router.get_metrics()["destinations"]
+
+    handled, metrics = asyncio.run(run())
+    # Both queues drained; the workers shed messages rather than waiting on each other
+    assert any(">" in message_id for message_id in handled)
+    assert metrics["a"]["dropped"] + metrics["b"]["dropped"] > 0
+    assert metrics["a"]["depth"] == metrics["b"]["depth"] == 0
@@ -0,0 +1,111 @@
+import asyncio
+import sys
+from pathlib import Path
+
+IDE_DIR = Path(__file__).resolve().parents[1] / "personal-ide"
+if str(IDE_DIR) not in sys.path:
+    sys.path.insert(0, str(IDE_DIR))
+
+from integration.CORE_HUB import ComponentRegistry, StateSynchronizer  # noqa: E402
+
+
+def make_sync(**kwargs):
+    return StateSynchronizer(ComponentRegistry(), **kwargs)
+
+
+def test_one_notification_per_tick_with_latest_values():
+    calls = []
+
+    async def run():
+        sync = make_sync()
+        sync.register_state_callback("batch", calls.append, batched=True)
+        sync.update_global_state("emotion", "calm")
+        sync.update_global_state("attention", "user")
+        sync.update_global_state("emotion", "happy")
+        assert calls == []
+        assert sync.get_global_state("emotion") == "happy"
+        await asyncio.sleep(0)
+        sync.update_global_state("emotion", "sleepy")
+        await asyncio.sleep(0)
+        return sync
+
+    sync = asyncio.run(run())
+    assert calls == [{"emotion": "happy", "attention": "user"}, {"emotion": "sleepy"}]
+    assert sync.stats == {"writes": 4, "flushes": 2, "notifications": 2}
+
+
+def test_tick_interval_merges_writes_until_it_elapses():
+    calls = []
+
+    async def run():
+        sync = make_sync(tick_interval=0.05)
+        sync.register_state_callback("batch", calls.append, batched=True)
+        sync.update_global_state("a", 1)
+        await asyncio.sleep(0)
+        sync.update_global_state("b", 2)
+        assert calls == []
+        await asyncio.sleep(0.1)
+
+    asyncio.run(run())
+    assert calls == [{"a": 1, "b": 2}]
+
+
+def test_prefix_filtering_and_per_key_delivery():
+    per_key, batched = [], []
+
+    async def run():
+        sync = make_sync()
+        sync.register_state_callback("voice", lambda key, value: per_key.append((key, value)), prefixes="emotion.")
+        sync.register_state_callback("visual", batched.append, prefixes=("emotion.", "visual."), batched=True)
+        sync.update_global_state("emotion.mood", "calm")
+        sync.update_global_state("context.topic", "mars")
+        sync.update_global_state("visual.glow", 0.5)
+        sync.update_global_state("emotion.level", 3)
+        await asyncio.sleep(0)
+        # Nothing selected for either subscriber: no calls, no notifications
+        sync.update_global_state("context.topic", "moon")
+        await asyncio.sleep(0)
+        return sync
+
+    sync = asyncio.run(run())
+    assert per_key == [("emotion.mood", "calm"), ("emotion.level", 3)]
+    assert batched == [{"emotion.mood": "calm", "visual.glow": 0.5, "emotion.level": 3}]
+    assert sync.stats["notifications"] == 2
+
+
+def test_failing_key_does_not_hide_the_rest():
+    seen = []
+
+    def callback(key, value):
+        if key == "bad":
+            raise ValueError("boom")
+        seen.append(key)
+
+    async def async_callback(key, value):
+        callback(key, value)
+
+    async def run():
+        sync = make_sync()
+        sync.register_state_callback("sync", callback)
+        sync.register_state_callback("async", async_callback)
+        for key in ("first", "bad", "last"):
+            sync.update_global_state(key, 1)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+    asyncio.run(run())
+    assert sorted(seen) == ["first", "first", "last", "last"]
+
+
+def test_delivers_synchronously_without_a_running_loop():
+    per_key, batched = [], []
+    sync = make_sync()
+    sync.register_state_callback("plain", lambda key, value: per_key.append((key, value)))
+    sync.register_state_callback("batch", batched.append, batched=True)
+
+    sync.update_global_state("emotion", "calm")
+    assert per_key == [("emotion", "calm")]
+    assert batched == [{"emotion": "calm"}]
+    sync.update_global_state("emotion", "happy")
+    assert per_key[-1] == ("emotion", "happy")
+    assert sync.stats["flushes"] == 2
@@ -0,0 +1,127 @@
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from moltbot.gateway import curator_agent  # noqa: E402
+from moltbot.gateway.curator_agent import CuratorAgent, RateLimiter  # noqa: E402
+
+
+class GatewayStub:
+    def __init__(self):
+        self.events = []
+
+    async def broadcast_event(self, event_type, payload):
+        self.events.append((event_type, payload))
+
+
+@pytest.fixture
+def agent(tmp_path):
+    agent = CuratorAgent(db_path=tmp_path / "curator.db")
+    agent.attempts = []
+
+    async def publish_post(pid, platform, caption, art_id):
+        agent.attempts.append((pid, time.time()))
+        return agent.outcomes.pop(0) if agent.outcomes else True
+
+    agent.outcomes = []
+    agent.publish_post = publish_post
+    yield agent
+    agent.close()
+
+
+def status(agent, sid):
+    return agent.get_conn().execute("SELECT status, scheduled_at FROM scheduled_posts WHERE id=?", (sid,)).fetchone()
+
+
+async def wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "timed out"
+        await asyncio.sleep(0.01)
+
+
+def run_loop(agent, scenario):
+    async def main():
+        gateway = GatewayStub()
+        loop_task = asyncio.create_task(agent.start_loop(gateway, rate_per_minute=600))
+        try:
+            await asyncio.sleep(0.05)
+            return await scenario(gateway)
+        finally:
+            loop_task.cancel()
+            await asyncio.gather(loop_task, *agent._publishing, return_exceptions=True)
+    return asyncio.run(main())
+
+
+def test_scheduling_wakes_an_idle_loop(agent):
+    art = agent.add_art_piece("piece")
+
+    async def scenario(gateway):
+        # The loop is asleep with nothing due; a new post must not wait for a poll
+        assert agent._due == []
+        started = time.monotonic()
+        sid = agent.schedule_post(art, "x", "hello")
+        await wait_for(lambda: status(agent, sid)[0] == "published")
+        return sid, time.monotonic() - started, gateway.events
+
+    sid, elapsed, events = run_loop(agent, scenario)
+    assert elapsed < 1
+    assert [pid for pid, _ in agent.attempts] == [sid]
+    assert events == [("curator", {"postId": sid, "platform": "x", "status": "published"})]
+
+
+def test_claim_stops_a_second_publish(agent):
+    sid = agent.schedule_post(agent.add_art_piece("piece"), "x", "hello")
+
+    async def main():
+        slots, limiter = asyncio.Semaphore(4), RateLimiter(600, 60.0)
+        # A stale duplicate heap entry fires alongside the real one
+        await asyncio.gather(agent._publish_scheduled(sid, None, slots, limiter),
+                             agent._publish_scheduled(sid, None, slots, limiter))
+        await agent._publish_scheduled(sid, None, slots, limiter)
+
+    asyncio.run(main())
+    assert [pid for pid, _ in agent.attempts] == [sid]
+    assert status(agent, sid)[0] == "published"
+
+
+def test_failed_publish_is_retried_after_retry_delay(agent, monkeypatch):
+    monkeypatch.setattr(curator_agent, "RETRY_DELAY", 2)
+    agent.outcomes = [False, True]
+    sid = agent.schedule_post(agent.add_art_piece("piece"), "x", "hello")
+
+    async def scenario(gateway):
+        await wait_for(lambda: len(agent.attempts) == 1)
+        await asyncio.sleep(0.05)
+        retry_status, retry_at = status(agent, sid)
+        await wait_for(lambda: status(agent, sid)[0] == "published")
+        return retry_status, retry_at
+
+    retry_status, retry_at = run_loop(agent, scenario)
+    assert retry_status == "scheduled"
+    first, second = (at for _, at in agent.attempts)
+    assert int(first) + 2 <= retry_at <= int(first) + 3
+    assert second >= retry_at
+
+
+def test_post_deleted_after_claim_is_skipped(agent):
+    sid = agent.schedule_post(agent.add_art_piece("piece"), "x", "hello")
+    # Stand-in for another connection deleting the row right after the claim
+    agent.get_conn().execute("""CREATE TRIGGER drop_on_claim AFTER UPDATE OF status ON scheduled_posts
+                                WHEN NEW.status = 'publishing'
+                                BEGIN DELETE FROM scheduled_posts WHERE id = NEW.id; END""")
+
+    async def main():
+        await agent._publish_scheduled(sid, None, asyncio.Semaphore(1), RateLimiter(600, 60.0))
+
+    asyncio.run(main())
+    assert agent.attempts == []
+    assert status(agent, sid) is None
+    assert len(agent._due) == 1  # only the original entry; no retry was queued
@@ -0,0 +1,159 @@
+import asyncio
+import json
+import sys
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+
+AGENTS_DIR = Path(__file__).resolve().parents[1] / "clawdbot_agents"
+if str(AGENTS_DIR) not in sys.path:
+    sys.path.insert(0, str(AGENTS_DIR))
+
+import feed_poller  # noqa: E402
+from feed_poller import FeedPoller, get_shared_poller, release_shared_poller  # noqa: E402
+
+T0 = datetime(2026, 5, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def post(post_id, seconds):
+    stamp = (T0 + timedelta(seconds=seconds)).isoformat().replace("+00:00", "Z")
+    return {"id": post_id, "timestamp": stamp, "content": post_id}
+
+
+def make_poller(**kwargs):
+    poller = FeedPoller("http://hub.invalid", **kwargs)
+    poller.cursor = T0
+    return poller
+
+
+def test_accept_advances_cursor_and_skips_seen_posts():
+    poller = make_poller()
+    batch = [post("b", 5), post("old", -1), post("a", 0), post("c", 5), {"id": "no-time"},
+             {"id": "bad", "timestamp": "yesterday"}]
+    assert [p["id"] for p in poller._accept(batch)] == ["a", "b", "c"]
+    assert poller.cursor == T0 + timedelta(seconds=5)
+    assert poller.cursor_ids == {"b", "c"}
+
+    # A hub ignoring ?since resends everything; only the new post at the cursor time and later ones pass
+    again = batch + [post("d", 5), post("e", 9)]
+    assert [p["id"] for p in poller._accept(again)] == ["d", "e"]
+    assert poller.cursor_ids == {"e"}
+    assert poller._accept(again) == []
+
+
+def test_publish_drops_oldest_for_a_full_subscriber():
+    poller = make_poller()
+
+    async def run():
+        slow = poller.subscribe("slow", maxsize=2)
+        fast = poller.subscribe("fast", maxsize=10)
+        for i in range(4):
+            poller._publish({"id": i})
+        return ([slow.get_nowait()["id"] for _ in range(slow.qsize())],
+                [fast.get_nowait()["id"] for _ in range(fast.qsize())])
+
+    assert asyncio.run(run()) == ([2, 3], [0, 1, 2, 3])
+    assert poller.stats["posts_dropped"] == 2
+    assert poller.stats["posts_delivered"] == 8
+
+
+class HubStub(BaseHTTPRequestHandler):
+    posts = []
+    requests = []
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        HubStub.requests.append((query.get("since", [None])[0], self.headers.get("If-None-Match")))
+        etag = f'"v{len(HubStub.posts)}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        data = json.dumps(HubStub.posts).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def hub():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), HubStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    HubStub.posts, HubStub.requests = [post("a", 1), post("b", 2)], []
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def test_poll_sends_cursor_and_revalidates_with_etag(hub):
+    async def run():
+        poller = FeedPoller(hub)
+        poller.cursor = T0
+        queue = poller.subscribe("agent")
+        try:
+            counts = [await poller.poll_once()]
+            counts.append(await poller.poll_once())      # unchanged: 304
+            HubStub.posts.append(post("c", 3))
+            counts.append(await poller.poll_once())
+        finally:
+            await poller.stop()
+        return counts, [queue.get_nowait()["id"] for _ in range(queue.qsize())], poller
+
+    counts, delivered, poller = asyncio.run(run())
+    assert counts == [2, 0, 1]
+    assert delivered == ["a", "b", "c"]
+    assert poller.stats["not_modified"] == 1
+    assert HubStub.requests == [("2026-05-01T12:00:00.000Z", None),
+                                ("2026-05-01T12:00:02.000Z", '"v2"'),
+                                ("2026-05-01T12:00:02.000Z", '"v2"')]
+
+
+@pytest.fixture
+def shared():
+    feed_poller._shared_pollers.clear()
+    yield
+    feed_poller._shared_pollers.clear()
+
+
+def test_release_stops_the_shared_poller_after_the_last_subscriber(shared):
+    async def run():
+        poller = get_shared_poller("http://hub.invalid", interval=3600)
+        assert get_shared_poller("http://hub.invalid") is poller
+        poller.subscribe("a")
+        poller.subscribe("b")
+        task = poller.start()
+        await asyncio.sleep(0)
+        await release_shared_poller("http://hub.invalid", "a")
+        still_running = not task.done() and "http://hub.invalid" in feed_poller._shared_pollers
+        await release_shared_poller("http://hub.invalid", "b")
+        return still_running, task, poller
+
+    still_running, task, poller = asyncio.run(run())
+    assert still_running
+    assert task.done() and not poller.running and poller.session is None
+    assert feed_poller._shared_pollers == {}
+
+
+def test_shared_poller_uses_the_shortest_interval_and_earliest_catch_up(shared):
+    # The content pipeline often creates the poller first with a multi-minute interval
+    pipeline = get_shared_poller("http://hub.invalid", interval=300, catch_up=timedelta(minutes=1))
+    agent = get_shared_poller("http://hub.invalid", interval=30, catch_up=timedelta(hours=1))
+    assert agent is pipeline
+    assert pipeline.interval == 30
+    assert pipeline.cursor <= datetime.now(timezone.utc) - timedelta(minutes=59)
+
+    # A slower caller later doesn't slow it back down; once polling started the cursor stays put
+    pipeline.stats["requests"] = 1
+    cursor = pipeline.cursor
+    assert get_shared_poller("http://hub.invalid", interval=600, catch_up=timedelta(days=1)).interval == 30
+    assert pipeline.cursor == cursor
@@ -0,0 +1,193 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from moltbot.gateway import server  # noqa: E402
+
+
+class OllamaStub(BaseHTTPRequestHandler):
+    """Streams /api/chat replies as NDJSON, one chunk every `delay` seconds"""
+    scripts = {}
+    delay = 0.0
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    log = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        prompt = body["messages"][-1]["content"]
+        cls = OllamaStub
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+            cls.log.append(("start", prompt))
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/x-ndjson")
+            self.end_headers()
+            for piece in cls.scripts.get(prompt, ["re: ", prompt]):
+                time.sleep(cls.delay)
+                self._line({"message": {"role": "assistant", "content": piece}, "done": False})
+            self._line({"message": {"role": "assistant", "content": ""}, "done": True,
+                        "prompt_eval_count": 1, "eval_count": 2})
+        finally:
+            with cls.lock:
+                cls.active -= 1
+                cls.log.append(("end", prompt))
+
+    def _line(self, chunk):
+        self.wfile.write(json.dumps(chunk).encode("utf-8") + b"\n")
+        self.wfile.flush()
+
+    def log_message(self, *args):
+        pass
+
+
+class FakeSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, message):
+        self.sent.append(json.loads(message))
+
+    def chat_events(self, state):
+        return [event["payload"]["message"]["content"][0]["text"] for event in self.sent
+                if event.get("event") == "chat" and event["payload"]["state"] == state]
+
+
+@pytest.fixture
+def ollama():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), OllamaStub)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    OllamaStub.scripts, OllamaStub.delay, OllamaStub.active, OllamaStub.peak = {}, 0.0, 0, 0
+    OllamaStub.log = []
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/api/chat"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def make_gateway(tmp_path, monkeypatch, ollama):
+    memory = tmp_path / "MEMORY.md"
+    memory.write_text("remember the tide", encoding="utf-8")
+    monkeypatch.setattr(server, "OLLAMA_URL", ollama)
+    monkeypatch.setattr(server, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(server, "MAINTENANCE_FLAG", tmp_path / "maintenance.flag")
+    monkeypatch.setattr(server, "CHAT_HISTORY_DIR", tmp_path / "history")
+    monkeypatch.setattr(server, "CHAT_HISTORY_FILE", tmp_path / "legacy.json")
+    monkeypatch.setattr(server, "MEMORY_SOURCES", [memory, tmp_path / "SOUL.md"])
+    monkeypatch.setattr(server, "CuratorAgent", lambda: None)
+
+    def make():
+        gateway = server.MistGateway()
+        gateway.llm_slots = asyncio.Semaphore(2)
+        return gateway
+    return make
+
+
+async def settle(gateway):
+    while gateway.tasks:
+        await asyncio.gather(*list(gateway.tasks))
+    await gateway.history.close()
+    await gateway.http.close()
+
+
+def test_visible_text_hides_think_blocks_and_partial_tags():
+    visible = server.MistGateway._visible_text
+    assert visible("hello") == "hello"
+    assert visible("hello <th") == "hello "
+    assert visible("hello <think>half a tho") == "hello "
+    assert visible("a <think>x</think>b <think>y") == "a b "
+    assert visible("a <think>x</think>b") == "a b"
+    assert visible("1 < 2") == "1 < 2"
+
+
+def test_stream_relays_deltas_and_hides_split_think_tag(make_gateway):
+    async def run():
+        gateway = make_gateway()
+        OllamaStub.scripts["hi"] = ["Hel", "lo <th", "ink>secret</thi", "nk> world"]
+        socket = FakeSocket()
+        await gateway.handle_chat(socket, 7, {"message": "hi", "sessionKey": "s"})
+        await settle(gateway)
+        return gateway, socket
+
+    gateway, socket = asyncio.run(run())
+    assert socket.sent[0] == {"type": "res", "id": 7, "ok": True, "payload": {"runId": socket.sent[1]["payload"]["runId"]}}
+    deltas = socket.chat_events("delta")
+    assert deltas == ["Hel", "lo ", " world"]
+    assert all("<" not in delta and "secret" not in delta for delta in deltas)
+    assert socket.chat_events("final") == ["Hello  world"]
+    assert gateway.histories["s"][-1] == {"role": "assistant", "content": "Hello  world"}
+
+
+def test_chats_run_in_order_per_session_within_llm_slots(make_gateway):
+    async def run():
+        gateway = make_gateway()
+        OllamaStub.delay = 0.02
+        socket = FakeSocket()
+        for i in range(3):
+            for session in ("s1", "s2", "s3"):
+                gateway.dispatch_chat(socket, f"{session}-{i}", {"message": f"{session}-{i}", "sessionKey": session})
+        await settle(gateway)
+        return gateway, socket
+
+    gateway, socket = asyncio.run(run())
+    assert OllamaStub.peak == 2
+    for session in ("s1", "s2", "s3"):
+        events = [(kind, prompt) for kind, prompt in OllamaStub.log if prompt.startswith(session)]
+        # One request at a time per session, in the order they were dispatched
+        assert events == [(kind, f"{session}-{i}") for i in range(3) for kind in ("start", "end")]
+        assert [turn["content"] for turn in gateway.histories[session][::2]] == [f"{session}-{i}" for i in range(3)]
+    assert len(socket.chat_events("final")) == 9
+    assert gateway.session_queues == {}
+
+
+def test_broadcast_drops_oldest_for_a_full_outbox(make_gateway):
+    async def run():
+        gateway = make_gateway()
+        slow, fast = object(), object()
+        gateway.outboxes[slow] = asyncio.Queue(maxsize=2)
+        gateway.outboxes[fast] = asyncio.Queue(maxsize=8)
+        for i in range(4):
+            await gateway.broadcast_event("tick", {"n": i})
+        drained = {}
+        for name, client in (("slow", slow), ("fast", fast)):
+            outbox = gateway.outboxes[client]
+            drained[name] = [json.loads(outbox.get_nowait())["payload"]["n"] for _ in range(outbox.qsize())]
+        await gateway.history.close()
+        return drained
+
+    assert asyncio.run(run()) == {"slow": [2, 3], "fast": [0, 1, 2, 3]}
+
+
+def test_prompt_prefix_is_stable_until_a_memory_file_changes(make_gateway, tmp_path):
+    gateway = make_gateway()
+    first = gateway.prompt_prefix()
+    assert "remember the tide" in first[1]["content"]
+    assert gateway.prompt_prefix() is first
+    fingerprint = gateway.prefix_fingerprint
+
+    memory = tmp_path / "MEMORY.md"
+    memory.write_text("remember the moon", encoding="utf-8")
+    stat = memory.stat()
+    os.utime(memory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    second = gateway.prompt_prefix()
+    assert "remember the moon" in second[1]["content"]
+    assert gateway.prefix_fingerprint != fingerprint
+
+    # A file appearing counts as a change too
+    (tmp_path / "SOUL.md").write_text("soul notes", encoding="utf-8")
+    assert "soul notes" in gateway.prompt_prefix()[1]["content"]
+    asyncio.run(gateway.history.close())
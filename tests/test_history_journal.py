@@ -0,0 +1,92 @@
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+GATEWAY_DIR = Path(__file__).resolve().parents[1] / "moltbot" / "gateway"
+if str(GATEWAY_DIR) not in sys.path:
+    sys.path.insert(0, str(GATEWAY_DIR))
+
+from history_journal import LEGACY_MARKER, HistoryJournal  # noqa: E402
+
+
+def msg(i, session="s"):
+    return {"role": "user", "content": f"{session}-{i}"}
+
+
+def test_distinct_keys_get_distinct_files(tmp_path):
+    journal = HistoryJournal(tmp_path)
+    long_a = "x" * 150 + "a"
+    long_b = "x" * 150 + "b"
+    keys = ["a/b", "a_b", "a b", long_a, long_b, "main", "main.archive", ""]
+    paths = {journal.journal_path(k) for k in keys[:-1]}
+    assert len(paths) == len(keys) - 1
+    # Clean keys keep their existing filenames
+    assert journal.journal_path("main").name == "main.jsonl"
+    assert journal.journal_path("") == journal.journal_path("main")
+    assert journal.journal_path("main.archive") != journal.archive_path("main")
+
+    for key in ["a/b", "a_b", long_a, long_b]:
+        journal.write_now(key, [msg(0, key)])
+    for key in ["a/b", "a_b", long_a, long_b]:
+        assert journal.load_recent(key, 10) == [msg(0, key)]
+
+
+def test_load_recent_returns_tail_in_order(tmp_path):
+    journal = HistoryJournal(tmp_path)
+    journal.write_now("s", [msg(i) for i in range(500)])
+    assert journal.load_recent("s", 3) == [msg(497), msg(498), msg(499)]
+    assert journal.load_recent("s", 1000) == [msg(i) for i in range(500)]
+    assert journal.load_recent("missing", 5) == []
+
+
+def test_compaction_archives_old_lines(tmp_path):
+    journal = HistoryJournal(tmp_path, keep=5, compact_after=20)
+    for i in range(21):
+        journal.write_now("s", [msg(i)])
+    assert journal.load_recent("s", 100) == [msg(i) for i in range(16, 21)]
+    archived = [json.loads(line) for line in journal.archive_path("s").read_text().splitlines()]
+    assert archived == [msg(i) for i in range(16)]
+
+
+def test_background_append_flushes_on_close(tmp_path):
+    journal = HistoryJournal(tmp_path)
+
+    async def run():
+        for i in range(10):
+            journal.append("s", [msg(i)])
+        await journal.close()
+
+    asyncio.run(run())
+    assert journal.load_recent("s", 100) == [msg(i) for i in range(10)]
+
+
+def test_import_legacy_resumes_after_partial_failure(tmp_path, monkeypatch):
+    legacy = tmp_path / "chat_history.json"
+    sessions = {"one": [msg(0, "one")], "two": [msg(0, "two"), msg(1, "two")]}
+    legacy.write_text(json.dumps({"sessions": sessions}))
+    journal = HistoryJournal(tmp_path / "history")
+
+    real_import = HistoryJournal._import_session
+
+    def failing_import(self, session_key, messages):
+        if session_key == "two":
+            raise OSError("disk full")
+        real_import(self, session_key, messages)
+
+    monkeypatch.setattr(HistoryJournal, "_import_session", failing_import)
+    journal.import_legacy(legacy)
+    assert legacy.exists()
+    assert journal.load_recent("one", 10) == sessions["one"]
+    assert journal.load_recent("two", 10) == []
+
+    # A turn recorded before the retry stays after the migrated messages
+    journal.write_now("two", [msg(2, "two")])
+    monkeypatch.setattr(HistoryJournal, "_import_session", real_import)
+    journal.import_legacy(legacy)
+
+    assert not legacy.exists()
+    assert legacy.with_suffix(".json.migrated").exists()
+    assert json.loads((tmp_path / "history" / LEGACY_MARKER).read_text()) == {"done": ["one", "two"]}
+    assert journal.load_recent("one", 10) == sessions["one"]
+    assert journal.load_recent("two", 10) == sessions["two"] + [msg(2, "two")]
@@ -0,0 +1,207 @@
+import asyncio
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from clawdbot_agents.llm_connector import FairSemaphore, LLMConnector, get_shared_connector  # noqa: E402
+
+
+async def spin(times=3):
+    for _ in range(times):
+        await asyncio.sleep(0)
+
+
+def test_fair_semaphore_hands_slots_round_robin():
+    order = []
+
+    async def run():
+        limiter = FairSemaphore(1)
+        await limiter.acquire("holder")
+
+        async def request(agent, label):
+            await limiter.acquire(agent)
+            order.append(label)
+            await asyncio.sleep(0)
+            limiter.release()
+
+        # A queues three requests before B and C queue one each
+        tasks = [asyncio.create_task(request(agent, label))
+                 for agent, label in [("A", "A1"), ("A", "A2"), ("A", "A3"), ("B", "B1"), ("C", "C1")]]
+        await spin()
+        assert limiter.waiting() == {"A": 3, "B": 1, "C": 1}
+        limiter.release()
+        await asyncio.gather(*tasks)
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert order == ["A1", "B1", "C1", "A2", "A3"]
+    assert limiter.active == 0 and limiter.waiting() == {}
+
+
+def test_fair_semaphore_cancelled_waiters_hold_no_slot():
+    async def run():
+        limiter = FairSemaphore(1)
+        await limiter.acquire("holder")
+        queued = asyncio.create_task(limiter.acquire("A"))
+        handed = asyncio.create_task(limiter.acquire("B"))
+        after = asyncio.create_task(limiter.acquire("C"))
+        await spin()
+
+        # Cancelled while still queued: it just leaves the line
+        queued.cancel()
+        await spin()
+        assert limiter.waiting() == {"B": 1, "C": 1}
+
+        # Cancelled just after being handed the slot: the slot moves on to C
+        limiter.release()
+        handed.cancel()
+        await spin()
+        assert handed.cancelled() and after.done()
+        assert limiter.active == 1
+        limiter.release()
+        return limiter
+
+    limiter = asyncio.run(run())
+    assert limiter.active == 0 and limiter.waiting() == {}
+
+
+def test_coalesced_callers_share_one_call():
+    async def run():
+        connector = LLMConnector()
+        connector.session = object()  # keep _limited from opening a real session
+        release = asyncio.Event()
+        calls = []
+
+        async def call():
+            calls.append(1)
+            await release.wait()
+            return "shared"
+
+        callers = [asyncio.create_task(connector._coalesced(("k",), f"agent{i}", call)) for i in range(5)]
+        await spin()
+        release.set()
+        results = await asyncio.gather(*callers)
+        return results, calls, connector
+
+    results, calls, connector = asyncio.run(run())
+    assert results == ["shared"] * 5
+    assert len(calls) == 1
+    assert connector.stats["requests"] == 5 and connector.stats["coalesced"] == 4
+    assert connector._inflight == {} and connector.limiter.active == 0
+
+
+def test_coalesced_call_is_cancelled_only_when_the_last_caller_leaves():
+    async def run():
+        connector = LLMConnector()
+        connector.session = object()
+        started = asyncio.Event()
+        upstream = {}
+
+        async def call():
+            upstream["task"] = asyncio.current_task()
+            started.set()
+            await asyncio.sleep(60)
+
+        first = asyncio.create_task(connector._coalesced(("k",), "a", call))
+        second = asyncio.create_task(connector._coalesced(("k",), "b", call))
+        await started.wait()
+
+        first.cancel()
+        await spin()
+        survived = not upstream["task"].done()
+
+        second.cancel()
+        await spin()
+        return survived, upstream["task"], first, second, connector
+
+    survived, call_task, first, second, connector = asyncio.run(run())
+    assert survived
+    assert call_task.cancelled()
+    assert first.cancelled() and second.cancelled()
+    assert connector._inflight == {} and connector.limiter.active == 0
+
+
+class OllamaStub(BaseHTTPRequestHandler):
+    """/api/chat that takes `delay` seconds per request and records concurrency"""
+    delay = 0.05
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+    prompts = []
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        cls = OllamaStub
+        with cls.lock:
+            cls.active += 1
+            cls.peak = max(cls.peak, cls.active)
+            cls.prompts.append(body["messages"][-1]["content"])
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.active -= 1
+        data = json.dumps({"message": {"role": "assistant", "content": "re " + body["messages"][-1]["content"]}})
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data.encode("utf-8"))
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def ollama():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OllamaStub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    OllamaStub.active, OllamaStub.peak, OllamaStub.prompts = 0, 0, []
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def chat(connector, agent, text):
+    return connector.chat_completion([{"role": "user", "content": text}], agent=agent)
+
+
+def test_burst_against_stub_ollama_is_limited_fair_and_coalesced(ollama):
+    async def run():
+        connector = LLMConnector(base_url=ollama, max_concurrency=2)
+        try:
+            # A floods first; B and C get the next slots ahead of A's backlog
+            burst = [asyncio.create_task(chat(connector, "A", f"a{i}")) for i in range(5)]
+            await spin()
+            burst += [asyncio.create_task(chat(connector, "B", "b0")), asyncio.create_task(chat(connector, "C", "c0"))]
+            replies = await asyncio.gather(*burst)
+
+            identical = await asyncio.gather(*(chat(connector, f"agent{i}", "same") for i in range(5)))
+            return replies, identical, connector.get_stats()
+        finally:
+            await connector.close()
+
+    replies, identical, stats = asyncio.run(run())
+    assert replies == ["re a0", "re a1", "re a2", "re a3", "re a4", "re b0", "re c0"]
+    assert OllamaStub.peak == 2
+    # Slots free up two at a time; each pair is one round of the round-robin
+    prompts = OllamaStub.prompts
+    assert [set(prompts[0:2]), set(prompts[2:4]), set(prompts[4:6]), prompts[6]] == [
+        {"a0", "a1"}, {"a2", "b0"}, {"c0", "a3"}, "a4"]
+    assert identical == ["re same"] * 5
+    assert OllamaStub.prompts.count("same") == 1
+    assert stats["calls"] == 8 and stats["coalesced"] == 4
+    assert stats["active"] == 0 and stats["waiting"] == {} and stats["in_flight"] == 0
+
+
+def test_shared_connector_is_one_per_model_server():
+    first = get_shared_connector("ollama", "m", "http://host:1/")
+    assert get_shared_connector("Ollama", "m", "http://host:1") is first
+    assert get_shared_connector("ollama", "other", "http://host:1") is not first
@@ -0,0 +1,117 @@
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+IDE_DIR = Path(__file__).resolve().parents[1] / "personal-ide"
+if str(IDE_DIR) not in sys.path:
+    sys.path.insert(0, str(IDE_DIR))
+
+from integration.CORE_HUB import CoreHub  # noqa: E402
+from memory.MEMORY_NODES import (MemoryImportance, MemoryNode, MemoryPruner, MemoryType, MemoryWeb,  # noqa: E402
+                                 TagPool)
+
+
+def make_node(node_id="n1", tags=("a", "b"), **kwargs):
+    kwargs.setdefault("timestamp", datetime(2026, 1, 2, 3, 4, 5))
+    kwargs.setdefault("last_accessed", datetime(2026, 1, 3))
+    return MemoryNode(id=node_id, content="hello", memory_type=MemoryType.KNOWLEDGE,
+                      importance=MemoryImportance.NORMAL, tags=list(tags), **kwargs)
+
+
+def test_node_is_slotted_and_keeps_datetime_interface():
+    node = make_node()
+    assert not hasattr(node, "__dict__")
+    with pytest.raises(AttributeError):
+        node.unknown_field = 1
+    assert node.timestamp == datetime(2026, 1, 2, 3, 4, 5)
+    node.last_accessed = datetime(2026, 2, 1)
+    assert node.accessed == datetime(2026, 2, 1).timestamp()
+    assert node._context is None
+    node.context["mood"] = "calm"
+    assert node.to_dict()["context"] == {"mood": "calm"}
+
+
+def test_tags_and_connections_are_read_only_views():
+    node = make_node(connections=["x"])
+    assert node.tags == ("a", "b")
+    assert node.connections == ("x",)
+    with pytest.raises(AttributeError):
+        node.tags.append("c")
+    with pytest.raises(AttributeError):
+        node.connections.append("y")
+    node.tags = ["c"]
+    node.connections = ["y", "z"]
+    assert node.tags == ("c",)
+    assert node.connections == ("y", "z")
+    assert node.to_dict()["tags"] == ["c"]
+
+
+def test_node_equality_compares_fields():
+    assert make_node() == make_node()
+    assert make_node() != make_node(tags=("a",))
+    assert make_node() != make_node(node_id="n2")
+    other = make_node()
+    other.context["k"] = 1
+    assert make_node() != other
+    with pytest.raises(TypeError):
+        hash(make_node())
+
+
+def test_tag_pool_interns_names_and_shares_tuples():
+    pool = TagPool()
+    first = pool.intern(["space", "home"])
+    second = pool.intern(["space", "home"])
+    assert first is second
+    assert pool.intern(["home"]) == (first[1],)
+    assert pool.intern([]) == ()
+    assert pool.resolve(first) == ("space", "home")
+    assert pool.names == ["space", "home"]
+
+
+def test_prune_weak_edges_is_symmetric_and_drops_empty_entries():
+    pruner = MemoryPruner()
+    adjacency = {
+        "a": {"b": 0.1, "c": 0.9},
+        "b": {"a": 0.1},
+        "c": {"a": 0.9, "d": pruner.min_connection_strength},
+        "d": {"c": pruner.min_connection_strength},
+    }
+    pruner.prune_weak_edges(adjacency)
+    assert adjacency == {"a": {"c": 0.9}, "c": {"a": 0.9, "d": 0.2}, "d": {"c": 0.2}}
+
+
+def test_web_connections_is_read_only():
+    web = MemoryWeb(CoreHub())
+    for node_id in ("a", "b", "c"):
+        web.add_node(make_node(node_id, timestamp=time.time()))
+    web.connect_nodes("a", "b", 0.8)
+    connections = web.connections
+    assert dict(connections) == {"a": ("b",), "b": ("a",), "c": ()}
+    with pytest.raises(TypeError):
+        connections["c"] = ["a"]
+    with pytest.raises(AttributeError):
+        connections["a"].append("c")
+
+
+def test_indexed_fields_change_only_through_the_web():
+    web = MemoryWeb(CoreHub())
+    node = make_node(timestamp=time.time())
+    web.add_node(node)
+    for name, value in (("tags", ["c"]), ("importance", MemoryImportance.CRITICAL),
+                        ("memory_type", MemoryType.EMOTIONAL)):
+        with pytest.raises(AttributeError, match="update_node"):
+            setattr(node, name, value)
+
+    web.update_node("n1", tags=["c"], importance=MemoryImportance.CRITICAL, memory_type=MemoryType.EMOTIONAL)
+    assert (node.tags, node.importance, node.memory_type) == (("c",), MemoryImportance.CRITICAL, MemoryType.EMOTIONAL)
+    assert list(web.tag_index) == ["c"]
+    assert web.type_index[MemoryType.EMOTIONAL] == {"n1"}
+    assert web.get_stats()["daily_nodes"] == 1 and web.get_stats()["wisdom_nodes"] == 0
+
+    # A removed node is free to change again
+    web._drop_node("n1")
+    node.tags = ["d"]
+    assert node.tags == ("d",)
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+IDE_DIR = Path(__file__).resolve().parents[1] / "personal-ide"
+if str(IDE_DIR) not in sys.path:
+    sys.path.insert(0, str(IDE_DIR))
+
+from integration.CORE_HUB import CoreHub  # noqa: E402
+from memory.MEMORY_NODES import MemoryImportance, MemoryNode, MemoryQuery, MemoryType, MemoryWeb  # noqa: E402
+from memory.MEMORY_SNAPSHOT import SEGMENT_SUFFIX  # noqa: E402
+
+
+def node(node_id, content, tags, importance=MemoryImportance.NORMAL, memory_type=MemoryType.KNOWLEDGE):
+    return MemoryNode(id=node_id, content=content, memory_type=memory_type, timestamp=time.time() - 60,
+                      importance=importance, tags=tags, retention_score=0.5)
+
+
+def open_web(path):
+    web = MemoryWeb(CoreHub(), snapshot_path=path)
+    # Keep maintenance from consolidating; only pruning and merging run
+    web.consolidator.last_consolidation = web.consolidator.last_consolidation.max
+    return web
+
+
+def state(web):
+    nodes = {node_id: web.nodes[node_id] for node_id in web.nodes}
+    adjacency = {node_id: dict(neighbours) for node_id, neighbours in web.adjacency.items()}
+    query = MemoryQuery(tags=["blue"], importance_threshold=MemoryImportance.BACKGROUND)
+    return nodes, adjacency, dict(web.get_stats()), [n.id for n in web.find_related_nodes(query)]
+
+
+def build(path):
+    web = open_web(path)
+    web.add_node(node("a", "red apples", ["red"]))
+    web.add_node(node("b", "blue sky", ["blue"]))
+    web.add_node(node("c", "green grass", ["green"], memory_type=MemoryType.INTERACTION))
+    web.add_node(node("d", {"note": "json content"}, ["red", "blue"]))
+    web.add_node(node("gone", "temporary", ["red"]))
+    web.connect_nodes("a", "b", 0.9)
+    web.connect_nodes("a", "b", 0.8)  # re-linking must not count twice
+    web.connect_nodes("b", "c", 0.1)  # weak: pruned by maintenance
+    web.connect_nodes("c", "d", 0.5)
+    web.connect_nodes("gone", "a", 0.7)
+    asyncio.run(web.remove_node("gone"))
+    web.update_node("c", importance=MemoryImportance.CRITICAL, retention_score=0.95, tags=["blue", "green"])
+    web.update_node("a", retention_score=0.4)
+    asyncio.run(web.on_context_update("context_update", {"mood": "calm"}))
+    asyncio.run(web.on_maintenance("system_maintenance", {}))
+    return web
+
+
+def test_connection_count_follows_adjacency(tmp_path):
+    web = build(str(tmp_path / "web.snap"))
+    assert web.get_stats()["total_connections"] == 2
+    web.disconnect_nodes("a", "b")
+    assert web.get_stats()["total_connections"] == 1
+    assert web.get_memory_network_stats()["total_connections"] == 1
+
+
+def test_segment_replay_restores_every_change(tmp_path):
+    path = str(tmp_path / "web.snap")
+    web = build(path)
+    # Maintenance left the small segment alone rather than rewriting the snapshot
+    assert os.path.exists(path + SEGMENT_SUFFIX)
+    expected = state(web)
+    assert expected[0]["c"].importance == MemoryImportance.CRITICAL
+    assert expected[0]["c"].tags == ("blue", "green")
+    assert expected[0]["a"].retention_score == 0.4
+    assert expected[0]["b"].context == {"mood": "calm"}
+    assert "c" not in expected[1].get("b", {})
+    assert expected[3] == ["c", "d", "b"]
+
+    replayed = open_web(path)
+    assert state(replayed) == expected
+
+    # Merging folds the segment in; a fresh load sees the same web
+    assert replayed.merge_segments(force=True)
+    assert not os.path.exists(path + SEGMENT_SUFFIX)
+    assert state(open_web(path)) == expected
+
+
+def test_maintenance_merges_once_segment_passes_threshold(tmp_path):
+    path = str(tmp_path / "web.snap")
+    web = open_web(path)
+    web.merge_threshold = 3
+    web.add_node(node("a", "one", ["x"]))
+    web.add_node(node("b", "two", ["x"]))
+    asyncio.run(web.on_maintenance("system_maintenance", {}))
+    assert os.path.exists(path + SEGMENT_SUFFIX)
+    web.connect_nodes("a", "b", 0.5)
+    asyncio.run(web.on_maintenance("system_maintenance", {}))
+    assert not os.path.exists(path + SEGMENT_SUFFIX)
+    assert state(open_web(path))[1] == {"a": {"b": 0.5}, "b": {"a": 0.5}}
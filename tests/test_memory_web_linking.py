@@ -0,0 +1,69 @@
+import random
+import sys
+import time
+from pathlib import Path
+
+IDE_DIR = Path(__file__).resolve().parents[1] / "personal-ide"
+if str(IDE_DIR) not in sys.path:
+    sys.path.insert(0, str(IDE_DIR))
+
+from integration.CORE_HUB import CoreHub  # noqa: E402
+from memory.MEMORY_NODES import MemoryImportance, MemoryNode, MemoryType, MemoryWeb, MinHashLSH  # noqa: E402
+
+VOCAB = [f"w{i}" for i in range(400)]
+
+
+def node(node_id, content, tags):
+    return MemoryNode(id=node_id, content=content, memory_type=MemoryType.KNOWLEDGE, timestamp=time.time(),
+                      importance=MemoryImportance.NORMAL, tags=tags)
+
+
+def lsh_only_web():
+    """A web whose tag postings are never scanned, so partial-tag matches rely on the LSH"""
+    web = MemoryWeb(CoreHub())
+    web.associative_linker.exhaustive_posting_limit = 0
+    return web
+
+
+def test_duplicate_and_high_overlap_texts_are_candidates():
+    rng = random.Random(7)
+    web = lsh_only_web()
+    for i in range(200):
+        web.add_node(node(f"bg{i}", " ".join(rng.sample(VOCAB, 20)), ["shared", f"bg{i}"]))
+
+    for trial in range(100):
+        words = rng.sample(VOCAB, 20)
+        # Jaccard 18/22 with the original: two words swapped out
+        overlap = words[:18] + rng.sample([w for w in VOCAB if w not in words], 2)
+        rng.shuffle(overlap)
+        base, dup, near = f"base{trial}", f"dup{trial}", f"near{trial}"
+        web.add_node(node(base, " ".join(words), ["shared", base]))
+        web.add_node(node(dup, " ".join(words), ["shared", dup]))
+        web.add_node(node(near, " ".join(overlap), ["shared", near]))
+        assert base in set(web.link_candidates(web.nodes[dup]))
+        assert base in set(web.link_candidates(web.nodes[near]))
+
+
+def test_readded_node_keeps_candidates_ordered_and_unique():
+    web = lsh_only_web()
+    text = "the same words every time"
+    for i in range(5):
+        web.add_node(node(f"n{i}", text, ["t", f"n{i}"]))
+    # Replace an early node: it is now the newest
+    web.add_node(node("n1", text, ["t", "n1"]))
+    web.add_node(node("probe", text, ["t", "probe"]))
+
+    candidates = list(web.link_candidates(web.nodes["probe"]))
+    assert candidates == ["n0", "n2", "n3", "n4", "n1"]
+    assert web.stats["total_nodes"] == 6
+    assert all(len(ids) == len(set(ids)) for ids in web.content_lsh.candidate_lists("probe"))
+
+
+def test_lsh_readd_replaces_bucket_entries():
+    lsh = MinHashLSH()
+    lsh.add("a", ["x", "y"])
+    lsh.add("b", ["x", "y"])
+    lsh.add("a", ["x", "y"])
+    assert all(list(ids) == ["b", "a"] for ids in lsh.candidate_lists("a"))
+    lsh.add("a", ["p", "q"])
+    assert all(list(ids) == ["b"] for ids in lsh.candidate_lists("b"))
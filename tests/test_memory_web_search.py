@@ -0,0 +1,110 @@
+import asyncio
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import pytest
+
+IDE_DIR = Path(__file__).resolve().parents[1] / "personal-ide"
+if str(IDE_DIR) not in sys.path:
+    sys.path.insert(0, str(IDE_DIR))
+
+from integration.CORE_HUB import CoreHub  # noqa: E402
+from memory.MEMORY_NODES import TAG_POOL, MemoryImportance, MemoryNode, MemoryQuery, MemoryType, MemoryWeb  # noqa: E402
+
+WORDS = ["mars", "marsh", "rover", "orbit", "Orbital", "tea", "steam", "garden", "MIST", "mist-fairy",
+         "code", "decode", "python", "sister", "moon", "a", "an"]
+TAGS = ["space", "home", "work", "mood", "project", "self", "music"]
+DAY = 86400
+
+
+def linear_find(web, query):
+    """The original find_related_nodes: filter every node, then sort by relevance"""
+    now = time.time()
+    terms = query.text_query.lower().split()
+    matches = []
+    for node in web.nodes.values():
+        if query.memory_types and node.memory_type not in query.memory_types:
+            continue
+        if query.time_range and not (query.time_range[0] <= node.timestamp <= query.time_range[1]):
+            continue
+        if query.tags and not set(query.tags) & set(node.tags):
+            continue
+        if node.importance.value < query.importance_threshold.value:
+            continue
+        if terms and not any(term in str(node.content).lower() for term in terms):
+            continue
+        matches.append((node.importance.value - ((now - node.created) / DAY) * 0.1, node.id))
+    matches.sort(reverse=True)
+    return [node_id for _, node_id in matches[:query.max_results]]
+
+
+def random_web(rng, count):
+    web = MemoryWeb(CoreHub())
+    now = time.time()
+    # Distinct creation times keep the relevance order unambiguous
+    ages = rng.sample(range(60 * DAY), count)
+    for i, age in enumerate(ages):
+        content = " ".join(rng.choices(WORDS, k=rng.randint(1, 6)))
+        if rng.random() < 0.1:
+            content = {"note": content, "n": i}
+        web.add_node(MemoryNode(
+            id=f"n{i}", content=content, memory_type=rng.choice(list(MemoryType)),
+            timestamp=now - age, importance=rng.choice(list(MemoryImportance)),
+            tags=rng.sample(TAGS, rng.randint(0, 3))))
+    return web
+
+
+def random_query(rng):
+    query = MemoryQuery(importance_threshold=rng.choice(list(MemoryImportance)),
+                        max_results=rng.choice([0, 1, 5, 10, 50]))
+    if rng.random() < 0.5:
+        query.text_query = " ".join(rng.choice(WORDS + ["ars", "o", "zzz", "EA"]) for _ in range(rng.randint(1, 2)))
+    if rng.random() < 0.4:
+        query.memory_types = rng.sample(list(MemoryType), rng.randint(1, 3))
+    if rng.random() < 0.4:
+        query.tags = rng.sample(TAGS + ["unused"], rng.randint(1, 2))
+    if rng.random() < 0.4:
+        now = time.time()
+        start = now - rng.uniform(0, 70) * DAY
+        query.time_range = (datetime.fromtimestamp(start), datetime.fromtimestamp(start + rng.uniform(0, 30) * DAY))
+    return query
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_indexed_search_matches_linear_scan(seed, tmp_path):
+    rng = random.Random(seed)
+    web = random_web(rng, rng.choice([0, 1, 30, 300]))
+    queries = [random_query(rng) for _ in range(60)]
+    for query in queries:
+        assert [n.id for n in web.find_related_nodes(query)] == linear_find(web, query), query
+
+    # Same answers from a web served out of a snapshot, after some churn
+    for node_id in rng.sample(list(web.nodes), len(web.nodes) // 5):
+        web._drop_node(node_id)
+    path = str(tmp_path / "web.snap")
+    web.save_snapshot(path)
+    restored = MemoryWeb(CoreHub(), snapshot_path=path)
+    for query in queries:
+        assert [n.id for n in restored.find_related_nodes(query)] == linear_find(restored, query), query
+
+
+def test_mutated_then_removed_node_leaves_no_stale_index_entries():
+    web = MemoryWeb(CoreHub())
+    now = time.time()
+    for i in range(3):
+        web.add_node(MemoryNode(id=f"n{i}", content=f"note {i}", memory_type=MemoryType.KNOWLEDGE,
+                                timestamp=now - i * DAY, importance=MemoryImportance.NORMAL, tags=["space"]))
+    # Indexed values changed behind the web's back before the node is removed
+    node = web.nodes["n1"]
+    node.tag_ids = TAG_POOL.intern(["home"])
+    node.timestamp = now - 30 * DAY
+    asyncio.run(web.remove_node("n1"))
+
+    assert "n1" not in web.tag_index.get("space", {})
+    assert all("n1" not in ids for _, ids in web.time_index.values())
+    assert [n.id for n in web.find_related_nodes(MemoryQuery(tags=["space"]))] == ["n0", "n2"]
+    assert [n.id for n in web.find_related_nodes(MemoryQuery())] == ["n0", "n2"]
+    assert [n.id for n in web.find_related_nodes(MemoryQuery(text_query="note"))] == ["n0", "n2"]
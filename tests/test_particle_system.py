@@ -0,0 +1,81 @@
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+IDE_DIR = Path(__file__).resolve().parents[1] / "personal-ide"
+if str(IDE_DIR) not in sys.path:
+    sys.path.insert(0, str(IDE_DIR))
+
+from visualization.VISUAL_COMPANION import ParticleSystem, Position  # noqa: E402
+
+
+def batches(system):
+    # Particles land within 0.5 of their emission center, so x rounds back to the batch's center
+    return np.rint(system.get_particle_arrays().position[:, 0]).astype(int).tolist()
+
+
+@pytest.fixture
+def system():
+    system = ParticleSystem(max_particles=10)
+    system.rng = np.random.default_rng(7)
+    return system
+
+
+def test_overflow_drops_the_oldest_particles(system):
+    for center, count in [(0, 4), (10, 4), (20, 4)]:
+        system.emit_particles(count, Position(center, 0, 0))
+    assert len(system) == 10
+    assert batches(system) == [0, 0] + [10] * 4 + [20] * 4
+
+    # A burst larger than the pool keeps only the newest max_particles of it
+    system.emit_particles(25, Position(30, 0, 0), emission_type="mars")
+    assert batches(system) == [30] * 10
+    assert np.allclose(system.get_particle_arrays().color[:, 1], 0.4, atol=0.1)  # mars green channel
+
+    system.emit_particles(0, Position(40, 0, 0))
+    assert len(system) == 10
+
+
+def test_update_moves_fades_and_culls_expired_particles(system):
+    for center in (0, 10, 20):
+        system.emit_particles(2, Position(center, 0, 0))
+    system.lifetime[:6] = [0.5, 3.0, 1.0, 0.2, 4.0, 2.0]
+    system.max_lifetime[:6] = 4.0
+    before = system.get_particle_arrays()
+    position, velocity, alpha = before.position.copy(), before.velocity.copy(), before.color[:, 3].copy()
+
+    system.update_particles(1.0)
+
+    survivors = [1, 4, 5]  # lifetimes still above zero, in emission order
+    after = system.get_particle_arrays()
+    assert len(system) == 3
+    assert after.lifetime.tolist() == [2.0, 3.0, 1.0]
+    assert np.allclose(after.position, position[survivors] + velocity[survivors] * 10)
+    assert np.allclose(after.color[:, 3], alpha[survivors] * np.array([2.0, 3.0, 1.0]) / 4.0)
+
+    system.update_particles(5.0)
+    assert len(system) == 0 and system.get_active_particles() == []
+    system.update_particles(1.0)
+    assert len(system) == 0
+
+
+def test_active_particles_match_the_arrays(system):
+    system.emit_particles(3, Position(1, 2, 3))
+    system.emit_particles(2, Position(-5, 0, 0), emission_type="mars")
+    system.update_particles(0.1)
+
+    arrays = system.get_particle_arrays()
+    particles = system.get_active_particles()
+    assert len(particles) == len(arrays.position) == len(system) == 5
+    for i, particle in enumerate(particles):
+        assert [particle.position.x, particle.position.y, particle.position.z] == pytest.approx(arrays.position[i])
+        assert [particle.velocity.x, particle.velocity.y, particle.velocity.z] == pytest.approx(arrays.velocity[i])
+        assert [particle.color.r, particle.color.g, particle.color.b, particle.color.a] == pytest.approx(arrays.color[i])
+        assert (particle.size, particle.lifetime, particle.max_lifetime) == pytest.approx(
+            (arrays.size[i], arrays.lifetime[i], arrays.max_lifetime[i]))
+
+    # The particles are copies: changing one leaves the system alone
+    particles[0].lifetime = -1.0
+    assert system.get_particle_arrays().lifetime[0] == arrays.lifetime[0] > 0
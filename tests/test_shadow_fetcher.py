@@ -0,0 +1,89 @@
+import asyncio
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+SHADOW_DIR = Path(__file__).resolve().parents[1] / "skills" / "shadow"
+if str(SHADOW_DIR) not in sys.path:
+    sys.path.insert(0, str(SHADOW_DIR))
+
+from fetcher import PageFetcher, TextExtractor  # noqa: E402
+
+PAGE = (
+    "<html><head><title>Stub</title><style>body{color:red}</style>"
+    "<script>var hidden = 1;</script></head>"
+    "<body><p>First  paragraph</p><div>Second &amp; last</div></body></html>"
+)
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        StubHandler.hits.append((self.path, self.headers.get("If-None-Match")))
+        if self.path == "/big":
+            body = ("<p>" + "x" * 50 + "</p>") * 5000
+        else:
+            body = PAGE
+        if self.headers.get("If-None-Match") == '"v1"':
+            self.send_response(304)
+            self.end_headers()
+            return
+        data = body.encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", '"v1"')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def test_extractor_drops_script_and_style():
+    extractor = TextExtractor(budget=1000)
+    extractor.feed(PAGE)
+    assert extractor.text() == "Stub\nFirst\nparagraph\nSecond & last"
+
+
+def test_extractor_stops_at_budget():
+    extractor = TextExtractor(budget=120)
+    extractor.feed(("<p>" + "y" * 50 + "</p>") * 100)
+    assert extractor.done
+    assert len(extractor.text()) == 120
+
+
+def test_fetch_revalidates_with_etag_and_batches(tmp_path):
+    server, base = _serve()
+    StubHandler.hits = []
+
+    async def scenario():
+        fetcher = PageFetcher(cache_dir=str(tmp_path))
+        try:
+            first = await fetcher.fetch(base + "/page")
+            second = await fetcher.fetch(base + "/page")
+            batch = await fetcher.fetch_many([base + "/a", base + "/b", base + "/big"], budget=500)
+            return first, second, batch
+        finally:
+            await fetcher.close()
+
+    try:
+        first, second, batch = asyncio.run(scenario())
+    finally:
+        server.shutdown()
+
+    assert first.status == 200 and not first.cached
+    assert "Second & last" in first.text
+    assert second.status == 304 and second.cached
+    assert second.text == first.text
+    assert StubHandler.hits[:2] == [("/page", None), ("/page", '"v1"')]
+    assert [r.status for r in batch] == [200, 200, 200]
+    assert len(batch[2].text) == 500
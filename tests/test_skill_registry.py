@@ -0,0 +1,63 @@
+import os
+import sys
+from pathlib import Path
+
+POD_DIR = Path(__file__).resolve().parents[1] / "aether_pod" / "pod"
+if str(POD_DIR) not in sys.path:
+    sys.path.insert(0, str(POD_DIR))
+
+from skills import SkillRegistry, split_args  # noqa: E402
+
+ECHO_SKILL = '''
+import os
+import sys
+import time
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "sleep":
+        time.sleep(float(argv[1]))
+    print(os.getpid())
+    for arg in argv:
+        print(arg)
+
+if __name__ == "__main__":
+    main()
+'''
+
+
+def make_registry(tmp_path, **kwargs):
+    (tmp_path / "echo.py").write_text(ECHO_SKILL)
+    return SkillRegistry([str(tmp_path)], **kwargs)
+
+
+def run_echo(registry, args):
+    lines = registry.run("echo", args).splitlines()
+    return int(lines[0]), lines[1:]
+
+
+def test_split_args_keeps_backslashes_and_groups_quotes():
+    assert split_args(r"C:\Users\nator\notes.txt") == [r"C:\Users\nator\notes.txt"]
+    assert split_args(r'"C:\Program Files\app\log.txt" -n 5') == [r"C:\Program Files\app\log.txt", "-n", "5"]
+    assert split_args("'two words' plain") == ["two words", "plain"]
+    assert split_args('unbalanced "quote') == ["unbalanced", '"quote']
+
+
+def test_registry_passes_backslash_paths_in_process(tmp_path):
+    registry = make_registry(tmp_path)
+    pid, argv = run_echo(registry, r'C:\Users\nator\notes.txt "D:\My Docs\a b.md"')
+    assert pid == os.getpid()
+    assert argv == [r"C:\Users\nator\notes.txt", r"D:\My Docs\a b.md"]
+    assert registry.run("missing", "") is None
+
+
+def test_timed_out_skill_moves_to_subprocess(tmp_path):
+    registry = make_registry(tmp_path, timeout=0.5)
+    out = registry.run("echo", "sleep 1.5")
+    assert "timed out" in out
+
+    pid, argv = run_echo(registry, r"C:\Temp\x.txt")
+    assert pid != os.getpid()
+    assert argv == [r"C:\Temp\x.txt"]
+    # Let the abandoned worker finish while its output is still captured
+    registry.pool.shutdown(wait=True)
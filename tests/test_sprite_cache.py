@@ -0,0 +1,90 @@
+import json
+import sys
+from pathlib import Path
+
+IDE_DIR = Path(__file__).resolve().parents[1] / "personal-ide"
+if str(IDE_DIR) not in sys.path:
+    sys.path.insert(0, str(IDE_DIR))
+
+from PIL import Image, ImageDraw  # noqa: E402
+
+import SPRITE_CACHE  # noqa: E402
+from SPRITE_CACHE import MANIFEST_NAME, OutputCache, inputs_digest, memoized_layer, render_frames  # noqa: E402
+from SPRITE_SHEET_GENERATOR import WING_FLAPS, Y_OFFSETS, create_fairy_orb_frame  # noqa: E402
+
+
+def test_memoized_layer_renders_once_and_hands_out_copies():
+    calls = []
+
+    @memoized_layer
+    def layer(size=(4, 4), fill="red"):
+        calls.append((size, fill))
+        return Image.new("RGBA", size, fill)
+
+    first = layer((4, 4))
+    ImageDraw.Draw(first).point((0, 0), fill="blue")
+    second = layer((4, 4))
+    assert second is not first
+    assert second.getpixel((0, 0)) == (255, 0, 0, 255)
+    assert calls == [((4, 4), "red")]
+
+    layer((8, 8))
+    assert layer.cache_info().hits == 1 and layer.cache_info().misses == 2
+    layer.cache_clear()
+    layer((4, 4))
+    assert len(calls) == 3
+
+
+def test_render_frames_matches_across_worker_counts():
+    params = list(zip(Y_OFFSETS, WING_FLAPS))
+    serial = render_frames(create_fairy_orb_frame, params, workers=1)
+    parallel = render_frames(create_fairy_orb_frame, params, workers=3)
+    assert len(serial) == len(parallel) == len(Y_OFFSETS)
+    assert [f.tobytes() for f in serial] == [f.tobytes() for f in parallel]
+    assert render_frames(create_fairy_orb_frame, [], workers=3) == []
+
+
+def test_inputs_digest_tracks_params_sources_and_the_cache_module(tmp_path, monkeypatch):
+    source = tmp_path / "draw.py"
+    source.write_text("x = 1\n")
+    key = inputs_digest({"frames": 8}, [source])
+    assert inputs_digest({"frames": 8}, [source]) == key
+    assert inputs_digest({"frames": 9}, [source]) != key
+
+    source.write_text("x = 2\n")
+    assert inputs_digest({"frames": 8}, [source]) != key
+    key = inputs_digest({"frames": 8}, [source])
+
+    # Editing SPRITE_CACHE itself invalidates every generated asset
+    module = tmp_path / "SPRITE_CACHE.py"
+    module.write_bytes(Path(SPRITE_CACHE.__file__).read_bytes() + b"\n# changed\n")
+    monkeypatch.setattr(SPRITE_CACHE, "__file__", str(module))
+    assert inputs_digest({"frames": 8}, [source]) != key
+
+
+def test_output_cache_is_fresh_only_for_the_recorded_key_and_files(tmp_path):
+    out = tmp_path / "sprites"
+    cache = OutputCache(str(out))
+    files = ["b.png", "a.png"]
+    assert not cache.is_fresh("sheet", "k1", files)
+
+    cache.record("sheet", "k1", files)
+    assert json.loads((out / MANIFEST_NAME).read_text()) == {"sheet": {"files": ["a.png", "b.png"], "key": "k1"}}
+    assert not cache.is_fresh("sheet", "k1", files)  # recorded, but the files were never written
+
+    for name in files:
+        (out / name).write_bytes(b"png")
+    assert cache.is_fresh("sheet", "k1", files)
+    assert cache.is_fresh("sheet", "k1", list(reversed(files)))
+    assert not cache.is_fresh("sheet", "k2", files)
+    assert not cache.is_fresh("sheet", "k1", files + ["c.png"])
+    assert not cache.is_fresh("frames", "k1", files)
+
+    # Recording another asset keeps the first; a missing file or broken manifest means regenerate
+    cache.record("frames", "k9", ["a.png"])
+    assert cache.is_fresh("sheet", "k1", files) and cache.is_fresh("frames", "k9", ["a.png"])
+    (out / "b.png").unlink()
+    assert not cache.is_fresh("sheet", "k1", files)
+    (out / MANIFEST_NAME).write_text("{not json")
+    assert not cache.is_fresh("frames", "k9", ["a.png"])
+    assert not (out / (MANIFEST_NAME + ".tmp")).exists()
@@ -0,0 +1,58 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip("chromadb")
+
+POD_DIR = Path(__file__).resolve().parents[1] / "aether_pod" / "pod"
+if str(POD_DIR) not in sys.path:
+    sys.path.insert(0, str(POD_DIR))
+
+from vault import MemoryVault, normalize_query  # noqa: E402
+
+TOPICS = ["c++", "c#", "c"]
+
+
+class TopicEmbedding:
+    """One axis per known question; documents embed by their "Q:" line."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, input):
+        self.calls.extend(input)
+        vectors = []
+        for text in input:
+            topic = text.split("\n")[0].removeprefix("Q: ").strip().lower()
+            vectors.append([1.0 if topic == t else 0.0 for t in TOPICS] + [0.1])
+        return vectors
+
+    @staticmethod
+    def name():
+        return "topic-test"
+
+
+@pytest.fixture
+def vault(tmp_path):
+    return MemoryVault(db_path=str(tmp_path / "chroma"), embedding_function=TopicEmbedding())
+
+
+def test_normalize_query_keeps_punctuation():
+    assert normalize_query("  What is  C++? ") == "what is c++?"
+    assert len({normalize_query(q) for q in TOPICS}) == 3
+
+
+def test_punctuation_distinct_queries_get_distinct_results(vault):
+    vault.store("c++", "templates")
+    vault.store("c#", "linq")
+    vault.store("c", "pointers")
+
+    assert "templates" in vault.retrieve("c++", n_results=1)
+    assert "linq" in vault.retrieve("c#", n_results=1)
+    assert "pointers" in vault.retrieve("c", n_results=1)
+    # A case-only variant is served from the recall cache; the model only
+    # ever saw the raw questions
+    assert "linq" in vault.retrieve("C#", n_results=1)
+    queries = [q for q in vault.embed.calls if not q.startswith("Q: ")]
+    assert queries == ["c++", "c#", "c"]